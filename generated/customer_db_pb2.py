@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11\x63ustomer_db.proto\x12\x0b\x63ustomer_db\"0\n\x06Rating\x12\x11\n\tthumbs_up\x18\x01 \x01(\x05\x12\x13\n\x0bthumbs_down\x18\x02 \x01(\x05\"k\n\tCartItems\x12\x30\n\x05items\x18\x01 \x03(\x0b\x32!.customer_db.CartItems.ItemsEntry\x1a,\n\nItemsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"9\n\x13\x43reateSellerRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"Q\n\x14\x43reateSellerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"8\n\x12SellerLoginRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"v\n\x13SellerLoginResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x11\n\tseller_id\x18\x03 \x01(\x05\x12\x10\n\x08username\x18\x04 \x01(\t\x12\x15\n\rerror_message\x18\x05 \x01(\t\"+\n\x16GetSellerRatingRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\"f\n\x17GetSellerRatingResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12#\n\x06rating\x18\x02 \x01(\x0b\x32\x13.customer_db.Rating\x12\x15\n\rerror_message\x18\x03 \x01(\t\"C\n\x1bUpdateSellerFeedbackRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\x12\x11\n\tthumbs_up\x18\x02 \x01(\x08\"F\n\x1cUpdateSellerFeedbackResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"8\n\x12\x43reateBuyerRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"f\n\x13\x43reateBuyerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\x12\x15\n\rsaved_cart_id\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t\"7\n\x11\x42uyerLoginRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"\xa6\x01\n\x12\x42uyerLoginResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x10\n\x08\x62uyer_id\x18\x03 \x01(\x05\x12\x10\n\x08username\x18\x04 \x01(\t\x12\x30\n\x10saved_cart_items\x18\x05 \x01(\x0b\x32\x16.customer_db.CartItems\x12\x15\n\rerror_message\x18\x06 \x01(\t\"2\n\x1cValidateSellerSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"X\n\x1dValidateSellerSessionResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"1\n\x1bValidateBuyerSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"V\n\x1cValidateBuyerSessionResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"9\n#UpdateSellerSessionTimestampRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"7\n$UpdateSellerSessionTimestampResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"8\n\"UpdateBuyerSessionTimestampRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"6\n#UpdateBuyerSessionTimestampResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"#\n\rLogoutRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"8\n\x0eLogoutResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"M\n\x14\x41\x64\x64ItemToCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07item_id\x18\x02 \x01(\x05\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"?\n\x15\x41\x64\x64ItemToCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"R\n\x19RemoveItemFromCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07item_id\x18\x02 \x01(\x05\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"D\n\x1aRemoveItemFromCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"*\n\x14GetActiveCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"k\n\x15GetActiveCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12*\n\ncart_items\x18\x02 \x01(\x0b\x32\x16.customer_db.CartItems\x12\x15\n\rerror_message\x18\x03 \x01(\t\"\'\n\x13GetSavedCartRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\"j\n\x14GetSavedCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12*\n\ncart_items\x18\x02 \x01(\x0b\x32\x16.customer_db.CartItems\x12\x15\n\rerror_message\x18\x03 \x01(\t\"7\n\x0fSaveCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\":\n\x10SaveCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"8\n\x10\x43learCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\";\n\x11\x43learCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"\xac\x01\n\x18InsertTransactionRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\x12\x17\n\x0f\x63\x61rdholder_name\x18\x02 \x01(\t\x12\x13\n\x0b\x63\x61rd_number\x18\x03 \x01(\t\x12\x14\n\x0c\x65xpiry_month\x18\x04 \x01(\x05\x12\x13\n\x0b\x65xpiry_year\x18\x05 \x01(\x05\x12\x15\n\rsecurity_code\x18\x06 \x01(\t\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x01\"[\n\x19InsertTransactionResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"S\n\x15InsertPurchaseRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\x12\x10\n\x08item_ids\x18\x03 \x03(\x05\"U\n\x16InsertPurchaseResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x0bpurchase_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\",\n\x18GetBuyerPurchasesRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\"7\n\x0ePurchaseRecord\x12\x13\n\x0bpurchase_id\x18\x01 \x01(\x05\x12\x10\n\x08item_ids\x18\x02 \x03(\x05\"s\n\x19GetBuyerPurchasesResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12.\n\tpurchases\x18\x02 \x03(\x0b\x32\x1b.customer_db.PurchaseRecord\x12\x15\n\rerror_message\x18\x03 \x01(\t2\xc1\x0f\n\x11\x43ustomerDBService\x12S\n\x0c\x43reateSeller\x12 .customer_db.CreateSellerRequest\x1a!.customer_db.CreateSellerResponse\x12P\n\x0bSellerLogin\x12\x1f.customer_db.SellerLoginRequest\x1a .customer_db.SellerLoginResponse\x12G\n\x0cSellerLogout\x12\x1a.customer_db.LogoutRequest\x1a\x1b.customer_db.LogoutResponse\x12\\\n\x0fGetSellerRating\x12#.customer_db.GetSellerRatingRequest\x1a$.customer_db.GetSellerRatingResponse\x12n\n\x15ValidateSellerSession\x12).customer_db.ValidateSellerSessionRequest\x1a*.customer_db.ValidateSellerSessionResponse\x12\x83\x01\n\x1cUpdateSellerSessionTimestamp\x12\x30.customer_db.UpdateSellerSessionTimestampRequest\x1a\x31.customer_db.UpdateSellerSessionTimestampResponse\x12k\n\x14UpdateSellerFeedback\x12(.customer_db.UpdateSellerFeedbackRequest\x1a).customer_db.UpdateSellerFeedbackResponse\x12P\n\x0b\x43reateBuyer\x12\x1f.customer_db.CreateBuyerRequest\x1a .customer_db.CreateBuyerResponse\x12M\n\nBuyerLogin\x12\x1e.customer_db.BuyerLoginRequest\x1a\x1f.customer_db.BuyerLoginResponse\x12\x46\n\x0b\x42uyerLogout\x12\x1a.customer_db.LogoutRequest\x1a\x1b.customer_db.LogoutResponse\x12k\n\x14ValidateBuyerSession\x12(.customer_db.ValidateBuyerSessionRequest\x1a).customer_db.ValidateBuyerSessionResponse\x12\x80\x01\n\x1bUpdateBuyerSessionTimestamp\x12/.customer_db.UpdateBuyerSessionTimestampRequest\x1a\x30.customer_db.UpdateBuyerSessionTimestampResponse\x12V\n\rAddItemToCart\x12!.customer_db.AddItemToCartRequest\x1a\".customer_db.AddItemToCartResponse\x12\x65\n\x12RemoveItemFromCart\x12&.customer_db.RemoveItemFromCartRequest\x1a\'.customer_db.RemoveItemFromCartResponse\x12V\n\rGetActiveCart\x12!.customer_db.GetActiveCartRequest\x1a\".customer_db.GetActiveCartResponse\x12S\n\x0cGetSavedCart\x12 .customer_db.GetSavedCartRequest\x1a!.customer_db.GetSavedCartResponse\x12G\n\x08SaveCart\x12\x1c.customer_db.SaveCartRequest\x1a\x1d.customer_db.SaveCartResponse\x12J\n\tClearCart\x12\x1d.customer_db.ClearCartRequest\x1a\x1e.customer_db.ClearCartResponse\x12\x62\n\x11InsertTransaction\x12%.customer_db.InsertTransactionRequest\x1a&.customer_db.InsertTransactionResponse\x12Y\n\x0eInsertPurchase\x12\".customer_db.InsertPurchaseRequest\x1a#.customer_db.InsertPurchaseResponse\x12\x62\n\x11GetBuyerPurchases\x12%.customer_db.GetBuyerPurchasesRequest\x1a&.customer_db.GetBuyerPurchasesResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11\x63ustomer_db.proto\x12\x0b\x63ustomer_db\"0\n\x06Rating\x12\x11\n\tthumbs_up\x18\x01 \x01(\x05\x12\x13\n\x0bthumbs_down\x18\x02 \x01(\x05\"k\n\tCartItems\x12\x30\n\x05items\x18\x01 \x03(\x0b\x32!.customer_db.CartItems.ItemsEntry\x1a,\n\nItemsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"9\n\x13\x43reateSellerRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"^\n\x14\x43reateSellerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x0b\n\x03seq\x18\x04 \x01(\x03\"8\n\x12SellerLoginRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"\x83\x01\n\x13SellerLoginResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x11\n\tseller_id\x18\x03 \x01(\x05\x12\x10\n\x08username\x18\x04 \x01(\t\x12\x15\n\rerror_message\x18\x05 \x01(\t\x12\x0b\n\x03seq\x18\x06 \x01(\x03\"<\n\x16GetSellerRatingRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"f\n\x17GetSellerRatingResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12#\n\x06rating\x18\x02 \x01(\x0b\x32\x13.customer_db.Rating\x12\x15\n\rerror_message\x18\x03 \x01(\t\"C\n\x1bUpdateSellerFeedbackRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\x12\x11\n\tthumbs_up\x18\x02 \x01(\x08\"S\n\x1cUpdateSellerFeedbackResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\"8\n\x12\x43reateBuyerRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"s\n\x13\x43reateBuyerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\x12\x15\n\rsaved_cart_id\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x0b\n\x03seq\x18\x05 \x01(\x03\"7\n\x11\x42uyerLoginRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"\xb3\x01\n\x12\x42uyerLoginResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x10\n\x08\x62uyer_id\x18\x03 \x01(\x05\x12\x10\n\x08username\x18\x04 \x01(\t\x12\x30\n\x10saved_cart_items\x18\x05 \x01(\x0b\x32\x16.customer_db.CartItems\x12\x15\n\rerror_message\x18\x06 \x01(\t\x12\x0b\n\x03seq\x18\x07 \x01(\x03\"C\n\x1cValidateSellerSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"X\n\x1dValidateSellerSessionResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"B\n\x1bValidateBuyerSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"V\n\x1cValidateBuyerSessionResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"J\n#UpdateSellerSessionTimestampRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"7\n$UpdateSellerSessionTimestampResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"I\n\"UpdateBuyerSessionTimestampRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"6\n#UpdateBuyerSessionTimestampResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\"\n WatchSessionInvalidationsRequest\")\n\x13SessionInvalidation\x12\x12\n\nsession_id\x18\x01 \x01(\t\"#\n\rLogoutRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"E\n\x0eLogoutResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\"M\n\x14\x41\x64\x64ItemToCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07item_id\x18\x02 \x01(\x05\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"L\n\x15\x41\x64\x64ItemToCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\"R\n\x19RemoveItemFromCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07item_id\x18\x02 \x01(\x05\x12\x10\n\x08quantity\x18\x03 \x01(\x05\"Q\n\x1aRemoveItemFromCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\";\n\x14GetActiveCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"k\n\x15GetActiveCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12*\n\ncart_items\x18\x02 \x01(\x0b\x32\x16.customer_db.CartItems\x12\x15\n\rerror_message\x18\x03 \x01(\t\"8\n\x13GetSavedCartRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"j\n\x14GetSavedCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12*\n\ncart_items\x18\x02 \x01(\x0b\x32\x16.customer_db.CartItems\x12\x15\n\rerror_message\x18\x03 \x01(\t\"7\n\x0fSaveCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\"G\n\x10SaveCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\"8\n\x10\x43learCartRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08\x62uyer_id\x18\x02 \x01(\x05\"H\n\x11\x43learCartResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\"\xac\x01\n\x18InsertTransactionRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\x12\x17\n\x0f\x63\x61rdholder_name\x18\x02 \x01(\t\x12\x13\n\x0b\x63\x61rd_number\x18\x03 \x01(\t\x12\x14\n\x0c\x65xpiry_month\x18\x04 \x01(\x05\x12\x13\n\x0b\x65xpiry_year\x18\x05 \x01(\x05\x12\x15\n\rsecurity_code\x18\x06 \x01(\t\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x01\"h\n\x19InsertTransactionResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x0b\n\x03seq\x18\x04 \x01(\x03\"S\n\x15InsertPurchaseRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\x12\x16\n\x0etransaction_id\x18\x02 \x01(\x05\x12\x10\n\x08item_ids\x18\x03 \x03(\x05\"b\n\x16InsertPurchaseResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x0bpurchase_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x0b\n\x03seq\x18\x04 \x01(\x03\"=\n\x18GetBuyerPurchasesRequest\x12\x10\n\x08\x62uyer_id\x18\x01 \x01(\x05\x12\x0f\n\x07min_seq\x18\x02 \x01(\x03\"7\n\x0ePurchaseRecord\x12\x13\n\x0bpurchase_id\x18\x01 \x01(\x05\x12\x10\n\x08item_ids\x18\x02 \x03(\x05\"s\n\x19GetBuyerPurchasesResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12.\n\tpurchases\x18\x02 \x03(\x0b\x32\x1b.customer_db.PurchaseRecord\x12\x15\n\rerror_message\x18\x03 \x01(\t2\x9e\x12\n\x11\x43ustomerDBService\x12S\n\x0c\x43reateSeller\x12 .customer_db.CreateSellerRequest\x1a!.customer_db.CreateSellerResponse\x12P\n\x0bSellerLogin\x12\x1f.customer_db.SellerLoginRequest\x1a .customer_db.SellerLoginResponse\x12G\n\x0cSellerLogout\x12\x1a.customer_db.LogoutRequest\x1a\x1b.customer_db.LogoutResponse\x12\\\n\x0fGetSellerRating\x12#.customer_db.GetSellerRatingRequest\x1a$.customer_db.GetSellerRatingResponse\x12n\n\x15ValidateSellerSession\x12).customer_db.ValidateSellerSessionRequest\x1a*.customer_db.ValidateSellerSessionResponse\x12\x83\x01\n\x1cUpdateSellerSessionTimestamp\x12\x30.customer_db.UpdateSellerSessionTimestampRequest\x1a\x31.customer_db.UpdateSellerSessionTimestampResponse\x12v\n\x1dValidateAndTouchSellerSession\x12).customer_db.ValidateSellerSessionRequest\x1a*.customer_db.ValidateSellerSessionResponse\x12k\n\x14UpdateSellerFeedback\x12(.customer_db.UpdateSellerFeedbackRequest\x1a).customer_db.UpdateSellerFeedbackResponse\x12P\n\x0b\x43reateBuyer\x12\x1f.customer_db.CreateBuyerRequest\x1a .customer_db.CreateBuyerResponse\x12M\n\nBuyerLogin\x12\x1e.customer_db.BuyerLoginRequest\x1a\x1f.customer_db.BuyerLoginResponse\x12\x46\n\x0b\x42uyerLogout\x12\x1a.customer_db.LogoutRequest\x1a\x1b.customer_db.LogoutResponse\x12k\n\x14ValidateBuyerSession\x12(.customer_db.ValidateBuyerSessionRequest\x1a).customer_db.ValidateBuyerSessionResponse\x12\x80\x01\n\x1bUpdateBuyerSessionTimestamp\x12/.customer_db.UpdateBuyerSessionTimestampRequest\x1a\x30.customer_db.UpdateBuyerSessionTimestampResponse\x12s\n\x1cValidateAndTouchBuyerSession\x12(.customer_db.ValidateBuyerSessionRequest\x1a).customer_db.ValidateBuyerSessionResponse\x12n\n\x19WatchSessionInvalidations\x12-.customer_db.WatchSessionInvalidationsRequest\x1a .customer_db.SessionInvalidation0\x01\x12V\n\rAddItemToCart\x12!.customer_db.AddItemToCartRequest\x1a\".customer_db.AddItemToCartResponse\x12\x65\n\x12RemoveItemFromCart\x12&.customer_db.RemoveItemFromCartRequest\x1a\'.customer_db.RemoveItemFromCartResponse\x12V\n\rGetActiveCart\x12!.customer_db.GetActiveCartRequest\x1a\".customer_db.GetActiveCartResponse\x12S\n\x0cGetSavedCart\x12 .customer_db.GetSavedCartRequest\x1a!.customer_db.GetSavedCartResponse\x12G\n\x08SaveCart\x12\x1c.customer_db.SaveCartRequest\x1a\x1d.customer_db.SaveCartResponse\x12J\n\tClearCart\x12\x1d.customer_db.ClearCartRequest\x1a\x1e.customer_db.ClearCartResponse\x12\x62\n\x11InsertTransaction\x12%.customer_db.InsertTransactionRequest\x1a&.customer_db.InsertTransactionResponse\x12Y\n\x0eInsertPurchase\x12\".customer_db.InsertPurchaseRequest\x1a#.customer_db.InsertPurchaseResponse\x12\x62\n\x11GetBuyerPurchases\x12%.customer_db.GetBuyerPurchasesRequest\x1a&.customer_db.GetBuyerPurchasesResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -42,85 +42,89 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_CREATESELLERREQUEST']._serialized_start=193
   _globals['_CREATESELLERREQUEST']._serialized_end=250
   _globals['_CREATESELLERRESPONSE']._serialized_start=252
-  _globals['_CREATESELLERRESPONSE']._serialized_end=333
-  _globals['_SELLERLOGINREQUEST']._serialized_start=335
-  _globals['_SELLERLOGINREQUEST']._serialized_end=391
-  _globals['_SELLERLOGINRESPONSE']._serialized_start=393
-  _globals['_SELLERLOGINRESPONSE']._serialized_end=511
-  _globals['_GETSELLERRATINGREQUEST']._serialized_start=513
-  _globals['_GETSELLERRATINGREQUEST']._serialized_end=556
-  _globals['_GETSELLERRATINGRESPONSE']._serialized_start=558
-  _globals['_GETSELLERRATINGRESPONSE']._serialized_end=660
-  _globals['_UPDATESELLERFEEDBACKREQUEST']._serialized_start=662
-  _globals['_UPDATESELLERFEEDBACKREQUEST']._serialized_end=729
-  _globals['_UPDATESELLERFEEDBACKRESPONSE']._serialized_start=731
-  _globals['_UPDATESELLERFEEDBACKRESPONSE']._serialized_end=801
-  _globals['_CREATEBUYERREQUEST']._serialized_start=803
-  _globals['_CREATEBUYERREQUEST']._serialized_end=859
-  _globals['_CREATEBUYERRESPONSE']._serialized_start=861
-  _globals['_CREATEBUYERRESPONSE']._serialized_end=963
-  _globals['_BUYERLOGINREQUEST']._serialized_start=965
-  _globals['_BUYERLOGINREQUEST']._serialized_end=1020
-  _globals['_BUYERLOGINRESPONSE']._serialized_start=1023
-  _globals['_BUYERLOGINRESPONSE']._serialized_end=1189
-  _globals['_VALIDATESELLERSESSIONREQUEST']._serialized_start=1191
-  _globals['_VALIDATESELLERSESSIONREQUEST']._serialized_end=1241
-  _globals['_VALIDATESELLERSESSIONRESPONSE']._serialized_start=1243
-  _globals['_VALIDATESELLERSESSIONRESPONSE']._serialized_end=1331
-  _globals['_VALIDATEBUYERSESSIONREQUEST']._serialized_start=1333
-  _globals['_VALIDATEBUYERSESSIONREQUEST']._serialized_end=1382
-  _globals['_VALIDATEBUYERSESSIONRESPONSE']._serialized_start=1384
-  _globals['_VALIDATEBUYERSESSIONRESPONSE']._serialized_end=1470
-  _globals['_UPDATESELLERSESSIONTIMESTAMPREQUEST']._serialized_start=1472
-  _globals['_UPDATESELLERSESSIONTIMESTAMPREQUEST']._serialized_end=1529
-  _globals['_UPDATESELLERSESSIONTIMESTAMPRESPONSE']._serialized_start=1531
-  _globals['_UPDATESELLERSESSIONTIMESTAMPRESPONSE']._serialized_end=1586
-  _globals['_UPDATEBUYERSESSIONTIMESTAMPREQUEST']._serialized_start=1588
-  _globals['_UPDATEBUYERSESSIONTIMESTAMPREQUEST']._serialized_end=1644
-  _globals['_UPDATEBUYERSESSIONTIMESTAMPRESPONSE']._serialized_start=1646
-  _globals['_UPDATEBUYERSESSIONTIMESTAMPRESPONSE']._serialized_end=1700
-  _globals['_LOGOUTREQUEST']._serialized_start=1702
-  _globals['_LOGOUTREQUEST']._serialized_end=1737
-  _globals['_LOGOUTRESPONSE']._serialized_start=1739
-  _globals['_LOGOUTRESPONSE']._serialized_end=1795
-  _globals['_ADDITEMTOCARTREQUEST']._serialized_start=1797
-  _globals['_ADDITEMTOCARTREQUEST']._serialized_end=1874
-  _globals['_ADDITEMTOCARTRESPONSE']._serialized_start=1876
-  _globals['_ADDITEMTOCARTRESPONSE']._serialized_end=1939
-  _globals['_REMOVEITEMFROMCARTREQUEST']._serialized_start=1941
-  _globals['_REMOVEITEMFROMCARTREQUEST']._serialized_end=2023
-  _globals['_REMOVEITEMFROMCARTRESPONSE']._serialized_start=2025
-  _globals['_REMOVEITEMFROMCARTRESPONSE']._serialized_end=2093
-  _globals['_GETACTIVECARTREQUEST']._serialized_start=2095
-  _globals['_GETACTIVECARTREQUEST']._serialized_end=2137
-  _globals['_GETACTIVECARTRESPONSE']._serialized_start=2139
-  _globals['_GETACTIVECARTRESPONSE']._serialized_end=2246
-  _globals['_GETSAVEDCARTREQUEST']._serialized_start=2248
-  _globals['_GETSAVEDCARTREQUEST']._serialized_end=2287
-  _globals['_GETSAVEDCARTRESPONSE']._serialized_start=2289
-  _globals['_GETSAVEDCARTRESPONSE']._serialized_end=2395
-  _globals['_SAVECARTREQUEST']._serialized_start=2397
-  _globals['_SAVECARTREQUEST']._serialized_end=2452
-  _globals['_SAVECARTRESPONSE']._serialized_start=2454
-  _globals['_SAVECARTRESPONSE']._serialized_end=2512
-  _globals['_CLEARCARTREQUEST']._serialized_start=2514
-  _globals['_CLEARCARTREQUEST']._serialized_end=2570
-  _globals['_CLEARCARTRESPONSE']._serialized_start=2572
-  _globals['_CLEARCARTRESPONSE']._serialized_end=2631
-  _globals['_INSERTTRANSACTIONREQUEST']._serialized_start=2634
-  _globals['_INSERTTRANSACTIONREQUEST']._serialized_end=2806
-  _globals['_INSERTTRANSACTIONRESPONSE']._serialized_start=2808
-  _globals['_INSERTTRANSACTIONRESPONSE']._serialized_end=2899
-  _globals['_INSERTPURCHASEREQUEST']._serialized_start=2901
-  _globals['_INSERTPURCHASEREQUEST']._serialized_end=2984
-  _globals['_INSERTPURCHASERESPONSE']._serialized_start=2986
-  _globals['_INSERTPURCHASERESPONSE']._serialized_end=3071
-  _globals['_GETBUYERPURCHASESREQUEST']._serialized_start=3073
-  _globals['_GETBUYERPURCHASESREQUEST']._serialized_end=3117
-  _globals['_PURCHASERECORD']._serialized_start=3119
-  _globals['_PURCHASERECORD']._serialized_end=3174
-  _globals['_GETBUYERPURCHASESRESPONSE']._serialized_start=3176
-  _globals['_GETBUYERPURCHASESRESPONSE']._serialized_end=3291
-  _globals['_CUSTOMERDBSERVICE']._serialized_start=3294
-  _globals['_CUSTOMERDBSERVICE']._serialized_end=5279
+  _globals['_CREATESELLERRESPONSE']._serialized_end=346
+  _globals['_SELLERLOGINREQUEST']._serialized_start=348
+  _globals['_SELLERLOGINREQUEST']._serialized_end=404
+  _globals['_SELLERLOGINRESPONSE']._serialized_start=407
+  _globals['_SELLERLOGINRESPONSE']._serialized_end=538
+  _globals['_GETSELLERRATINGREQUEST']._serialized_start=540
+  _globals['_GETSELLERRATINGREQUEST']._serialized_end=600
+  _globals['_GETSELLERRATINGRESPONSE']._serialized_start=602
+  _globals['_GETSELLERRATINGRESPONSE']._serialized_end=704
+  _globals['_UPDATESELLERFEEDBACKREQUEST']._serialized_start=706
+  _globals['_UPDATESELLERFEEDBACKREQUEST']._serialized_end=773
+  _globals['_UPDATESELLERFEEDBACKRESPONSE']._serialized_start=775
+  _globals['_UPDATESELLERFEEDBACKRESPONSE']._serialized_end=858
+  _globals['_CREATEBUYERREQUEST']._serialized_start=860
+  _globals['_CREATEBUYERREQUEST']._serialized_end=916
+  _globals['_CREATEBUYERRESPONSE']._serialized_start=918
+  _globals['_CREATEBUYERRESPONSE']._serialized_end=1033
+  _globals['_BUYERLOGINREQUEST']._serialized_start=1035
+  _globals['_BUYERLOGINREQUEST']._serialized_end=1090
+  _globals['_BUYERLOGINRESPONSE']._serialized_start=1093
+  _globals['_BUYERLOGINRESPONSE']._serialized_end=1272
+  _globals['_VALIDATESELLERSESSIONREQUEST']._serialized_start=1274
+  _globals['_VALIDATESELLERSESSIONREQUEST']._serialized_end=1341
+  _globals['_VALIDATESELLERSESSIONRESPONSE']._serialized_start=1343
+  _globals['_VALIDATESELLERSESSIONRESPONSE']._serialized_end=1431
+  _globals['_VALIDATEBUYERSESSIONREQUEST']._serialized_start=1433
+  _globals['_VALIDATEBUYERSESSIONREQUEST']._serialized_end=1499
+  _globals['_VALIDATEBUYERSESSIONRESPONSE']._serialized_start=1501
+  _globals['_VALIDATEBUYERSESSIONRESPONSE']._serialized_end=1587
+  _globals['_UPDATESELLERSESSIONTIMESTAMPREQUEST']._serialized_start=1589
+  _globals['_UPDATESELLERSESSIONTIMESTAMPREQUEST']._serialized_end=1663
+  _globals['_UPDATESELLERSESSIONTIMESTAMPRESPONSE']._serialized_start=1665
+  _globals['_UPDATESELLERSESSIONTIMESTAMPRESPONSE']._serialized_end=1720
+  _globals['_UPDATEBUYERSESSIONTIMESTAMPREQUEST']._serialized_start=1722
+  _globals['_UPDATEBUYERSESSIONTIMESTAMPREQUEST']._serialized_end=1795
+  _globals['_UPDATEBUYERSESSIONTIMESTAMPRESPONSE']._serialized_start=1797
+  _globals['_UPDATEBUYERSESSIONTIMESTAMPRESPONSE']._serialized_end=1851
+  _globals['_WATCHSESSIONINVALIDATIONSREQUEST']._serialized_start=1853
+  _globals['_WATCHSESSIONINVALIDATIONSREQUEST']._serialized_end=1887
+  _globals['_SESSIONINVALIDATION']._serialized_start=1889
+  _globals['_SESSIONINVALIDATION']._serialized_end=1930
+  _globals['_LOGOUTREQUEST']._serialized_start=1932
+  _globals['_LOGOUTREQUEST']._serialized_end=1967
+  _globals['_LOGOUTRESPONSE']._serialized_start=1969
+  _globals['_LOGOUTRESPONSE']._serialized_end=2038
+  _globals['_ADDITEMTOCARTREQUEST']._serialized_start=2040
+  _globals['_ADDITEMTOCARTREQUEST']._serialized_end=2117
+  _globals['_ADDITEMTOCARTRESPONSE']._serialized_start=2119
+  _globals['_ADDITEMTOCARTRESPONSE']._serialized_end=2195
+  _globals['_REMOVEITEMFROMCARTREQUEST']._serialized_start=2197
+  _globals['_REMOVEITEMFROMCARTREQUEST']._serialized_end=2279
+  _globals['_REMOVEITEMFROMCARTRESPONSE']._serialized_start=2281
+  _globals['_REMOVEITEMFROMCARTRESPONSE']._serialized_end=2362
+  _globals['_GETACTIVECARTREQUEST']._serialized_start=2364
+  _globals['_GETACTIVECARTREQUEST']._serialized_end=2423
+  _globals['_GETACTIVECARTRESPONSE']._serialized_start=2425
+  _globals['_GETACTIVECARTRESPONSE']._serialized_end=2532
+  _globals['_GETSAVEDCARTREQUEST']._serialized_start=2534
+  _globals['_GETSAVEDCARTREQUEST']._serialized_end=2590
+  _globals['_GETSAVEDCARTRESPONSE']._serialized_start=2592
+  _globals['_GETSAVEDCARTRESPONSE']._serialized_end=2698
+  _globals['_SAVECARTREQUEST']._serialized_start=2700
+  _globals['_SAVECARTREQUEST']._serialized_end=2755
+  _globals['_SAVECARTRESPONSE']._serialized_start=2757
+  _globals['_SAVECARTRESPONSE']._serialized_end=2828
+  _globals['_CLEARCARTREQUEST']._serialized_start=2830
+  _globals['_CLEARCARTREQUEST']._serialized_end=2886
+  _globals['_CLEARCARTRESPONSE']._serialized_start=2888
+  _globals['_CLEARCARTRESPONSE']._serialized_end=2960
+  _globals['_INSERTTRANSACTIONREQUEST']._serialized_start=2963
+  _globals['_INSERTTRANSACTIONREQUEST']._serialized_end=3135
+  _globals['_INSERTTRANSACTIONRESPONSE']._serialized_start=3137
+  _globals['_INSERTTRANSACTIONRESPONSE']._serialized_end=3241
+  _globals['_INSERTPURCHASEREQUEST']._serialized_start=3243
+  _globals['_INSERTPURCHASEREQUEST']._serialized_end=3326
+  _globals['_INSERTPURCHASERESPONSE']._serialized_start=3328
+  _globals['_INSERTPURCHASERESPONSE']._serialized_end=3426
+  _globals['_GETBUYERPURCHASESREQUEST']._serialized_start=3428
+  _globals['_GETBUYERPURCHASESREQUEST']._serialized_end=3489
+  _globals['_PURCHASERECORD']._serialized_start=3491
+  _globals['_PURCHASERECORD']._serialized_end=3546
+  _globals['_GETBUYERPURCHASESRESPONSE']._serialized_start=3548
+  _globals['_GETBUYERPURCHASESRESPONSE']._serialized_end=3663
+  _globals['_CUSTOMERDBSERVICE']._serialized_start=3666
+  _globals['_CUSTOMERDBSERVICE']._serialized_end=6000
 # @@protoc_insertion_point(module_scope)
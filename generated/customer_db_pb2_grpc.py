@@ -66,6 +66,11 @@ class CustomerDBServiceStub(object):
                 request_serializer=customer__db__pb2.UpdateSellerSessionTimestampRequest.SerializeToString,
                 response_deserializer=customer__db__pb2.UpdateSellerSessionTimestampResponse.FromString,
                 _registered_method=True)
+        self.ValidateAndTouchSellerSession = channel.unary_unary(
+                '/customer_db.CustomerDBService/ValidateAndTouchSellerSession',
+                request_serializer=customer__db__pb2.ValidateSellerSessionRequest.SerializeToString,
+                response_deserializer=customer__db__pb2.ValidateSellerSessionResponse.FromString,
+                _registered_method=True)
         self.UpdateSellerFeedback = channel.unary_unary(
                 '/customer_db.CustomerDBService/UpdateSellerFeedback',
                 request_serializer=customer__db__pb2.UpdateSellerFeedbackRequest.SerializeToString,
@@ -96,6 +101,16 @@ class CustomerDBServiceStub(object):
                 request_serializer=customer__db__pb2.UpdateBuyerSessionTimestampRequest.SerializeToString,
                 response_deserializer=customer__db__pb2.UpdateBuyerSessionTimestampResponse.FromString,
                 _registered_method=True)
+        self.ValidateAndTouchBuyerSession = channel.unary_unary(
+                '/customer_db.CustomerDBService/ValidateAndTouchBuyerSession',
+                request_serializer=customer__db__pb2.ValidateBuyerSessionRequest.SerializeToString,
+                response_deserializer=customer__db__pb2.ValidateBuyerSessionResponse.FromString,
+                _registered_method=True)
+        self.WatchSessionInvalidations = channel.unary_stream(
+                '/customer_db.CustomerDBService/WatchSessionInvalidations',
+                request_serializer=customer__db__pb2.WatchSessionInvalidationsRequest.SerializeToString,
+                response_deserializer=customer__db__pb2.SessionInvalidation.FromString,
+                _registered_method=True)
         self.AddItemToCart = channel.unary_unary(
                 '/customer_db.CustomerDBService/AddItemToCart',
                 request_serializer=customer__db__pb2.AddItemToCartRequest.SerializeToString,
@@ -185,6 +200,12 @@ class CustomerDBServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ValidateAndTouchSellerSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def UpdateSellerFeedback(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -222,6 +243,18 @@ class CustomerDBServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ValidateAndTouchBuyerSession(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchSessionInvalidations(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AddItemToCart(self, request, context):
         """Cart operations
         """
@@ -311,6 +344,11 @@ def add_CustomerDBServiceServicer_to_server(servicer, server):
                     request_deserializer=customer__db__pb2.UpdateSellerSessionTimestampRequest.FromString,
                     response_serializer=customer__db__pb2.UpdateSellerSessionTimestampResponse.SerializeToString,
             ),
+            'ValidateAndTouchSellerSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.ValidateAndTouchSellerSession,
+                    request_deserializer=customer__db__pb2.ValidateSellerSessionRequest.FromString,
+                    response_serializer=customer__db__pb2.ValidateSellerSessionResponse.SerializeToString,
+            ),
             'UpdateSellerFeedback': grpc.unary_unary_rpc_method_handler(
                     servicer.UpdateSellerFeedback,
                     request_deserializer=customer__db__pb2.UpdateSellerFeedbackRequest.FromString,
@@ -341,6 +379,16 @@ def add_CustomerDBServiceServicer_to_server(servicer, server):
                     request_deserializer=customer__db__pb2.UpdateBuyerSessionTimestampRequest.FromString,
                     response_serializer=customer__db__pb2.UpdateBuyerSessionTimestampResponse.SerializeToString,
             ),
+            'ValidateAndTouchBuyerSession': grpc.unary_unary_rpc_method_handler(
+                    servicer.ValidateAndTouchBuyerSession,
+                    request_deserializer=customer__db__pb2.ValidateBuyerSessionRequest.FromString,
+                    response_serializer=customer__db__pb2.ValidateBuyerSessionResponse.SerializeToString,
+            ),
+            'WatchSessionInvalidations': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchSessionInvalidations,
+                    request_deserializer=customer__db__pb2.WatchSessionInvalidationsRequest.FromString,
+                    response_serializer=customer__db__pb2.SessionInvalidation.SerializeToString,
+            ),
             'AddItemToCart': grpc.unary_unary_rpc_method_handler(
                     servicer.AddItemToCart,
                     request_deserializer=customer__db__pb2.AddItemToCartRequest.FromString,
@@ -561,6 +609,33 @@ class CustomerDBService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ValidateAndTouchSellerSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/customer_db.CustomerDBService/ValidateAndTouchSellerSession',
+            customer__db__pb2.ValidateSellerSessionRequest.SerializeToString,
+            customer__db__pb2.ValidateSellerSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def UpdateSellerFeedback(request,
             target,
@@ -723,6 +798,60 @@ class CustomerDBService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ValidateAndTouchBuyerSession(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/customer_db.CustomerDBService/ValidateAndTouchBuyerSession',
+            customer__db__pb2.ValidateBuyerSessionRequest.SerializeToString,
+            customer__db__pb2.ValidateBuyerSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchSessionInvalidations(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/customer_db.CustomerDBService/WatchSessionInvalidations',
+            customer__db__pb2.WatchSessionInvalidationsRequest.SerializeToString,
+            customer__db__pb2.SessionInvalidation.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def AddItemToCart(request,
             target,
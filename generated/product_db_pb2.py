@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10product_db.proto\x12\nproduct_db\"\xc2\x01\n\x04Item\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x11\n\titem_name\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\x05\x12\x10\n\x08keywords\x18\x05 \x03(\t\x12\x11\n\tcondition\x18\x06 \x01(\t\x12\x12\n\nsale_price\x18\x07 \x01(\x01\x12\x10\n\x08quantity\x18\x08 \x01(\x05\x12\x11\n\tthumbs_up\x18\t \x01(\x05\x12\x13\n\x0bthumbs_down\x18\n \x01(\x05\"\x98\x01\n\x13RegisterItemRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\x12\x11\n\titem_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\x05\x12\x10\n\x08keywords\x18\x04 \x03(\t\x12\x11\n\tcondition\x18\x05 \x01(\t\x12\x12\n\nsale_price\x18\x06 \x01(\x01\x12\x10\n\x08quantity\x18\x07 \x01(\x05\"O\n\x14RegisterItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07item_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"O\n\x16UpdateItemPriceRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x11\n\tnew_price\x18\x03 \x01(\x01\"A\n\x17UpdateItemPriceResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\"X\n\x19UpdateItemQuantityRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x17\n\x0fquantity_change\x18\x03 \x01(\x05\"Z\n\x1aUpdateItemQuantityResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0cnew_quantity\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\",\n\x17GetItemsBySellerRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\"c\n\x18GetItemsBySellerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x05items\x18\x02 \x03(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\"8\n\x12SearchItemsRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\x05\x12\x10\n\x08keywords\x18\x02 \x03(\t\"^\n\x13SearchItemsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x05items\x18\x02 \x03(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\"!\n\x0eGetItemRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\"Y\n\x0fGetItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1e\n\x04item\x18\x02 \x01(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\"?\n\x19UpdateItemFeedbackRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tthumbs_up\x18\x02 \x01(\x08\"D\n\x1aUpdateItemFeedbackResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\")\n\x16GetItemQuantityRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\"S\n\x17GetItemQuantityResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08quantity\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"\'\n\x14GetItemSellerRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\"R\n\x15GetItemSellerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t2\xb0\x06\n\x10ProductDBService\x12Q\n\x0cRegisterItem\x12\x1f.product_db.RegisterItemRequest\x1a .product_db.RegisterItemResponse\x12Z\n\x0fUpdateItemPrice\x12\".product_db.UpdateItemPriceRequest\x1a#.product_db.UpdateItemPriceResponse\x12\x63\n\x12UpdateItemQuantity\x12%.product_db.UpdateItemQuantityRequest\x1a&.product_db.UpdateItemQuantityResponse\x12]\n\x10GetItemsBySeller\x12#.product_db.GetItemsBySellerRequest\x1a$.product_db.GetItemsBySellerResponse\x12N\n\x0bSearchItems\x12\x1e.product_db.SearchItemsRequest\x1a\x1f.product_db.SearchItemsResponse\x12\x42\n\x07GetItem\x12\x1a.product_db.GetItemRequest\x1a\x1b.product_db.GetItemResponse\x12\x63\n\x12UpdateItemFeedback\x12%.product_db.UpdateItemFeedbackRequest\x1a&.product_db.UpdateItemFeedbackResponse\x12Z\n\x0fGetItemQuantity\x12\".product_db.GetItemQuantityRequest\x1a#.product_db.GetItemQuantityResponse\x12T\n\rGetItemSeller\x12 .product_db.GetItemSellerRequest\x1a!.product_db.GetItemSellerResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10product_db.proto\x12\nproduct_db\"\xc2\x01\n\x04Item\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x11\n\titem_name\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\x05\x12\x10\n\x08keywords\x18\x05 \x03(\t\x12\x11\n\tcondition\x18\x06 \x01(\t\x12\x12\n\nsale_price\x18\x07 \x01(\x01\x12\x10\n\x08quantity\x18\x08 \x01(\x05\x12\x11\n\tthumbs_up\x18\t \x01(\x05\x12\x13\n\x0bthumbs_down\x18\n \x01(\x05\"\x98\x01\n\x13RegisterItemRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\x12\x11\n\titem_name\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\x05\x12\x10\n\x08keywords\x18\x04 \x03(\t\x12\x11\n\tcondition\x18\x05 \x01(\t\x12\x12\n\nsale_price\x18\x06 \x01(\x01\x12\x10\n\x08quantity\x18\x07 \x01(\x05\"c\n\x14RegisterItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07item_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x12\n\nraft_index\x18\x04 \x01(\x03\"O\n\x16UpdateItemPriceRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x11\n\tnew_price\x18\x03 \x01(\x01\"U\n\x17UpdateItemPriceResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x12\n\nraft_index\x18\x03 \x01(\x03\"X\n\x19UpdateItemQuantityRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x17\n\x0fquantity_change\x18\x03 \x01(\x05\"n\n\x1aUpdateItemQuantityResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0cnew_quantity\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x12\n\nraft_index\x18\x04 \x01(\x03\"Q\n\x12ItemQuantityChange\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x17\n\x0fquantity_change\x18\x03 \x01(\x05\"N\n\x1bUpdateItemQuantitiesRequest\x12/\n\x07\x63hanges\x18\x01 \x03(\x0b\x32\x1e.product_db.ItemQuantityChange\"\x8a\x01\n\x1cUpdateItemQuantitiesResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x16\n\x0enew_quantities\x18\x02 \x03(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x16\n\x0e\x66\x61iled_item_id\x18\x04 \x01(\x05\x12\x12\n\nraft_index\x18\x05 \x01(\x03\"U\n\x17GetItemsBySellerRequest\x12\x11\n\tseller_id\x18\x01 \x01(\x05\x12\x11\n\tmin_index\x18\x02 \x01(\x03\x12\x14\n\x0clinearizable\x18\x03 \x01(\x08\"c\n\x18GetItemsBySellerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x05items\x18\x02 \x03(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\"\x84\x01\n\x12SearchItemsRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\x05\x12\x10\n\x08keywords\x18\x02 \x03(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\x12\x12\n\npage_token\x18\x04 \x01(\t\x12\x11\n\tmin_index\x18\x05 \x01(\x03\x12\x14\n\x0clinearizable\x18\x06 \x01(\x08\"w\n\x13SearchItemsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x05items\x18\x02 \x03(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\x12\x17\n\x0fnext_page_token\x18\x04 \x01(\t\"v\n\x18RankedSearchItemsRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\x05\x12\x10\n\x08keywords\x18\x02 \x03(\t\x12\r\n\x05top_k\x18\x03 \x01(\x05\x12\x11\n\tmin_index\x18\x04 \x01(\x03\x12\x14\n\x0clinearizable\x18\x05 \x01(\x08\"t\n\x19RankedSearchItemsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x05items\x18\x02 \x03(\x0b\x32\x10.product_db.Item\x12\x0e\n\x06scores\x18\x03 \x03(\x01\x12\x15\n\rerror_message\x18\x04 \x01(\t\"J\n\x0eGetItemRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tmin_index\x18\x02 \x01(\x03\x12\x14\n\x0clinearizable\x18\x03 \x01(\x08\"Y\n\x0fGetItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1e\n\x04item\x18\x02 \x01(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\"L\n\x0fGetItemsRequest\x12\x10\n\x08item_ids\x18\x01 \x03(\x05\x12\x11\n\tmin_index\x18\x02 \x01(\x03\x12\x14\n\x0clinearizable\x18\x03 \x01(\x08\"[\n\x10GetItemsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x1f\n\x05items\x18\x02 \x03(\x0b\x32\x10.product_db.Item\x12\x15\n\rerror_message\x18\x03 \x01(\t\"?\n\x19UpdateItemFeedbackRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tthumbs_up\x18\x02 \x01(\x08\"X\n\x1aUpdateItemFeedbackResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rerror_message\x18\x02 \x01(\t\x12\x12\n\nraft_index\x18\x03 \x01(\x03\"R\n\x16GetItemQuantityRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tmin_index\x18\x02 \x01(\x03\x12\x14\n\x0clinearizable\x18\x03 \x01(\x08\"S\n\x17GetItemQuantityResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08quantity\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"P\n\x14GetItemSellerRequest\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x11\n\tmin_index\x18\x02 \x01(\x03\x12\x14\n\x0clinearizable\x18\x03 \x01(\x08\"R\n\x15GetItemSellerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tseller_id\x18\x02 \x01(\x05\x12\x15\n\rerror_message\x18\x03 \x01(\t\"*\n\x14WatchProductsRequest\x12\x12\n\nfrom_index\x18\x01 \x01(\x03\"[\n\rProductChange\x12\x0f\n\x07item_id\x18\x01 \x01(\x05\x12\x12\n\nraft_index\x18\x02 \x01(\x03\x12\x16\n\x0e\x63hanged_fields\x18\x03 \x03(\t\x12\r\n\x05reset\x18\x04 \x01(\x08\"\x19\n\x17GetClusterStatusRequest\"\xb2\x01\n\x18GetClusterStatusResponse\x12\x11\n\tself_node\x18\x01 \x01(\t\x12\x0e\n\x06leader\x18\x02 \x01(\t\x12\x11\n\tis_leader\x18\x03 \x01(\x08\x12\r\n\x05ready\x18\x04 \x01(\x08\x12\x12\n\nhas_quorum\x18\x05 \x01(\x08\x12\x14\n\x0clast_applied\x18\x06 \x01(\x03\x12\x14\n\x0c\x63ommit_index\x18\x07 \x01(\x03\x12\x11\n\traft_term\x18\x08 \x01(\x03\x32\xbc\n\n\x10ProductDBService\x12Q\n\x0cRegisterItem\x12\x1f.product_db.RegisterItemRequest\x1a .product_db.RegisterItemResponse\x12Z\n\x0fUpdateItemPrice\x12\".product_db.UpdateItemPriceRequest\x1a#.product_db.UpdateItemPriceResponse\x12\x63\n\x12UpdateItemQuantity\x12%.product_db.UpdateItemQuantityRequest\x1a&.product_db.UpdateItemQuantityResponse\x12i\n\x14UpdateItemQuantities\x12\'.product_db.UpdateItemQuantitiesRequest\x1a(.product_db.UpdateItemQuantitiesResponse\x12]\n\x10GetItemsBySeller\x12#.product_db.GetItemsBySellerRequest\x1a$.product_db.GetItemsBySellerResponse\x12N\n\x0bSearchItems\x12\x1e.product_db.SearchItemsRequest\x1a\x1f.product_db.SearchItemsResponse\x12G\n\x11SearchItemsStream\x12\x1e.product_db.SearchItemsRequest\x1a\x10.product_db.Item0\x01\x12`\n\x11RankedSearchItems\x12$.product_db.RankedSearchItemsRequest\x1a%.product_db.RankedSearchItemsResponse\x12\x42\n\x07GetItem\x12\x1a.product_db.GetItemRequest\x1a\x1b.product_db.GetItemResponse\x12\x45\n\x08GetItems\x12\x1b.product_db.GetItemsRequest\x1a\x1c.product_db.GetItemsResponse\x12\x63\n\x12UpdateItemFeedback\x12%.product_db.UpdateItemFeedbackRequest\x1a&.product_db.UpdateItemFeedbackResponse\x12Z\n\x0fGetItemQuantity\x12\".product_db.GetItemQuantityRequest\x1a#.product_db.GetItemQuantityResponse\x12T\n\rGetItemSeller\x12 .product_db.GetItemSellerRequest\x1a!.product_db.GetItemSellerResponse\x12N\n\rWatchProducts\x12 .product_db.WatchProductsRequest\x1a\x19.product_db.ProductChange0\x01\x12]\n\x10GetClusterStatus\x12#.product_db.GetClusterStatusRequest\x1a$.product_db.GetClusterStatusResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -36,39 +36,61 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_REGISTERITEMREQUEST']._serialized_start=230
   _globals['_REGISTERITEMREQUEST']._serialized_end=382
   _globals['_REGISTERITEMRESPONSE']._serialized_start=384
-  _globals['_REGISTERITEMRESPONSE']._serialized_end=463
-  _globals['_UPDATEITEMPRICEREQUEST']._serialized_start=465
-  _globals['_UPDATEITEMPRICEREQUEST']._serialized_end=544
-  _globals['_UPDATEITEMPRICERESPONSE']._serialized_start=546
-  _globals['_UPDATEITEMPRICERESPONSE']._serialized_end=611
-  _globals['_UPDATEITEMQUANTITYREQUEST']._serialized_start=613
-  _globals['_UPDATEITEMQUANTITYREQUEST']._serialized_end=701
-  _globals['_UPDATEITEMQUANTITYRESPONSE']._serialized_start=703
-  _globals['_UPDATEITEMQUANTITYRESPONSE']._serialized_end=793
-  _globals['_GETITEMSBYSELLERREQUEST']._serialized_start=795
-  _globals['_GETITEMSBYSELLERREQUEST']._serialized_end=839
-  _globals['_GETITEMSBYSELLERRESPONSE']._serialized_start=841
-  _globals['_GETITEMSBYSELLERRESPONSE']._serialized_end=940
-  _globals['_SEARCHITEMSREQUEST']._serialized_start=942
-  _globals['_SEARCHITEMSREQUEST']._serialized_end=998
-  _globals['_SEARCHITEMSRESPONSE']._serialized_start=1000
-  _globals['_SEARCHITEMSRESPONSE']._serialized_end=1094
-  _globals['_GETITEMREQUEST']._serialized_start=1096
-  _globals['_GETITEMREQUEST']._serialized_end=1129
-  _globals['_GETITEMRESPONSE']._serialized_start=1131
-  _globals['_GETITEMRESPONSE']._serialized_end=1220
-  _globals['_UPDATEITEMFEEDBACKREQUEST']._serialized_start=1222
-  _globals['_UPDATEITEMFEEDBACKREQUEST']._serialized_end=1285
-  _globals['_UPDATEITEMFEEDBACKRESPONSE']._serialized_start=1287
-  _globals['_UPDATEITEMFEEDBACKRESPONSE']._serialized_end=1355
-  _globals['_GETITEMQUANTITYREQUEST']._serialized_start=1357
-  _globals['_GETITEMQUANTITYREQUEST']._serialized_end=1398
-  _globals['_GETITEMQUANTITYRESPONSE']._serialized_start=1400
-  _globals['_GETITEMQUANTITYRESPONSE']._serialized_end=1483
-  _globals['_GETITEMSELLERREQUEST']._serialized_start=1485
-  _globals['_GETITEMSELLERREQUEST']._serialized_end=1524
-  _globals['_GETITEMSELLERRESPONSE']._serialized_start=1526
-  _globals['_GETITEMSELLERRESPONSE']._serialized_end=1608
-  _globals['_PRODUCTDBSERVICE']._serialized_start=1611
-  _globals['_PRODUCTDBSERVICE']._serialized_end=2427
+  _globals['_REGISTERITEMRESPONSE']._serialized_end=483
+  _globals['_UPDATEITEMPRICEREQUEST']._serialized_start=485
+  _globals['_UPDATEITEMPRICEREQUEST']._serialized_end=564
+  _globals['_UPDATEITEMPRICERESPONSE']._serialized_start=566
+  _globals['_UPDATEITEMPRICERESPONSE']._serialized_end=651
+  _globals['_UPDATEITEMQUANTITYREQUEST']._serialized_start=653
+  _globals['_UPDATEITEMQUANTITYREQUEST']._serialized_end=741
+  _globals['_UPDATEITEMQUANTITYRESPONSE']._serialized_start=743
+  _globals['_UPDATEITEMQUANTITYRESPONSE']._serialized_end=853
+  _globals['_ITEMQUANTITYCHANGE']._serialized_start=855
+  _globals['_ITEMQUANTITYCHANGE']._serialized_end=936
+  _globals['_UPDATEITEMQUANTITIESREQUEST']._serialized_start=938
+  _globals['_UPDATEITEMQUANTITIESREQUEST']._serialized_end=1016
+  _globals['_UPDATEITEMQUANTITIESRESPONSE']._serialized_start=1019
+  _globals['_UPDATEITEMQUANTITIESRESPONSE']._serialized_end=1157
+  _globals['_GETITEMSBYSELLERREQUEST']._serialized_start=1159
+  _globals['_GETITEMSBYSELLERREQUEST']._serialized_end=1244
+  _globals['_GETITEMSBYSELLERRESPONSE']._serialized_start=1246
+  _globals['_GETITEMSBYSELLERRESPONSE']._serialized_end=1345
+  _globals['_SEARCHITEMSREQUEST']._serialized_start=1348
+  _globals['_SEARCHITEMSREQUEST']._serialized_end=1480
+  _globals['_SEARCHITEMSRESPONSE']._serialized_start=1482
+  _globals['_SEARCHITEMSRESPONSE']._serialized_end=1601
+  _globals['_RANKEDSEARCHITEMSREQUEST']._serialized_start=1603
+  _globals['_RANKEDSEARCHITEMSREQUEST']._serialized_end=1721
+  _globals['_RANKEDSEARCHITEMSRESPONSE']._serialized_start=1723
+  _globals['_RANKEDSEARCHITEMSRESPONSE']._serialized_end=1839
+  _globals['_GETITEMREQUEST']._serialized_start=1841
+  _globals['_GETITEMREQUEST']._serialized_end=1915
+  _globals['_GETITEMRESPONSE']._serialized_start=1917
+  _globals['_GETITEMRESPONSE']._serialized_end=2006
+  _globals['_GETITEMSREQUEST']._serialized_start=2008
+  _globals['_GETITEMSREQUEST']._serialized_end=2084
+  _globals['_GETITEMSRESPONSE']._serialized_start=2086
+  _globals['_GETITEMSRESPONSE']._serialized_end=2177
+  _globals['_UPDATEITEMFEEDBACKREQUEST']._serialized_start=2179
+  _globals['_UPDATEITEMFEEDBACKREQUEST']._serialized_end=2242
+  _globals['_UPDATEITEMFEEDBACKRESPONSE']._serialized_start=2244
+  _globals['_UPDATEITEMFEEDBACKRESPONSE']._serialized_end=2332
+  _globals['_GETITEMQUANTITYREQUEST']._serialized_start=2334
+  _globals['_GETITEMQUANTITYREQUEST']._serialized_end=2416
+  _globals['_GETITEMQUANTITYRESPONSE']._serialized_start=2418
+  _globals['_GETITEMQUANTITYRESPONSE']._serialized_end=2501
+  _globals['_GETITEMSELLERREQUEST']._serialized_start=2503
+  _globals['_GETITEMSELLERREQUEST']._serialized_end=2583
+  _globals['_GETITEMSELLERRESPONSE']._serialized_start=2585
+  _globals['_GETITEMSELLERRESPONSE']._serialized_end=2667
+  _globals['_WATCHPRODUCTSREQUEST']._serialized_start=2669
+  _globals['_WATCHPRODUCTSREQUEST']._serialized_end=2711
+  _globals['_PRODUCTCHANGE']._serialized_start=2713
+  _globals['_PRODUCTCHANGE']._serialized_end=2804
+  _globals['_GETCLUSTERSTATUSREQUEST']._serialized_start=2806
+  _globals['_GETCLUSTERSTATUSREQUEST']._serialized_end=2831
+  _globals['_GETCLUSTERSTATUSRESPONSE']._serialized_start=2834
+  _globals['_GETCLUSTERSTATUSRESPONSE']._serialized_end=3012
+  _globals['_PRODUCTDBSERVICE']._serialized_start=3015
+  _globals['_PRODUCTDBSERVICE']._serialized_end=4355
 # @@protoc_insertion_point(module_scope)
@@ -50,6 +50,11 @@ class ProductDBServiceStub(object):
                 request_serializer=product__db__pb2.UpdateItemQuantityRequest.SerializeToString,
                 response_deserializer=product__db__pb2.UpdateItemQuantityResponse.FromString,
                 _registered_method=True)
+        self.UpdateItemQuantities = channel.unary_unary(
+                '/product_db.ProductDBService/UpdateItemQuantities',
+                request_serializer=product__db__pb2.UpdateItemQuantitiesRequest.SerializeToString,
+                response_deserializer=product__db__pb2.UpdateItemQuantitiesResponse.FromString,
+                _registered_method=True)
         self.GetItemsBySeller = channel.unary_unary(
                 '/product_db.ProductDBService/GetItemsBySeller',
                 request_serializer=product__db__pb2.GetItemsBySellerRequest.SerializeToString,
@@ -60,11 +65,26 @@ class ProductDBServiceStub(object):
                 request_serializer=product__db__pb2.SearchItemsRequest.SerializeToString,
                 response_deserializer=product__db__pb2.SearchItemsResponse.FromString,
                 _registered_method=True)
+        self.SearchItemsStream = channel.unary_stream(
+                '/product_db.ProductDBService/SearchItemsStream',
+                request_serializer=product__db__pb2.SearchItemsRequest.SerializeToString,
+                response_deserializer=product__db__pb2.Item.FromString,
+                _registered_method=True)
+        self.RankedSearchItems = channel.unary_unary(
+                '/product_db.ProductDBService/RankedSearchItems',
+                request_serializer=product__db__pb2.RankedSearchItemsRequest.SerializeToString,
+                response_deserializer=product__db__pb2.RankedSearchItemsResponse.FromString,
+                _registered_method=True)
         self.GetItem = channel.unary_unary(
                 '/product_db.ProductDBService/GetItem',
                 request_serializer=product__db__pb2.GetItemRequest.SerializeToString,
                 response_deserializer=product__db__pb2.GetItemResponse.FromString,
                 _registered_method=True)
+        self.GetItems = channel.unary_unary(
+                '/product_db.ProductDBService/GetItems',
+                request_serializer=product__db__pb2.GetItemsRequest.SerializeToString,
+                response_deserializer=product__db__pb2.GetItemsResponse.FromString,
+                _registered_method=True)
         self.UpdateItemFeedback = channel.unary_unary(
                 '/product_db.ProductDBService/UpdateItemFeedback',
                 request_serializer=product__db__pb2.UpdateItemFeedbackRequest.SerializeToString,
@@ -80,6 +100,16 @@ class ProductDBServiceStub(object):
                 request_serializer=product__db__pb2.GetItemSellerRequest.SerializeToString,
                 response_deserializer=product__db__pb2.GetItemSellerResponse.FromString,
                 _registered_method=True)
+        self.WatchProducts = channel.unary_stream(
+                '/product_db.ProductDBService/WatchProducts',
+                request_serializer=product__db__pb2.WatchProductsRequest.SerializeToString,
+                response_deserializer=product__db__pb2.ProductChange.FromString,
+                _registered_method=True)
+        self.GetClusterStatus = channel.unary_unary(
+                '/product_db.ProductDBService/GetClusterStatus',
+                request_serializer=product__db__pb2.GetClusterStatusRequest.SerializeToString,
+                response_deserializer=product__db__pb2.GetClusterStatusResponse.FromString,
+                _registered_method=True)
 
 
 class ProductDBServiceServicer(object):
@@ -104,6 +134,12 @@ class ProductDBServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def UpdateItemQuantities(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetItemsBySeller(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -116,12 +152,30 @@ class ProductDBServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SearchItemsStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RankedSearchItems(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetItem(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetItems(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def UpdateItemFeedback(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -140,6 +194,18 @@ class ProductDBServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WatchProducts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetClusterStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ProductDBServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -158,6 +224,11 @@ def add_ProductDBServiceServicer_to_server(servicer, server):
                     request_deserializer=product__db__pb2.UpdateItemQuantityRequest.FromString,
                     response_serializer=product__db__pb2.UpdateItemQuantityResponse.SerializeToString,
             ),
+            'UpdateItemQuantities': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateItemQuantities,
+                    request_deserializer=product__db__pb2.UpdateItemQuantitiesRequest.FromString,
+                    response_serializer=product__db__pb2.UpdateItemQuantitiesResponse.SerializeToString,
+            ),
             'GetItemsBySeller': grpc.unary_unary_rpc_method_handler(
                     servicer.GetItemsBySeller,
                     request_deserializer=product__db__pb2.GetItemsBySellerRequest.FromString,
@@ -168,11 +239,26 @@ def add_ProductDBServiceServicer_to_server(servicer, server):
                     request_deserializer=product__db__pb2.SearchItemsRequest.FromString,
                     response_serializer=product__db__pb2.SearchItemsResponse.SerializeToString,
             ),
+            'SearchItemsStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.SearchItemsStream,
+                    request_deserializer=product__db__pb2.SearchItemsRequest.FromString,
+                    response_serializer=product__db__pb2.Item.SerializeToString,
+            ),
+            'RankedSearchItems': grpc.unary_unary_rpc_method_handler(
+                    servicer.RankedSearchItems,
+                    request_deserializer=product__db__pb2.RankedSearchItemsRequest.FromString,
+                    response_serializer=product__db__pb2.RankedSearchItemsResponse.SerializeToString,
+            ),
             'GetItem': grpc.unary_unary_rpc_method_handler(
                     servicer.GetItem,
                     request_deserializer=product__db__pb2.GetItemRequest.FromString,
                     response_serializer=product__db__pb2.GetItemResponse.SerializeToString,
             ),
+            'GetItems': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetItems,
+                    request_deserializer=product__db__pb2.GetItemsRequest.FromString,
+                    response_serializer=product__db__pb2.GetItemsResponse.SerializeToString,
+            ),
             'UpdateItemFeedback': grpc.unary_unary_rpc_method_handler(
                     servicer.UpdateItemFeedback,
                     request_deserializer=product__db__pb2.UpdateItemFeedbackRequest.FromString,
@@ -188,6 +274,16 @@ def add_ProductDBServiceServicer_to_server(servicer, server):
                     request_deserializer=product__db__pb2.GetItemSellerRequest.FromString,
                     response_serializer=product__db__pb2.GetItemSellerResponse.SerializeToString,
             ),
+            'WatchProducts': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchProducts,
+                    request_deserializer=product__db__pb2.WatchProductsRequest.FromString,
+                    response_serializer=product__db__pb2.ProductChange.SerializeToString,
+            ),
+            'GetClusterStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetClusterStatus,
+                    request_deserializer=product__db__pb2.GetClusterStatusRequest.FromString,
+                    response_serializer=product__db__pb2.GetClusterStatusResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'product_db.ProductDBService', rpc_method_handlers)
@@ -281,6 +377,33 @@ class ProductDBService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def UpdateItemQuantities(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/product_db.ProductDBService/UpdateItemQuantities',
+            product__db__pb2.UpdateItemQuantitiesRequest.SerializeToString,
+            product__db__pb2.UpdateItemQuantitiesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetItemsBySeller(request,
             target,
@@ -335,6 +458,60 @@ class ProductDBService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SearchItemsStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/product_db.ProductDBService/SearchItemsStream',
+            product__db__pb2.SearchItemsRequest.SerializeToString,
+            product__db__pb2.Item.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RankedSearchItems(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/product_db.ProductDBService/RankedSearchItems',
+            product__db__pb2.RankedSearchItemsRequest.SerializeToString,
+            product__db__pb2.RankedSearchItemsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetItem(request,
             target,
@@ -362,6 +539,33 @@ class ProductDBService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetItems(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/product_db.ProductDBService/GetItems',
+            product__db__pb2.GetItemsRequest.SerializeToString,
+            product__db__pb2.GetItemsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def UpdateItemFeedback(request,
             target,
@@ -442,3 +646,57 @@ class ProductDBService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def WatchProducts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/product_db.ProductDBService/WatchProducts',
+            product__db__pb2.WatchProductsRequest.SerializeToString,
+            product__db__pb2.ProductChange.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetClusterStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/product_db.ProductDBService/GetClusterStatus',
+            product__db__pb2.GetClusterStatusRequest.SerializeToString,
+            product__db__pb2.GetClusterStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
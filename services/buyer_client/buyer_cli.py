@@ -305,8 +305,14 @@ class BuyerCLI:
                     print("Your active shopping cart is empty.")
                 else:
                     print("\n--- Active Shopping Cart ---")
-                    for item_id, quantity in cart_items.items():
-                        print(f"Item ID: {item_id}, Quantity: {quantity}")
+                    for line in response.get("items", []):
+                        if "item_name" not in line:
+                            print(f"Item ID: {line['item_id']}, Quantity: {line['quantity']} (no longer listed)")
+                            continue
+                        note = "" if line["available"] else " (not enough in stock)"
+                        print(f"Item ID: {line['item_id']}, {line['item_name']}, "
+                              f"Quantity: {line['quantity']}, Price: ${line['sale_price']:.2f}{note}")
+                    print(f"Total: ${response.get('total_price', 0):.2f}")
                     print()
             else:
                 print(f"Error: {response.get('message', 'Could not retrieve cart')}")
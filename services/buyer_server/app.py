@@ -4,112 +4,78 @@ Flask-based RESTful API server for buyer operations (gRPC-based)
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import grpc
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 
 # Add generated protobuf path
 sys.path.insert(0, '/app/generated')
 
 import auth
-import customer_db_pb2
-import customer_db_pb2_grpc
-import product_db_pb2
-import product_db_pb2_grpc
+import flows
+import item_cache
+import routes
 import requests
 from zeep import Client
-import random
+from customer_db_client import CustomerDBClient
+from product_db_client import ProductDBClient
 
 # Initialize Flask app
 app = Flask(__name__)
 
 # Global gRPC clients
-product_db_channel = None
-product_db_stub = None
-customer_db_channel = None
+product_db = None
 customer_db_stub = None
 soap_client = None
-product_db_hosts = None
-product_db_port = None
-_product_db_channels = {}  # host -> grpc.Channel cache
+# The clients routes handlers call, by name
+clients = {}
+
+# Runs make_purchase's stock decrement while the request thread records the
+# transaction. The clients' own blocking calls are used rather than gRPC
+# futures so the calls keep replica failover and the read-your-writes tokens.
+purchase_pool = ThreadPoolExecutor(max_workers=int(os.getenv("PURCHASE_POOL_WORKERS", "32")),
+                                   thread_name_prefix="purchase")
 
 _ft_host = os.getenv("FINANCIAL_TRANSACTIONS_HOST", "financial-transactions")
 _ft_port = os.getenv("FINANCIAL_TRANSACTIONS_PORT", "8000")
 SOAP_WSDL = f"http://{_ft_host}:{_ft_port}/?wsdl"
 SOAP_ENDPOINT = f"http://{_ft_host}:{_ft_port}/"
 
-def get_product_db_stub():
-    """
-    Tries to connect to ANY available node in the cluster.
-    Reuses cached channels to avoid file descriptor exhaustion.
-    """
-    hosts = product_db_hosts[:]
-    random.shuffle(hosts)
-
-    for host in hosts:
-        addr = host if ":" in host else f"{host}:{product_db_port}"
-        try:
-            if addr not in _product_db_channels:
-                _product_db_channels[addr] = grpc.insecure_channel(addr)
-            channel = _product_db_channels[addr]
-            grpc.channel_ready_future(channel).result(timeout=2)
-            return product_db_pb2_grpc.ProductDBServiceStub(channel)
-        except (grpc.FutureTimeoutError, grpc.RpcError):
-            print(f"Node {host} is down/starting, trying next...")
-            _product_db_channels.pop(addr, None)
-            continue
-
-    return None # All nodes are down
-
-def call_with_failover(method_name, request):
-    """Try up to 3 different nodes if one is down"""
-    for _ in range(3):
-        stub = get_product_db_stub()
-        if not stub:
-            continue
-        try:
-            # Set a timeout so we don't wait forever on a crashed node
-            return getattr(stub, method_name)(request, timeout=5)
-        except grpc.RpcError as e:
-            print(f"Connection to node failed, retrying another... {e.code()}")
-            continue
-    raise Exception("All attempted gRPC nodes are unavailable.")
-
 def init_grpc_clients():
     """Initialize gRPC client stubs for database services"""
-    global product_db_channel, product_db_stub, customer_db_channel, customer_db_stub, soap_client, product_db_hosts, product_db_port
+    global product_db, customer_db_stub, soap_client
 
     hosts_string = os.getenv("PRODUCT_DB_HOSTS", "product-db-0,product-db-1,product-db-2,product-db-3,product-db-4")
     product_db_hosts = [h.strip() for h in hosts_string.split(",") if h.strip()]
     
     product_db_port = os.getenv("PRODUCT_DB_PORT", "50051")
-    customer_db_host = os.getenv("CUSTOMER_DB_HOST", "customer-db-0")
+    customer_hosts_string = os.getenv("CUSTOMER_DB_HOSTS", "customer-db-0,customer-db-1,customer-db-2,customer-db-3,customer-db-4")
+    customer_db_hosts = [h.strip() for h in customer_hosts_string.split(",") if h.strip()]
     customer_db_port = os.getenv("CUSTOMER_DB_PORT", "50052")
 
+    product_db = ProductDBClient(product_db_hosts, product_db_port)
+    product_db.start()
     for attempt in range(30):
-        try:
-            product_db_channel = grpc.insecure_channel(product_db_hosts[0] if ":" in product_db_hosts[0] else f"{product_db_hosts[0]}:{product_db_port}")
-            product_db_stub = product_db_pb2_grpc.ProductDBServiceStub(product_db_channel)
-            grpc.channel_ready_future(product_db_channel).result(timeout=5)
-            print(f"Connected to product-db at {product_db_hosts[0]}:{product_db_port}")
+        if product_db.ready:
+            print(f"Connected to product-db ({len(product_db.ready)} nodes ready, leader {product_db.leader})")
             break
-        except grpc.FutureTimeoutError:
-            print(f"Waiting for product-db at {product_db_hosts[0]}:{product_db_port} (attempt {attempt+1}/30)...")
-            time.sleep(10)
+        print(f"Waiting for product-db at {','.join(product_db_hosts)} (attempt {attempt+1}/30)...")
+        time.sleep(10)
 
+    # Any ABP replica can serve any call; CustomerDBClient spreads them
+    customer_db_stub = CustomerDBClient(customer_db_hosts, customer_db_port)
     for attempt in range(30):
-        try:
-            customer_db_channel = grpc.insecure_channel(f'{customer_db_host}:{customer_db_port}')
-            customer_db_stub = customer_db_pb2_grpc.CustomerDBServiceStub(customer_db_channel)
-            grpc.channel_ready_future(customer_db_channel).result(timeout=5)
-            print(f"Connected to customer-db at {customer_db_host}:{customer_db_port}")
+        ready = customer_db_stub.wait_ready(timeout=5)
+        if ready:
+            print(f"Connected to customer-db at {','.join(ready)}")
             break
-        except grpc.FutureTimeoutError:
-            print(f"Waiting for customer-db at {customer_db_host}:{customer_db_port} (attempt {attempt+1}/30)...")
-            time.sleep(10)
+        print(f"Waiting for customer-db at {','.join(customer_db_hosts)} (attempt {attempt+1}/30)...")
+        time.sleep(10)
 
     # Inject customer_db_stub into auth module
     auth.set_customer_db_stub(customer_db_stub)
+    item_cache.set_product_db_client(product_db)
 
     print("Buyer server initialized with gRPC clients")
     try:
@@ -120,653 +86,132 @@ def init_grpc_clients():
         print(f"Warning: financial-transactions unavailable ({e}). Payment processing disabled.")
         soap_client = None
 
+    clients.update(customer_db=customer_db_stub, product_db=product_db, item_cache=item_cache,
+                   payment=soap_client.service if soap_client else None)
+
+
+def _run(handler):
+    """Run a routes handler on the blocking clients"""
+    body, status = flows.run(handler, clients, purchase_pool)
+    return jsonify(body), status
+
+
 @app.route('/api/buyers/accounts', methods=['POST'])
 def create_account():
     """Create a new buyer account"""
-    data = request.json
-    username = data.get("username")
-    password = data.get("password")
-
-    try:
-        request_msg = customer_db_pb2.CreateBuyerRequest(
-            username=username,
-            password=password
-        )
-        response = customer_db_stub.CreateBuyer(request_msg)
-
-        if not response.success:
-            if "already exists" in response.error_message.lower():
-                return jsonify({
-                    "status": "Error",
-                    "message": "Username already exists."
-                }), 409
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        return jsonify({
-            "status": "OK",
-            "buyer_id": response.buyer_id
-        }), 201
-
-    except grpc.RpcError as e:
-        print(f"gRPC error creating buyer account: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to create account."
-        }), 500
+    return _run(routes.create_account(request.json))
 
 
 @app.route('/api/buyers/sessions', methods=['POST'])
 def login():
     """Login and create a new session with active cart"""
-    data = request.json
-    username = data.get("username")
-    password = data.get("password")
-
-    try:
-        request_msg = customer_db_pb2.BuyerLoginRequest(
-            username=username,
-            password=password
-        )
-        response = customer_db_stub.BuyerLogin(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": "Username/Password combination does not exist."
-            }), 401
-
-        return jsonify({
-            "status": "OK",
-            "session_id": response.session_id,
-            "buyer_id": response.buyer_id,
-            "message": f"I've seen enough. Welcome back {response.username}"
-        }), 201
-
-    except grpc.RpcError as e:
-        print(f"gRPC error logging into buyer account: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to log in to buyer account."
-        }), 500
+    return _run(routes.login(request.json))
 
 
 @app.route('/api/buyers/sessions', methods=['DELETE'])
 @auth.require_auth(user_type='buyer')
 def logout(session_id, buyer_id):
     """Logout and delete the session"""
-    try:
-        request_msg = customer_db_pb2.LogoutRequest(session_id=session_id)
-        response = customer_db_stub.BuyerLogout(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": "Failed to log out."
-            }), 500
-
-        return jsonify({
-            "status": "OK",
-            "message": "Successfully logged out."
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error logging out of buyer session: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to log out of buyer session."
-        }), 500
+    return _run(routes.logout(session_id, buyer_id))
 
 
 @app.route('/api/buyers/items/search', methods=['GET'])
 @auth.require_auth(user_type='buyer')
 def search_items(session_id, buyer_id):
-    """Search for items by category and keywords"""
-    category = request.args.get("category", type=int)
-    keywords = request.args.getlist("keywords")
+    """Search for items by category and keywords (see routes.search_items)"""
+    page, status = flows.run(routes.search_items(session_id, buyer_id, request.args), clients)
+    if not isinstance(page, routes.SearchPage):
+        return jsonify(page), status
+
+    def generate():
+        yield page.HEAD
+        product = page.first
+        try:
+            while product is not None:
+                chunk = page.chunk(product)
+                if chunk is None:
+                    break
+                yield chunk
+                product = next(page.stream, None)
+        except grpc.RpcError as e:
+            # Headers are already sent; the truncated body tells the client
+            print(f"gRPC error streaming search results: {e.code()} - {e.details()}")
+            return
+        finally:
+            page.stream.cancel()
+        yield page.tail()
 
-    try:
-        request_msg = product_db_pb2.SearchItemsRequest(
-            category=category,
-            keywords=keywords  # list automatically converts to repeated
-        )
-        response = product_db_stub.SearchItems(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        # Convert protobuf Product messages to dict
-        results = []
-        for product in response.items:
-            results.append({
-                "item_id": product.item_id,
-                "seller_id": product.seller_id,
-                "item_name": product.item_name,
-                "category": product.category,
-                "keywords": list(product.keywords),
-                "condition": product.condition,
-                "sale_price": product.sale_price,
-                "quantity": product.quantity,
-                "thumbs_up": product.thumbs_up,
-                "thumbs_down": product.thumbs_down
-            })
-
-        return jsonify({
-            "status": "OK",
-            "items": results
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error searching items: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to search items."
-        }), 500
+    return Response(stream_with_context(generate()), status=status, mimetype='application/json')
 
 
 @app.route('/api/buyers/items/<int:item_id>', methods=['GET'])
 @auth.require_auth(user_type='buyer')
 def get_item(session_id, buyer_id, item_id):
     """Get details of a specific item"""
-    try:
-        request_msg = product_db_pb2.GetItemRequest(item_id=item_id)
-        response = product_db_stub.GetItem(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": "Item not found."
-            }), 404
-
-        # Convert protobuf Product to dict
-        result = {
-            "item_id": response.item.item_id,
-            "seller_id": response.item.seller_id,
-            "item_name": response.item.item_name,
-            "category": response.item.category,
-            "keywords": list(response.item.keywords),
-            "condition": response.item.condition,
-            "sale_price": response.item.sale_price,
-            "quantity": response.item.quantity,
-            "thumbs_up": response.item.thumbs_up,
-            "thumbs_down": response.item.thumbs_down
-        }
-
-        return jsonify({
-            "status": "OK",
-            "item": result
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error getting item details: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to get item details."
-        }), 500
+    return _run(routes.get_item(session_id, buyer_id, item_id))
 
 
 @app.route('/api/buyers/cart/items/<int:item_id>', methods=['POST'])
 @auth.require_auth(user_type='buyer')
 def add_item_to_cart(session_id, buyer_id, item_id):
     """Add item to cart (with quantity validation)"""
-    data = request.json
-    quantity = data.get("quantity")
-
-    try:
-        # Step 1: Validate item exists and has sufficient quantity
-        quantity_req = product_db_pb2.GetItemQuantityRequest(item_id=item_id)
-        quantity_resp = product_db_stub.GetItemQuantity(quantity_req)
-
-        if not quantity_resp.success:
-            return jsonify({
-                "status": "Error",
-                "message": "Item ID does not exist."
-            }), 404
-
-        if quantity_resp.quantity < quantity:
-            return jsonify({
-                "status": "Error",
-                "message": "Quantity requested is less than available quantity."
-            }), 400
-
-        # Step 2: Add to cart
-        add_req = customer_db_pb2.AddItemToCartRequest(
-            session_id=session_id,
-            item_id=item_id,
-            quantity=quantity
-        )
-        add_resp = customer_db_stub.AddItemToCart(add_req)
-
-        if not add_resp.success:
-            return jsonify({
-                "status": "Error",
-                "message": add_resp.error_message
-            }), 500
-
-        return jsonify({
-            "status": "OK",
-            "message": f"Item ID {item_id} with quantity {quantity} added to cart."
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error adding item to cart: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to add item to cart."
-        }), 500
+    return _run(routes.add_item_to_cart(session_id, buyer_id, item_id, request.json))
 
 
 @app.route('/api/buyers/cart/items/<int:item_id>', methods=['DELETE'])
 @auth.require_auth(user_type='buyer')
 def remove_item_from_cart(session_id, buyer_id, item_id):
     """Remove item from cart"""
-    data = request.json
-    quantity = data.get("quantity")
-
-    try:
-        request_msg = customer_db_pb2.RemoveItemFromCartRequest(
-            session_id=session_id,
-            item_id=item_id,
-            quantity=quantity
-        )
-        response = customer_db_stub.RemoveItemFromCart(request_msg)
-
-        if not response.success:
-            if "does not exist in cart" in response.error_message.lower():
-                return jsonify({
-                    "status": "Error",
-                    "message": "Item ID does not exist in cart"
-                }), 404
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        # Determine message based on whether item was fully or partially removed
-        message = f"Item ID {item_id} with quantity {quantity} removed from cart."
-
-        return jsonify({
-            "status": "OK",
-            "message": message
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error removing item from cart: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to remove item from cart."
-        }), 500
+    return _run(routes.remove_item_from_cart(session_id, buyer_id, item_id, request.json))
 
 
 @app.route('/api/buyers/cart/save', methods=['POST'])
 @auth.require_auth(user_type='buyer')
 def save_cart(session_id, buyer_id):
     """Save active cart to saved cart"""
-    try:
-        request_msg = customer_db_pb2.SaveCartRequest(
-            session_id=session_id,
-            buyer_id=buyer_id
-        )
-        response = customer_db_stub.SaveCart(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        return jsonify({
-            "status": "OK",
-            "message": "Cart saved successfully."
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error saving cart: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to save cart."
-        }), 500
+    return _run(routes.save_cart(session_id, buyer_id))
 
 
 @app.route('/api/buyers/cart', methods=['DELETE'])
 @auth.require_auth(user_type='buyer')
 def clear_cart(session_id, buyer_id):
     """Clear both saved and active cart"""
-    try:
-        request_msg = customer_db_pb2.ClearCartRequest(
-            session_id=session_id,
-            buyer_id=buyer_id
-        )
-        response = customer_db_stub.ClearCart(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        return jsonify({
-            "status": "OK",
-            "message": "Cart cleared successfully."
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error clearing cart: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to clear cart."
-        }), 500
+    return _run(routes.clear_cart(session_id, buyer_id))
 
 
 @app.route('/api/buyers/cart', methods=['GET'])
 @auth.require_auth(user_type='buyer')
 def display_cart(session_id, buyer_id):
     """Display active cart"""
-    try:
-        request_msg = customer_db_pb2.GetActiveCartRequest(session_id=session_id)
-        response = customer_db_stub.GetActiveCart(request_msg)
-
-        if not response.success:
-            if "does not exist" in response.error_message.lower():
-                return jsonify({
-                    "status": "Error",
-                    "message": "Cart does not exist for this session."
-                }), 404
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        # Convert protobuf map to dict
-        cart_dict = dict(response.cart_items.items)
-
-        return jsonify({
-            "status": "OK",
-            "cart_items": cart_dict
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error displaying cart: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to display cart."
-        }), 500
+    return _run(routes.display_cart(session_id, buyer_id))
 
 
 @app.route('/api/buyers/purchases', methods=['POST'])
 @auth.require_auth(user_type='buyer')
 def make_purchase(session_id, buyer_id):
-    """Make a purchase"""
-    data = request.json
-    cardholder_name = data.get("cardholder_name")
-    card_number = data.get("card_number")
-    expiry_month = data.get("expiry_month")
-    expiry_year = data.get("expiry_year")
-    security_code = data.get("security_code")
-
-    try:
-        print("Getting saved cart items")
-        request_msg = customer_db_pb2.GetSavedCartRequest(buyer_id=buyer_id)
-        response = customer_db_stub.GetSavedCart(request_msg)
-
-        if not response.success:
-            if "does not exist" in response.error_message.lower():
-                return jsonify({
-                    "status": "Error",
-                    "message": "Cart does not exist for this session."
-                }), 404
-            return jsonify({
-                "status": "Error",
-                "message": response.error_message
-            }), 500
-
-        # Convert protobuf map to dict
-        cart_dict = dict(response.cart_items.items)
-        print(f"Got saved cart items: {cart_dict}")
-
-        if len(cart_dict) == 0:
-            return jsonify({
-                "status": "OK",
-                "message": "Saved Cart is empty."
-            }), 200
-
-        amount = 0
-        item_ids = []
-        update_quantity_request_msgs = []
-        for item_id_str, quantity in cart_dict.items():
-            item_id = int(item_id_str)
-
-            request_msg = product_db_pb2.GetItemRequest(item_id=item_id)
-            item_response = product_db_stub.GetItem(request_msg)
-
-            if not item_response.success:
-                return jsonify({
-                    "status": "Error",
-                    "message": "Item not found."
-                }), 404
-
-            if item_response.item.quantity < quantity:
-                return jsonify({
-                    "status": "Error",
-                    "message": f"Available quantity of item {item_id} is less than the requested quantity."
-                }), 404
-
-            amount += item_response.item.sale_price * quantity
-            item_ids.append(item_id)
-            
-            update_quantity_request_msgs.append(product_db_pb2.UpdateItemQuantityRequest(
-                item_id=item_id,
-                seller_id=item_response.item.seller_id,
-                quantity_change=quantity
-            ))
-        
-        if soap_client is None:
-            return jsonify({"status": "Error", "message": "Payment service unavailable."}), 503
-
-        result = soap_client.service.process_payment(cardholder_name, card_number, expiry_month, expiry_year, security_code)
-
-        if result == "No":
-            return jsonify({
-                "status": "Error",
-                "message": "Payment declined."
-            }), 401
-        elif result == "Yes":
-            request_msg = customer_db_pb2.InsertTransactionRequest(
-                buyer_id = buyer_id,
-                cardholder_name = cardholder_name,
-                card_number = card_number,
-                expiry_month = expiry_month,
-                expiry_year = expiry_year,
-                security_code = security_code,
-                amount = amount,
-            )
-            transaction_response = customer_db_stub.InsertTransaction(request_msg)
-            transaction_id = transaction_response.transaction_id
-
-            request_msg = customer_db_pb2.InsertPurchaseRequest(
-                buyer_id = buyer_id,
-                transaction_id = transaction_id,
-                item_ids = item_ids
-            )
-            purchase_response = customer_db_stub.InsertPurchase(request_msg)
-
-            # Maybe better to have a bulk update quantity gRPC?
-            # update products quantities
-            for request_msg in update_quantity_request_msgs:
-                response = call_with_failover("UpdateItemQuantity", request_msg)
-
-                if not response.success:
-                    return jsonify({
-                        "status": "Error",
-                        "message": f"Error updating quantity for item {request_msg.item_id}"
-                    })
-
-                    # mark transaction failed
-                    # rollback updated quantities
-
-            try:
-                request_msg = customer_db_pb2.ClearCartRequest(
-                    session_id=session_id,
-                    buyer_id=buyer_id
-                )
-                response = customer_db_stub.ClearCart(request_msg)
-
-                if not response.success:
-                    return jsonify({
-                        "status": "Error",
-                        "message": response.error_message
-                    }), 500
-
-            except grpc.RpcError as e:
-                print(f"gRPC error clearing cart: {e.code()} - {e.details()}")
-                return jsonify({
-                    "status": "Error",
-                    "message": "Failed to clear cart."
-                }), 500
-
-            return jsonify({
-                "status": "OK",
-                "message": "Payment successful.",
-                "transaction_id": transaction_id,
-                "purchase_id": purchase_response.purchase_id
-            }), 200
-        else:
-            return jsonify({
-                "status": "Error",
-                "message": "Unknown error while processing payment. Failed to make purchase."
-            }), 401
-
-    except Exception as e:
-        print(f"Error in make_purchase: {type(e).__name__}: {e}")
-        return jsonify({
-            "status": "Error",
-            "message": f"Failed to make purchase: {e}"
-        }), 500
+    """Make a purchase (see routes.make_purchase)"""
+    return _run(routes.make_purchase(session_id, buyer_id, request.json, soap_client is not None))
 
 
 @app.route('/api/buyers/feedback', methods=['POST'])
 @auth.require_auth(user_type='buyer')
 def provide_feedback(session_id, buyer_id):
     """Provide feedback for an item (multi-step gRPC operation)"""
-    data = request.json
-    item_id = data.get("item_id")
-    feedback = data.get("feedback")  # 0 or 1
-
-    if feedback not in [0, 1]:
-        return jsonify({
-            "status": "Error",
-            "message": "Invalid feedback value. Must be 0 or 1."
-        }), 400
-
-    try:
-        # Step 1: Get seller_id for the item
-        seller_req = product_db_pb2.GetItemSellerRequest(item_id=item_id)
-        seller_resp = product_db_stub.GetItemSeller(seller_req)
-
-        if not seller_resp.success:
-            return jsonify({
-                "status": "Error",
-                "message": f"Item with ID {item_id} not found."
-            }), 404
-
-        seller_id = seller_resp.seller_id
-
-        # Step 2: Update item feedback
-        item_feedback_req = product_db_pb2.UpdateItemFeedbackRequest(
-            item_id=item_id,
-            thumbs_up=(feedback == 1)
-        )
-        item_feedback_resp = call_with_failover("UpdateItemFeedback", item_feedback_req)
-
-        if not item_feedback_resp.success:
-            return jsonify({
-                "status": "Error",
-                "message": "Failed to update item feedback."
-            }), 500
-
-        # Step 3: Update seller feedback (don't fail entire operation if this fails)
-        try:
-            seller_feedback_req = customer_db_pb2.UpdateSellerFeedbackRequest(
-                seller_id=seller_id,
-                thumbs_up=(feedback == 1)
-            )
-            seller_feedback_resp = customer_db_stub.UpdateSellerFeedback(seller_feedback_req)
-
-            if not seller_feedback_resp.success:
-                print(f"Warning: Failed to update seller feedback: {seller_feedback_resp.error_message}")
-        except grpc.RpcError as e:
-            print(f"Warning: gRPC error updating seller feedback: {e.code()} - {e.details()}")
-
-        return jsonify({
-            "status": "OK",
-            "message": "Feedback recorded successfully."
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error providing feedback: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to provide feedback."
-        }), 500
-    except Exception as e:
-        print(f"Product DB cluster unavailable: {e}")
-        return jsonify({
-            "status": "Error",
-            "message": "Product database cluster is temporarily unavailable."
-        }), 503
+    return _run(routes.provide_feedback(session_id, buyer_id, request.json))
 
 
 @app.route('/api/buyers/sellers/<int:seller_id>/rating', methods=['GET'])
 @auth.require_auth(user_type='buyer')
 def get_seller_rating(session_id, buyer_id, seller_id):
     """Get seller rating"""
-    try:
-        request_msg = customer_db_pb2.GetSellerRatingRequest(seller_id=seller_id)
-        response = customer_db_stub.GetSellerRating(request_msg)
-
-        if not response.success:
-            return jsonify({
-                "status": "Error",
-                "message": "Seller not found."
-            }), 404
-
-        return jsonify({
-            "status": "OK",
-            "thumbs_up": response.rating.thumbs_up,
-            "thumbs_down": response.rating.thumbs_down
-        }), 200
-
-    except grpc.RpcError as e:
-        print(f"gRPC error getting seller rating: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to get seller rating."
-        }), 500
+    return _run(routes.get_seller_rating(session_id, buyer_id, seller_id))
 
 
 @app.route('/api/buyers/purchases', methods=['GET'])
 @auth.require_auth(user_type='buyer')
 def get_buyer_purchases(session_id, buyer_id):
     """Get buyer purchase history"""
-    try:
-        request_msg = customer_db_pb2.GetBuyerPurchasesRequest(
-            buyer_id = buyer_id
-        )
-        response = customer_db_stub.GetBuyerPurchases(request_msg)
-
-        purchases = [{"purchase_id": p.purchase_id, "item_ids": list(p.item_ids)} for p in response.purchases]
-        return jsonify({"status": "OK", "purchases": purchases}), 200
-    except grpc.RpcError as e:
-        print(f"gRPC error getting buyer purchases: {e.code()} - {e.details()}")
-        return jsonify({
-            "status": "Error",
-            "message": "Failed to get buyer purchases."
-        }), 500
+    return _run(routes.get_buyer_purchases(session_id, buyer_id))
 
 
 if __name__ == "__main__":
@@ -776,5 +221,11 @@ if __name__ == "__main__":
     server_host = os.getenv("SERVER_HOST", "0.0.0.0")
     server_port = int(os.getenv("SERVER_PORT", "6000"))
 
-    print(f"Starting Buyer Flask server on {server_host}:{server_port}")
-    app.run(host=server_host, port=server_port, debug=False, threaded=True)
+    if os.getenv("SERVER_MODE", "threads") == "asyncio":
+        # Coroutines on one event loop instead of a thread per request
+        import async_app
+        print(f"Starting Buyer asyncio server on {server_host}:{server_port}")
+        async_app.serve(product_db, customer_db_stub, server_host, server_port)
+    else:
+        print(f"Starting Buyer Flask server on {server_host}:{server_port}")
+        app.run(host=server_host, port=server_port, debug=False, threaded=True)
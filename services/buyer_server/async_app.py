@@ -0,0 +1,226 @@
+"""
+asyncio serving mode for the buyer REST API (SERVER_MODE=asyncio)
+
+The same routes as app.py, as Quart coroutines served by Hypercorn on one
+event loop. Both modes run the handlers in routes.py; here their
+product-db, customer-db and payment calls are awaited, on grpc.aio and
+zeep's AsyncClient. A request waiting on a slow purchase holds a coroutine
+rather than an OS thread, so one process can keep tens of thousands of
+requests in flight. app.py still sets up the synchronous clients: their background
+threads (product-db status polling, the session invalidation and product
+change streams) are shared with this mode.
+"""
+import asyncio
+import os
+import sys
+import types
+
+import grpc
+from hypercorn.asyncio import serve as hypercorn_serve
+from hypercorn.config import Config
+from quart import Quart, Response, jsonify, request
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+
+import async_auth
+import flows
+import item_cache
+import routes
+from zeep import AsyncClient
+from customer_db_client import AsyncCustomerDBClient
+from product_db_client import AsyncProductDBClient
+
+# Pending connections the listening socket queues
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "4096"))
+
+_ft_host = os.getenv("FINANCIAL_TRANSACTIONS_HOST", "financial-transactions")
+_ft_port = os.getenv("FINANCIAL_TRANSACTIONS_PORT", "8000")
+SOAP_WSDL = f"http://{_ft_host}:{_ft_port}/?wsdl"
+SOAP_ENDPOINT = f"http://{_ft_host}:{_ft_port}/"
+
+# Initialize Quart app
+app = Quart(__name__)
+
+# Synchronous clients from app.py (set by serve)
+_product_db_client = None
+_customer_db_client = None
+
+# grpc.aio clients, created on the event loop
+product_db = None
+customer_db_stub = None
+soap_client = None
+# The clients routes handlers call, by name
+clients = {}
+
+
+@app.before_serving
+async def init_aio_clients():
+    """Wrap app.py's clients with grpc.aio transports on the serving loop"""
+    global product_db, customer_db_stub, soap_client
+
+    product_db = AsyncProductDBClient(_product_db_client)
+    customer_db_stub = AsyncCustomerDBClient(_customer_db_client)
+    async_auth.set_customer_db_client(customer_db_stub)
+    item_cache.set_aio_product_db_client(product_db)
+
+    try:
+        soap_client = AsyncClient(SOAP_WSDL)
+        soap_client.service._binding_options["address"] = SOAP_ENDPOINT
+        print(f"Connected to financial-transactions at {SOAP_WSDL}")
+    except Exception as e:
+        print(f"Warning: financial-transactions unavailable ({e}). Payment processing disabled.")
+        soap_client = None
+
+    item_reads = types.SimpleNamespace(get_item=item_cache.get_item_async,
+                                       get_items=item_cache.get_items_async)
+    clients.update(customer_db=customer_db_stub, product_db=product_db, item_cache=item_reads,
+                   payment=soap_client.service if soap_client else None)
+
+
+def serve(product_db_client, customer_db_client, host, port):
+    """
+    Serve the API on an asyncio event loop until interrupted.
+
+    Args:
+        product_db_client: app.py's started ProductDBClient
+        customer_db_client: app.py's CustomerDBClient
+    """
+    global _product_db_client, _customer_db_client
+    _product_db_client = product_db_client
+    _customer_db_client = customer_db_client
+
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    config.backlog = SERVER_BACKLOG
+    asyncio.run(hypercorn_serve(app, config))
+
+
+async def _next_message(stream):
+    """Next message of a grpc.aio response stream, or None at its end"""
+    message = await stream.read()
+    return None if message is grpc.aio.EOF else message
+
+
+async def _run(handler):
+    """Run a routes handler on the grpc.aio clients"""
+    body, status = await flows.run_async(handler, clients)
+    return jsonify(body), status
+
+
+@app.route('/api/buyers/accounts', methods=['POST'])
+async def create_account():
+    """Create a new buyer account"""
+    return await _run(routes.create_account(await request.get_json()))
+
+
+@app.route('/api/buyers/sessions', methods=['POST'])
+async def login():
+    """Login and create a new session with active cart"""
+    return await _run(routes.login(await request.get_json()))
+
+
+@app.route('/api/buyers/sessions', methods=['DELETE'])
+@async_auth.require_auth(user_type='buyer')
+async def logout(session_id, buyer_id):
+    """Logout and delete the session"""
+    return await _run(routes.logout(session_id, buyer_id))
+
+
+@app.route('/api/buyers/items/search', methods=['GET'])
+@async_auth.require_auth(user_type='buyer')
+async def search_items(session_id, buyer_id):
+    """Search for items by category and keywords (see routes.search_items)"""
+    page, status = await flows.run_async(routes.search_items(session_id, buyer_id, request.args), clients)
+    if not isinstance(page, routes.SearchPage):
+        return jsonify(page), status
+
+    async def generate():
+        yield page.HEAD
+        product = page.first
+        try:
+            while product is not None:
+                chunk = page.chunk(product)
+                if chunk is None:
+                    break
+                yield chunk
+                product = await _next_message(page.stream)
+        except grpc.RpcError as e:
+            # Headers are already sent; the truncated body tells the client
+            print(f"gRPC error streaming search results: {e.code()} - {e.details()}")
+            return
+        finally:
+            page.stream.cancel()
+        yield page.tail()
+
+    return Response(generate(), status=status, mimetype='application/json')
+
+
+@app.route('/api/buyers/items/<int:item_id>', methods=['GET'])
+@async_auth.require_auth(user_type='buyer')
+async def get_item(session_id, buyer_id, item_id):
+    """Get details of a specific item"""
+    return await _run(routes.get_item(session_id, buyer_id, item_id))
+
+
+@app.route('/api/buyers/cart/items/<int:item_id>', methods=['POST'])
+@async_auth.require_auth(user_type='buyer')
+async def add_item_to_cart(session_id, buyer_id, item_id):
+    """Add item to cart (with quantity validation)"""
+    return await _run(routes.add_item_to_cart(session_id, buyer_id, item_id, await request.get_json()))
+
+
+@app.route('/api/buyers/cart/items/<int:item_id>', methods=['DELETE'])
+@async_auth.require_auth(user_type='buyer')
+async def remove_item_from_cart(session_id, buyer_id, item_id):
+    """Remove item from cart"""
+    return await _run(routes.remove_item_from_cart(session_id, buyer_id, item_id, await request.get_json()))
+
+
+@app.route('/api/buyers/cart/save', methods=['POST'])
+@async_auth.require_auth(user_type='buyer')
+async def save_cart(session_id, buyer_id):
+    """Save active cart to saved cart"""
+    return await _run(routes.save_cart(session_id, buyer_id))
+
+
+@app.route('/api/buyers/cart', methods=['DELETE'])
+@async_auth.require_auth(user_type='buyer')
+async def clear_cart(session_id, buyer_id):
+    """Clear both saved and active cart"""
+    return await _run(routes.clear_cart(session_id, buyer_id))
+
+
+@app.route('/api/buyers/cart', methods=['GET'])
+@async_auth.require_auth(user_type='buyer')
+async def display_cart(session_id, buyer_id):
+    """Display active cart"""
+    return await _run(routes.display_cart(session_id, buyer_id))
+
+
+@app.route('/api/buyers/purchases', methods=['POST'])
+@async_auth.require_auth(user_type='buyer')
+async def make_purchase(session_id, buyer_id):
+    """Make a purchase (see routes.make_purchase)"""
+    return await _run(routes.make_purchase(session_id, buyer_id, await request.get_json(), soap_client is not None))
+
+
+@app.route('/api/buyers/feedback', methods=['POST'])
+@async_auth.require_auth(user_type='buyer')
+async def provide_feedback(session_id, buyer_id):
+    """Provide feedback for an item (multi-step gRPC operation)"""
+    return await _run(routes.provide_feedback(session_id, buyer_id, await request.get_json()))
+
+
+@app.route('/api/buyers/sellers/<int:seller_id>/rating', methods=['GET'])
+@async_auth.require_auth(user_type='buyer')
+async def get_seller_rating(session_id, buyer_id, seller_id):
+    """Get seller rating"""
+    return await _run(routes.get_seller_rating(session_id, buyer_id, seller_id))
+
+
+@app.route('/api/buyers/purchases', methods=['GET'])
+@async_auth.require_auth(user_type='buyer')
+async def get_buyer_purchases(session_id, buyer_id):
+    """Get buyer purchase history"""
+    return await _run(routes.get_buyer_purchases(session_id, buyer_id))
@@ -0,0 +1,323 @@
+"""
+Read-through cache of product-db items for the buyer server.
+
+Item rows are small and the same few are read on every cart, feedback and
+purchase request, so GetItem results are kept in a bounded LRU keyed by
+item_id. Product-db streams the item_id of every applied price, quantity
+and feedback change over WatchProducts, and the cached row is dropped as
+soon as it arrives. Hits are only served while that stream is connected;
+otherwise every read goes to product-db as before. After a reconnect the
+stream resumes from the last raft index seen, so the cache only has to be
+cleared if product-db could not replay the changes missed meanwhile.
+
+Misses are read from the replica the stream is open on: a row read from a
+replica behind it could predate a change whose invalidation has already
+been applied, and would then stay cached. Hits are not served until the
+stream has caught up with the session's own writes (product_db.session_index()),
+so a buyer always sees the feedback and purchases they just made.
+
+If the watched replica fails a read, the read is retried on the others
+through product_db.read, its row is not cached, and the stream is moved to
+another replica. The stream is also moved when product-db's status poll
+shows the watched replica falling behind the rest of the cluster.
+"""
+from collections import OrderedDict
+import sys
+import threading
+import time
+
+import grpc
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+
+import product_db_pb2
+
+ITEM_CACHE_SIZE = 10000
+# item_id of the change stream's sync marker
+ALL_ITEMS = 0
+# Seconds between checks that the watched replica is keeping up
+LAG_CHECK_INTERVAL = 1.0
+
+_FAILOVER = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+# Global product-db client (injected by app.py)
+product_db = None
+# AsyncProductDBClient wrapping it, in the asyncio serving mode (injected by async_app.py)
+aio_product_db = None
+# Address, stub and call of the change stream
+_watched_addr = None
+_watched_stub = None
+_watch_call = None
+
+
+class ItemCache:
+    """
+    Bounded LRU of item_id -> Item.
+
+    An invalidation leaves a tombstone holding the change's generation, so a
+    GetItem that started before the change cannot put the old row back.
+    """
+
+    def __init__(self, max_size: int = ITEM_CACHE_SIZE):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        # item_id -> (Item or None, generation it was stored or invalidated at)
+        self.entries = OrderedDict()
+        self.generation = 0
+        # Reads that started before this generation may have missed a change
+        self.valid_from = 0
+        self.connected = False
+        # Raft index of the last change applied, to resume the stream from
+        self.last_index = 0
+
+    def get(self, item_id, min_index: int = 0):
+        """
+        Returns (cached Item or None, generation to pass to put() after a
+        miss). Nothing is returned from the cache before the changes up to
+        min_index have been applied.
+        """
+        with self.lock:
+            entry = self.entries.get(item_id)
+            if not self.connected or self.last_index < min_index or entry is None or entry[0] is None:
+                return None, self.generation
+            self.entries.move_to_end(item_id)
+            return entry[0], self.generation
+
+    def put(self, item_id, item, generation):
+        """Cache item, read from product-db after get() returned generation"""
+        with self.lock:
+            if not self.connected or generation < self.valid_from:
+                return
+            entry = self.entries.get(item_id)
+            if entry is not None and entry[1] > generation:
+                # Changed while it was being read
+                return
+            self.entries[item_id] = (item, generation)
+            self.entries.move_to_end(item_id)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, item_id, raft_index):
+        with self.lock:
+            self.generation += 1
+            self.last_index = max(self.last_index, raft_index)
+            self.entries[item_id] = (None, self.generation)
+            self.entries.move_to_end(item_id)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def synced(self, raft_index, reset: bool):
+        """Every change up to raft_index has been applied; with reset, some were missed"""
+        with self.lock:
+            self.generation += 1
+            if reset:
+                self._clear()
+            self.last_index = max(self.last_index, raft_index)
+            self.connected = True
+
+    def disconnected(self):
+        with self.lock:
+            # Entries are kept, but not served until the missed changes are replayed
+            self.connected = False
+
+    def _clear(self):
+        """Called inside the lock."""
+        self.entries.clear()
+        self.valid_from = self.generation
+
+
+item_cache = ItemCache()
+
+
+def set_product_db_client(client):
+    """
+    Set the product database client and start watching for item changes.
+    Called by app.py during initialization.
+
+    Args:
+        client: ProductDBClient instance
+    """
+    global product_db
+    product_db = client
+    threading.Thread(target=_watch_products, daemon=True, name="item-changes").start()
+    threading.Thread(target=_check_lag, daemon=True, name="item-changes-lag").start()
+
+
+def set_aio_product_db_client(client):
+    """
+    Set the AsyncProductDBClient that get_item_async and get_items_async read
+    through. Called by async_app.py on its event loop.
+    """
+    global aio_product_db
+    aio_product_db = client
+
+
+def _watch_products():
+    """Apply changes streamed by product-db, resubscribing whenever the stream drops"""
+    global _watched_addr, _watched_stub, _watch_call
+    addr = None
+    while True:
+        try:
+            # Prefer another replica than the one the stream was just lost from
+            addr, stub = product_db.read_stub(avoid=addr)
+            request_msg = product_db_pb2.WatchProductsRequest(from_index=item_cache.last_index)
+            _watch_call = stub.WatchProducts(request_msg)
+            _watched_addr, _watched_stub = addr, stub
+            for change in _watch_call:
+                if change.item_id == ALL_ITEMS:
+                    # Follows the replayed changes on every stream, so this is where caching starts
+                    item_cache.synced(change.raft_index, change.reset)
+                else:
+                    item_cache.invalidate(change.item_id, change.raft_index)
+        except grpc.RpcError as e:
+            print(f"Product change stream from {addr} lost: {e.code()} - {e.details()}")
+        _watched_addr = _watched_stub = _watch_call = None
+        item_cache.disconnected()
+        time.sleep(1)
+
+
+def _drop_watch(addr, reason):
+    """Cancel the change stream if it is still open on addr, so it reopens on another replica"""
+    call = _watch_call
+    if call is not None and _watched_addr == addr:
+        print(f"Moving product change stream off {addr}: {reason}")
+        item_cache.disconnected()
+        call.cancel()
+
+
+def _check_lag():
+    """Drop the stream when the status poll shows its replica behind the cluster"""
+    while True:
+        time.sleep(LAG_CHECK_INTERVAL)
+        addr = _watched_addr
+        if addr is None:
+            continue
+        with product_db.lock:
+            lagging = addr in product_db.lagging
+            others_ready = bool(product_db.ready - product_db.lagging - {addr})
+        if lagging and others_ready:
+            _drop_watch(addr, "behind the cluster's commit index")
+
+
+def _read(method_name, request):
+    """
+    Read from the watched replica while cached rows are served, else from
+    any replica.
+
+    Returns:
+        (response, whether its rows may be cached)
+    """
+    addr, stub = _watched_addr, _watched_stub
+    if item_cache.connected and stub is not None:
+        try:
+            return getattr(stub, method_name)(product_db.stamp(request), timeout=5), True
+        except grpc.RpcError as e:
+            if e.code() not in _FAILOVER:
+                raise
+            _drop_watch(addr, f"{method_name} failed ({e.code()})")
+    return product_db.read(method_name, request), False
+
+
+async def _read_async(method_name, request):
+    """_read over grpc.aio"""
+    addr = _watched_addr
+    if item_cache.connected and addr is not None:
+        try:
+            return await getattr(aio_product_db.stubs[addr], method_name)(
+                product_db.stamp(request), timeout=5), True
+        except grpc.RpcError as e:
+            if e.code() not in _FAILOVER:
+                raise
+            _drop_watch(addr, f"{method_name} failed ({e.code()})")
+    return await aio_product_db.read(method_name, request), False
+
+
+def get_item(item_id):
+    """
+    Item with item_id, from the cache or product-db.
+
+    Returns:
+        product_db_pb2.Item, or None if the item does not exist
+
+    Raises:
+        grpc.RpcError if product-db could not be reached
+    """
+    item, generation = item_cache.get(item_id, product_db.session_index())
+    if item is not None:
+        return item
+    response, cacheable = _read("GetItem", product_db_pb2.GetItemRequest(item_id=item_id))
+    if not response.success:
+        return None
+    if cacheable:
+        item_cache.put(item_id, response.item, generation)
+    return response.item
+
+
+def get_items(item_ids):
+    """
+    Items with the given ids, from the cache, with one GetItems call for
+    the rest.
+
+    Returns:
+        dict of item_id -> product_db_pb2.Item; ids that do not exist are
+        left out
+
+    Raises:
+        grpc.RpcError if product-db could not be reached, or
+        RuntimeError if product-db could not read the items
+    """
+    items = {}
+    missing = []
+    for item_id in item_ids:
+        item, generation = item_cache.get(item_id, product_db.session_index())
+        if item is not None:
+            items[item_id] = item
+        elif item_id not in missing:
+            missing.append(item_id)
+    if not missing:
+        return items
+    response, cacheable = _read("GetItems", product_db_pb2.GetItemsRequest(item_ids=missing))
+    if not response.success:
+        raise RuntimeError(response.error_message)
+    for item in response.items:
+        if cacheable:
+            # generation was read before the GetItems call, so any change since leaves a newer tombstone
+            item_cache.put(item.item_id, item, generation)
+        items[item.item_id] = item
+    return items
+
+
+async def get_item_async(item_id):
+    """get_item for the asyncio serving mode"""
+    item, generation = item_cache.get(item_id, product_db.session_index())
+    if item is not None:
+        return item
+    response, cacheable = await _read_async("GetItem", product_db_pb2.GetItemRequest(item_id=item_id))
+    if not response.success:
+        return None
+    if cacheable:
+        item_cache.put(item_id, response.item, generation)
+    return response.item
+
+
+async def get_items_async(item_ids):
+    """get_items for the asyncio serving mode"""
+    items = {}
+    missing = []
+    for item_id in item_ids:
+        item, generation = item_cache.get(item_id, product_db.session_index())
+        if item is not None:
+            items[item_id] = item
+        elif item_id not in missing:
+            missing.append(item_id)
+    if not missing:
+        return items
+    response, cacheable = await _read_async("GetItems", product_db_pb2.GetItemsRequest(item_ids=missing))
+    if not response.success:
+        raise RuntimeError(response.error_message)
+    for item in response.items:
+        if cacheable:
+            item_cache.put(item.item_id, item, generation)
+        items[item.item_id] = item
+    return items
@@ -0,0 +1,800 @@
+"""
+Buyer API request handlers, shared by both serving modes.
+
+Each handler takes the parsed request (JSON body or query arguments,
+session ids, URL parameters) and is run by flows.run in app.py or
+flows.run_async in async_app.py, which make its calls on the clients named
+customer_db, product_db, item_cache and payment. It returns the JSON body
+and HTTP status of the response.
+"""
+import asyncio
+import json
+import sys
+
+import grpc
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+
+import auth
+import customer_db_pb2
+import product_db_pb2
+from flows import Call, Start, Wait
+from stage_timer import StageTimer
+
+
+def item_dict(item):
+    return {
+        "item_id": item.item_id,
+        "seller_id": item.seller_id,
+        "item_name": item.item_name,
+        "category": item.category,
+        "keywords": list(item.keywords),
+        "condition": item.condition,
+        "sale_price": item.sale_price,
+        "quantity": item.quantity,
+        "thumbs_up": item.thumbs_up,
+        "thumbs_down": item.thumbs_down
+    }
+
+
+class SearchPage:
+    """
+    The body of a search_items response, written out as product-db streams
+    the items: HEAD, chunk() for each item until it returns None, tail().
+    Reading the rest of stream after first is left to the serving mode.
+    """
+    HEAD = '{"status": "OK", "items": ['
+
+    def __init__(self, stream, first, limit):
+        self.stream = stream
+        # First item, or None if there are none
+        self.first = first
+        self.limit = limit
+        self.count = 0
+        self.last_item_id = None
+        self.next_page_token = ""
+
+    def chunk(self, product):
+        """JSON for product, or None if the page is already full"""
+        if self.limit and self.count == self.limit:
+            # The extra item read past the page says there is a next one
+            self.next_page_token = str(self.last_item_id)
+            return None
+        chunk = ("," if self.count else "") + json.dumps(item_dict(product))
+        self.count += 1
+        self.last_item_id = product.item_id
+        return chunk
+
+    def tail(self):
+        return f'], "next_page_token": {json.dumps(self.next_page_token)}}}'
+
+
+def create_account(data):
+    """Create a new buyer account"""
+    username = data.get("username")
+    password = data.get("password")
+
+    try:
+        request_msg = customer_db_pb2.CreateBuyerRequest(
+            username=username,
+            password=password
+        )
+        response = yield Call("customer_db", "CreateBuyer", request_msg)
+
+        if not response.success:
+            if "already exists" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Username already exists."
+                }, 409
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "buyer_id": response.buyer_id
+        }, 201
+
+    except grpc.RpcError as e:
+        print(f"gRPC error creating buyer account: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to create account."
+        }, 500
+
+
+def login(data):
+    """Login and create a new session with active cart"""
+    username = data.get("username")
+    password = data.get("password")
+
+    try:
+        request_msg = customer_db_pb2.BuyerLoginRequest(
+            username=username,
+            password=password
+        )
+        response = yield Call("customer_db", "BuyerLogin", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": "Username/Password combination does not exist."
+            }, 401
+
+        return {
+            "status": "OK",
+            "session_id": response.session_id,
+            "buyer_id": response.buyer_id,
+            "message": f"I've seen enough. Welcome back {response.username}"
+        }, 201
+
+    except grpc.RpcError as e:
+        print(f"gRPC error logging into buyer account: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to log in to buyer account."
+        }, 500
+
+
+def logout(session_id, buyer_id):
+    """Logout and delete the session"""
+    try:
+        request_msg = customer_db_pb2.LogoutRequest(session_id=session_id)
+        response = yield Call("customer_db", "BuyerLogout", request_msg)
+        auth.invalidate_session(session_id)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": "Failed to log out."
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": "Successfully logged out."
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error logging out of buyer session: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to log out of buyer session."
+        }, 500
+
+
+def search_items(session_id, buyer_id, args):
+    """
+    Search for items by category and keywords.
+
+    Optional `limit` and `page_token` query parameters page through the
+    results; the response carries a `next_page_token` while more remain.
+    Items are streamed from product-db and written out as they arrive, so
+    the whole result is never held in memory: on success the body returned
+    is a SearchPage rather than a dict.
+
+    With `sort=relevance`, returns the `limit` best matches (prefix and
+    typo-tolerant, ranked by keyword matches and feedback) instead.
+    """
+    category = args.get("category", type=int)
+    keywords = args.getlist("keywords")
+    limit = args.get("limit", default=0, type=int)
+    page_token = args.get("page_token", default="")
+
+    if limit < 0:
+        return {
+            "status": "Error",
+            "message": "limit must not be negative."
+        }, 400
+
+    if args.get("sort") == "relevance":
+        return (yield from _ranked_search_items(category, keywords, limit))
+
+    try:
+        request_msg = product_db_pb2.SearchItemsRequest(
+            category=category,
+            keywords=keywords,  # list automatically converts to repeated
+            # One extra item tells whether there is a next page
+            limit=limit + 1 if limit else 0,
+            page_token=page_token
+        )
+        # Surface connection and argument errors before the response starts,
+        # moving to another replica if this one is down or behind
+        stream, first = yield Call("product_db", "read_stream", "SearchItemsStream", request_msg)
+
+    except grpc.RpcError as e:
+        print(f"gRPC error searching items: {e.code()} - {e.details()}")
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            return {
+                "status": "Error",
+                "message": "Invalid page token."
+            }, 400
+        return {
+            "status": "Error",
+            "message": "Failed to search items."
+        }, 500
+
+    return SearchPage(stream, first, limit), 200
+
+
+def _ranked_search_items(category, keywords, limit):
+    """Top matches for keywords in category, best first"""
+    try:
+        request_msg = product_db_pb2.RankedSearchItemsRequest(
+            category=category,
+            keywords=keywords,
+            top_k=limit
+        )
+        response = yield Call("product_db", "read", "RankedSearchItems", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        results = []
+        for product, score in zip(response.items, response.scores):
+            results.append(dict(item_dict(product), score=score))
+
+        return {
+            "status": "OK",
+            "items": results
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error searching items: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to search items."
+        }, 500
+
+
+def get_item(session_id, buyer_id, item_id):
+    """Get details of a specific item"""
+    try:
+        item = yield Call("item_cache", "get_item", item_id)
+
+        if item is None:
+            return {
+                "status": "Error",
+                "message": "Item not found."
+            }, 404
+
+        return {
+            "status": "OK",
+            "item": item_dict(item)
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error getting item details: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to get item details."
+        }, 500
+
+
+def add_item_to_cart(session_id, buyer_id, item_id, data):
+    """Add item to cart (with quantity validation)"""
+    quantity = data.get("quantity")
+
+    try:
+        # Step 1: Validate item exists and has sufficient quantity
+        item = yield Call("item_cache", "get_item", item_id)
+
+        if item is None:
+            return {
+                "status": "Error",
+                "message": "Item ID does not exist."
+            }, 404
+
+        if item.quantity < quantity:
+            return {
+                "status": "Error",
+                "message": "Quantity requested is less than available quantity."
+            }, 400
+
+        # Step 2: Add to cart
+        add_req = customer_db_pb2.AddItemToCartRequest(
+            session_id=session_id,
+            item_id=item_id,
+            quantity=quantity
+        )
+        add_resp = yield Call("customer_db", "AddItemToCart", add_req)
+
+        if not add_resp.success:
+            return {
+                "status": "Error",
+                "message": add_resp.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": f"Item ID {item_id} with quantity {quantity} added to cart."
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error adding item to cart: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to add item to cart."
+        }, 500
+
+
+def remove_item_from_cart(session_id, buyer_id, item_id, data):
+    """Remove item from cart"""
+    quantity = data.get("quantity")
+
+    try:
+        request_msg = customer_db_pb2.RemoveItemFromCartRequest(
+            session_id=session_id,
+            item_id=item_id,
+            quantity=quantity
+        )
+        response = yield Call("customer_db", "RemoveItemFromCart", request_msg)
+
+        if not response.success:
+            if "does not exist in cart" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Item ID does not exist in cart"
+                }, 404
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        # Determine message based on whether item was fully or partially removed
+        message = f"Item ID {item_id} with quantity {quantity} removed from cart."
+
+        return {
+            "status": "OK",
+            "message": message
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error removing item from cart: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to remove item from cart."
+        }, 500
+
+
+def save_cart(session_id, buyer_id):
+    """Save active cart to saved cart"""
+    try:
+        request_msg = customer_db_pb2.SaveCartRequest(
+            session_id=session_id,
+            buyer_id=buyer_id
+        )
+        response = yield Call("customer_db", "SaveCart", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": "Cart saved successfully."
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error saving cart: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to save cart."
+        }, 500
+
+
+def clear_cart(session_id, buyer_id):
+    """Clear both saved and active cart"""
+    try:
+        request_msg = customer_db_pb2.ClearCartRequest(
+            session_id=session_id,
+            buyer_id=buyer_id
+        )
+        response = yield Call("customer_db", "ClearCart", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": "Cart cleared successfully."
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error clearing cart: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to clear cart."
+        }, 500
+
+
+def display_cart(session_id, buyer_id):
+    """Display active cart"""
+    try:
+        request_msg = customer_db_pb2.GetActiveCartRequest(session_id=session_id)
+        response = yield Call("customer_db", "GetActiveCart", request_msg)
+
+        if not response.success:
+            if "does not exist" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Cart does not exist for this session."
+                }, 404
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        # Convert protobuf map to dict
+        cart_dict = dict(response.cart_items.items)
+
+        # Price every line with one product-db round trip
+        items = yield Call("item_cache", "get_items", [int(item_id) for item_id in cart_dict])
+        lines = []
+        total = 0
+        for item_id_str, quantity in cart_dict.items():
+            item = items.get(int(item_id_str))
+            if item is None:
+                lines.append({"item_id": int(item_id_str), "quantity": quantity, "available": False})
+                continue
+            lines.append({
+                "item_id": item.item_id,
+                "item_name": item.item_name,
+                "sale_price": item.sale_price,
+                "quantity": quantity,
+                "available": item.quantity >= quantity
+            })
+            total += item.sale_price * quantity
+
+        return {
+            "status": "OK",
+            "cart_items": cart_dict,
+            "items": lines,
+            "total_price": total
+        }, 200
+
+    except (grpc.RpcError, RuntimeError) as e:
+        print(f"Error displaying cart: {e}")
+        return {
+            "status": "Error",
+            "message": "Failed to display cart."
+        }, 500
+
+
+def _restore_quantities(quantities, quantity_changes):
+    """
+    Wait for the stock decrement of a purchase whose transaction could not
+    be recorded and, if it was applied, put the units back.
+    """
+    try:
+        applied = (yield Wait(quantities)).success
+    except Exception as e:
+        print(f"Stock decrement of failed purchase not confirmed, not restored: {e}")
+        return
+    if not applied:
+        return
+    restore = [
+        product_db_pb2.ItemQuantityChange(item_id=change.item_id, seller_id=change.seller_id,
+                                          quantity_change=-change.quantity_change)
+        for change in quantity_changes
+    ]
+    try:
+        response = yield Call("product_db", "write", "UpdateItemQuantities",
+                              product_db_pb2.UpdateItemQuantitiesRequest(changes=restore))
+        if not response.success:
+            print(f"Restoring stock of failed purchase failed: {response.error_message}")
+    except grpc.RpcError as e:
+        print(f"gRPC error restoring stock of failed purchase: {e.code()} - {e.details()}")
+
+
+def make_purchase(session_id, buyer_id, data, payment_available):
+    """
+    Make a purchase, as a pipeline of stages: saved cart, pricing, payment,
+    then recording the transaction alongside the stock decrement, then
+    recording the purchase and, once it is recorded, clearing the cart.
+
+    payment_available is False when the payment service could not be
+    reached at startup.
+    """
+    cardholder_name = data.get("cardholder_name")
+    card_number = data.get("card_number")
+    expiry_month = data.get("expiry_month")
+    expiry_year = data.get("expiry_year")
+    security_code = data.get("security_code")
+
+    timer = StageTimer(f"make_purchase buyer {buyer_id}")
+    try:
+        request_msg = customer_db_pb2.GetSavedCartRequest(buyer_id=buyer_id)
+        response = yield Call("customer_db", "GetSavedCart", request_msg)
+        timer.lap("saved cart")
+
+        if not response.success:
+            if "does not exist" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Cart does not exist for this session."
+                }, 404
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        # Convert protobuf map to dict
+        cart_dict = dict(response.cart_items.items)
+
+        if len(cart_dict) == 0:
+            return {
+                "status": "OK",
+                "message": "Saved Cart is empty."
+            }, 200
+
+        amount = 0
+        item_ids = []
+        quantity_changes = []
+        # Price the whole cart with one product-db round trip
+        items = yield Call("item_cache", "get_items", [int(item_id) for item_id in cart_dict])
+        timer.lap("pricing")
+        for item_id_str, quantity in cart_dict.items():
+            item_id = int(item_id_str)
+
+            item = items.get(item_id)
+
+            if item is None:
+                return {
+                    "status": "Error",
+                    "message": "Item not found."
+                }, 404
+
+            if item.quantity < quantity:
+                return {
+                    "status": "Error",
+                    "message": f"Available quantity of item {item_id} is less than the requested quantity."
+                }, 404
+
+            amount += item.sale_price * quantity
+            item_ids.append(item_id)
+
+            quantity_changes.append(product_db_pb2.ItemQuantityChange(
+                item_id=item_id,
+                seller_id=item.seller_id,
+                quantity_change=quantity
+            ))
+
+        if not payment_available:
+            return {"status": "Error", "message": "Payment service unavailable."}, 503
+
+        result = yield Call("payment", "process_payment",
+                            cardholder_name, card_number, expiry_month, expiry_year, security_code)
+        timer.lap("payment")
+
+        if result == "No":
+            return {
+                "status": "Error",
+                "message": "Payment declined."
+            }, 401
+        elif result == "Yes":
+            # update products quantities, all or nothing, in one Raft entry,
+            # while the transaction is recorded in customer-db
+            request_msg = product_db_pb2.UpdateItemQuantitiesRequest(changes=quantity_changes)
+            quantities = yield Start(Call("product_db", "write", "UpdateItemQuantities", request_msg))
+
+            request_msg = customer_db_pb2.InsertTransactionRequest(
+                buyer_id = buyer_id,
+                cardholder_name = cardholder_name,
+                card_number = card_number,
+                expiry_month = expiry_month,
+                expiry_year = expiry_year,
+                security_code = security_code,
+                amount = amount,
+            )
+            try:
+                transaction_response = yield Call("customer_db", "InsertTransaction", request_msg)
+            except (Exception, asyncio.CancelledError):
+                # Also on cancellation: otherwise the units stay taken by a
+                # purchase that was never recorded
+                yield from _restore_quantities(quantities, quantity_changes)
+                raise
+            if not transaction_response.success:
+                yield from _restore_quantities(quantities, quantity_changes)
+                return {
+                    "status": "Error",
+                    "message": f"Failed to record transaction: {transaction_response.error_message}"
+                }, 500
+            transaction_id = transaction_response.transaction_id
+            try:
+                quantities_response = yield Wait(quantities)
+            except Exception as e:
+                # The transaction is recorded but the stock may not be, so no purchase is
+                print(f"Stock decrement for transaction {transaction_id} failed: {type(e).__name__}: {e}")
+                return {
+                    "status": "Error",
+                    "message": f"Failed to update item quantities for transaction {transaction_id}. No purchase was recorded."
+                }, 500
+            timer.lap("transaction + quantities")
+
+            if not quantities_response.success:
+                # Nothing was decremented, so nothing was bought
+                return {
+                    "status": "Error",
+                    "message": f"Error updating quantity for item {quantities_response.failed_item_id}: "
+                               f"{quantities_response.error_message}"
+                }, 409
+
+            purchase_msg = customer_db_pb2.InsertPurchaseRequest(
+                buyer_id = buyer_id,
+                transaction_id = transaction_id,
+                item_ids = item_ids
+            )
+
+            purchase_response = yield Call("customer_db", "InsertPurchase", purchase_msg)
+            timer.lap("purchase")
+            if not purchase_response.success:
+                # The cart is kept, as nothing records what was bought from it
+                return {
+                    "status": "Error",
+                    "message": f"Failed to record purchase: {purchase_response.error_message}"
+                }, 500
+
+            clear_msg = customer_db_pb2.ClearCartRequest(
+                session_id=session_id,
+                buyer_id=buyer_id
+            )
+            try:
+                response = yield Call("customer_db", "ClearCart", clear_msg)
+                timer.lap("clear cart")
+
+                if not response.success:
+                    return {
+                        "status": "Error",
+                        "message": response.error_message
+                    }, 500
+
+            except grpc.RpcError as e:
+                print(f"gRPC error clearing cart: {e.code()} - {e.details()}")
+                return {
+                    "status": "Error",
+                    "message": "Failed to clear cart."
+                }, 500
+
+            return {
+                "status": "OK",
+                "message": "Payment successful.",
+                "transaction_id": transaction_id,
+                "purchase_id": purchase_response.purchase_id
+            }, 200
+        else:
+            return {
+                "status": "Error",
+                "message": "Unknown error while processing payment. Failed to make purchase."
+            }, 401
+
+    except Exception as e:
+        print(f"Error in make_purchase: {type(e).__name__}: {e}")
+        return {
+            "status": "Error",
+            "message": f"Failed to make purchase: {e}"
+        }, 500
+    finally:
+        timer.report()
+
+
+def provide_feedback(session_id, buyer_id, data):
+    """Provide feedback for an item (multi-step gRPC operation)"""
+    item_id = data.get("item_id")
+    feedback = data.get("feedback")  # 0 or 1
+
+    if feedback not in [0, 1]:
+        return {
+            "status": "Error",
+            "message": "Invalid feedback value. Must be 0 or 1."
+        }, 400
+
+    try:
+        # Step 1: Get seller_id for the item
+        item = yield Call("item_cache", "get_item", item_id)
+
+        if item is None:
+            return {
+                "status": "Error",
+                "message": f"Item with ID {item_id} not found."
+            }, 404
+
+        seller_id = item.seller_id
+
+        # Step 2: Update item feedback
+        item_feedback_req = product_db_pb2.UpdateItemFeedbackRequest(
+            item_id=item_id,
+            thumbs_up=(feedback == 1)
+        )
+        item_feedback_resp = yield Call("product_db", "write", "UpdateItemFeedback", item_feedback_req)
+
+        if not item_feedback_resp.success:
+            return {
+                "status": "Error",
+                "message": "Failed to update item feedback."
+            }, 500
+
+        # Step 3: Update seller feedback (don't fail entire operation if this fails)
+        try:
+            seller_feedback_req = customer_db_pb2.UpdateSellerFeedbackRequest(
+                seller_id=seller_id,
+                thumbs_up=(feedback == 1)
+            )
+            seller_feedback_resp = yield Call("customer_db", "UpdateSellerFeedback", seller_feedback_req)
+
+            if not seller_feedback_resp.success:
+                print(f"Warning: Failed to update seller feedback: {seller_feedback_resp.error_message}")
+        except grpc.RpcError as e:
+            print(f"Warning: gRPC error updating seller feedback: {e.code()} - {e.details()}")
+
+        return {
+            "status": "OK",
+            "message": "Feedback recorded successfully."
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error providing feedback: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to provide feedback."
+        }, 500
+    except Exception as e:
+        print(f"Product DB cluster unavailable: {e}")
+        return {
+            "status": "Error",
+            "message": "Product database cluster is temporarily unavailable."
+        }, 503
+
+
+def get_seller_rating(session_id, buyer_id, seller_id):
+    """Get seller rating"""
+    try:
+        request_msg = customer_db_pb2.GetSellerRatingRequest(seller_id=seller_id)
+        response = yield Call("customer_db", "GetSellerRating", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": "Seller not found."
+            }, 404
+
+        return {
+            "status": "OK",
+            "thumbs_up": response.rating.thumbs_up,
+            "thumbs_down": response.rating.thumbs_down
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error getting seller rating: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to get seller rating."
+        }, 500
+
+
+def get_buyer_purchases(session_id, buyer_id):
+    """Get buyer purchase history"""
+    try:
+        request_msg = customer_db_pb2.GetBuyerPurchasesRequest(
+            buyer_id = buyer_id
+        )
+        response = yield Call("customer_db", "GetBuyerPurchases", request_msg)
+
+        purchases = [{"purchase_id": p.purchase_id, "item_ids": list(p.item_ids)} for p in response.purchases]
+        return {"status": "OK", "purchases": purchases}, 200
+    except grpc.RpcError as e:
+        print(f"gRPC error getting buyer purchases: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to get buyer purchases."
+        }, 500
@@ -0,0 +1,25 @@
+"""
+Per-stage wall-clock timing for multi-step requests (e.g. make_purchase).
+"""
+import time
+
+
+class StageTimer:
+    """Times consecutive stages of one request and prints them as one line"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = self.last = time.perf_counter()
+        # (stage, milliseconds) in the order they finished
+        self.stages = []
+
+    def lap(self, stage: str):
+        """End the current stage, naming it stage"""
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self):
+        total = (time.perf_counter() - self.start) * 1000
+        stages = ", ".join(f"{stage} {ms:.1f} ms" for stage, ms in self.stages)
+        print(f"{self.name}: {stages}; total {total:.1f} ms")
@@ -0,0 +1,244 @@
+"""
+asyncio runtime for ABPNode.
+
+AsyncABPNode runs the same protocol state machine as ABPNode, but receive,
+sequencing, delivery, status and retransmit all run on one event loop instead
+of five OS threads contending on self.lock. Because only the loop thread ever
+touches protocol state, the lock is replaced by a no-op and the condition
+variables by asyncio.Events. The UDP socket is read with add_reader, draining
+every queued datagram per wakeup. SQL is the only blocking work and is handed
+to a single worker thread, which keeps writes applied in delivery order.
+
+submit_write keeps its blocking signature for the threaded gRPC server; it
+hands the write to the loop and waits for the result. Coroutine callers can
+await submit_write_async directly.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from abp.node import (ABPNode, DEFAULT_MAX_BATCH, HEARTBEAT_MIN_INTERVAL,
+                      NAK_REORDER_DELAY, NOT_DELIVERED, RETRANSMIT_INTERVAL, SUBMIT_TIMEOUT)
+
+from abp.transport import RECV_BUFSIZE
+
+logger = logging.getLogger(__name__)
+
+# Max datagrams handled per socket wakeup before yielding to other coroutines
+RECV_BURST = 64
+
+
+class _LoopSignal:
+    """
+    Stands in for a threading.Condition on the event loop. Handlers call
+    notify() exactly as they do in the threaded runtime; the waiting
+    coroutine clears the signal, re-checks its predicate, then awaits.
+    """
+
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def notify(self, n: int = 1):
+        self._event.set()
+
+    def notify_all(self):
+        self._event.set()
+
+    def clear(self):
+        self._event.clear()
+
+    async def wait(self, timeout: float = None) -> bool:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class AsyncABPNode(ABPNode):
+
+    def __init__(self, node_id: int, peers: list, db_pool, udp_port: int,
+                 max_batch: int = DEFAULT_MAX_BATCH, wire_format: str = "auto",
+                 log_path: str = None):
+        super().__init__(node_id, peers, db_pool, udp_port, max_batch, wire_format, log_path)
+        # All protocol state is owned by the loop thread
+        self.lock = contextlib.nullcontext()
+        self.sequencer_cv = None
+        self.delivery_cv = None
+        self.status_cv = None
+        self.retransmit_cv = None
+        self.loop = None
+        self._sql_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="abp-sql")
+        self._ready = threading.Event()
+
+    def start(self):
+        """Run the node on its own event loop thread. Returns once it is receiving."""
+        self.recover()
+        threading.Thread(target=self._run_loop, daemon=True, name="abp-loop").start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        try:
+            asyncio.run(self.run())
+        except Exception:
+            logger.exception("AsyncABPNode %d event loop stopped", self.node_id)
+        finally:
+            self._ready.set()
+
+    async def run(self):
+        """Run the node on the current event loop until cancelled"""
+        self.loop = asyncio.get_running_loop()
+        self.sequencer_cv = _LoopSignal()
+        self.delivery_cv = _LoopSignal()
+        self.status_cv = _LoopSignal()
+        self.retransmit_cv = _LoopSignal()
+
+        sock = self.transport.sock
+        sock.setblocking(False)
+        self.loop.add_reader(sock.fileno(), self._drain_socket)
+
+        tasks = [
+            asyncio.create_task(self.sequencer_loop(), name="abp-sequencer"),
+            asyncio.create_task(self.delivery_loop(), name="abp-delivery"),
+            asyncio.create_task(self.status_loop(), name="abp-status"),
+            asyncio.create_task(self.retransmit_loop(), name="abp-retransmit"),
+        ]
+        logger.info("AsyncABPNode %d started (%d peers)", self.node_id, self.n)
+        self._ready.set()
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.loop.remove_reader(sock.fileno())
+
+    def _drain_socket(self):
+        """
+        Reader callback: handle every datagram already queued on the socket
+        (up to RECV_BURST) per wakeup rather than one per event loop
+        iteration, as asyncio's datagram transport does.
+        """
+        sock = self.transport.sock
+        for _ in range(RECV_BURST):
+            try:
+                data, addr = sock.recvfrom(RECV_BUFSIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                logger.warning("UDP error on node %d: %s", self.node_id, exc)
+                return
+            msg = self.transport.accept(data, addr)
+            if msg is not None:
+                self.dispatch(msg, addr)
+
+    async def sequencer_loop(self):
+        while True:
+            self.sequencer_cv.clear()
+            seq_msg = self._try_assign_sequence()
+            if seq_msg is None:
+                await self.sequencer_cv.wait()
+                continue
+            self.transport.broadcast(seq_msg, self.peers)
+
+    async def delivery_loop(self):
+        while True:
+            self.delivery_cv.clear()
+            ready = self._next_deliverable()
+            if ready is None:
+                await self.delivery_cv.wait()
+                continue
+            batch = self._take_delivery_batch(ready)
+            first_seq = self.next_to_deliver - len(batch)
+            # Receiving and sequencing carry on while the SQL worker runs
+            try:
+                results = await self.loop.run_in_executor(
+                    self._sql_pool, self.executor.execute_batch, self._delivery_calls(batch),
+                    first_seq)
+            except Exception as exc:
+                logger.error("Delivery of %d writes failed: %s", len(batch), exc)
+                results = [{"success": False, "error_message": str(exc)} for _ in batch]
+            self._finish_delivery(batch, results, first_seq)
+
+    async def status_loop(self):
+        last_rut = -1
+        wait = self.heartbeat_interval
+        while True:
+            if self.received_frontier <= last_rut:
+                self.status_cv.clear()
+                await self.status_cv.wait(wait)
+            status, targets, wait = self._status_round(last_rut)
+            last_rut = status["received_up_to"]
+            if targets:
+                self.transport.broadcast(status, targets)
+            await asyncio.sleep(HEARTBEAT_MIN_INTERVAL / 4)
+
+    async def retransmit_loop(self):
+        wait = RETRANSMIT_INTERVAL
+        while True:
+            self.retransmit_cv.clear()
+            await self.retransmit_cv.wait(wait)
+            await asyncio.sleep(NAK_REORDER_DELAY)
+            to_send, wait = self._collect_retransmits()
+            self._send_retransmits(to_send)
+
+    async def submit_write_async(self, method: str, args: dict) -> dict:
+        """Coroutine version of submit_write. Must run on self.loop."""
+        event = asyncio.Event()
+        rid, req_msg = self._new_request(method, args, event)
+        self.transport.broadcast(req_msg, self.peers)
+        try:
+            await asyncio.wait_for(event.wait(), SUBMIT_TIMEOUT)
+            delivered = True
+        except asyncio.TimeoutError:
+            delivered = False
+        return self._finish_write(rid, delivered)
+
+    def submit_write(self, method: str, args: dict) -> dict:
+        """
+        Called by gRPC handler threads. Blocks until the write is delivered
+        (or times out). Must not be called from the loop thread itself.
+        """
+        event = threading.Event()
+        deadline = time.monotonic() + SUBMIT_TIMEOUT
+        # The rid is needed to collect or clean up the write, so wait for the
+        # loop to queue it first; a loop that never gets to it times out
+        enqueue = self._enqueue_async(method, args, event)
+        try:
+            future = asyncio.run_coroutine_threadsafe(enqueue, self.loop)
+        except RuntimeError:
+            # Loop closed
+            enqueue.close()
+            return dict(NOT_DELIVERED)
+        try:
+            rid = future.result(timeout=SUBMIT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return dict(NOT_DELIVERED)
+
+        if event.wait(timeout=max(0.0, deadline - time.monotonic())):
+            # Delivery stored the result before setting event and never
+            # touches this rid again, so it is safe to collect off-loop
+            self.pending_events.pop(rid, None)
+            return self.delivery_results.pop(rid)
+        # Timed out: clean up on the loop, which still owns the queues
+        finish = self._finish_write_async(rid)
+        try:
+            future = asyncio.run_coroutine_threadsafe(finish, self.loop)
+            return future.result(timeout=SUBMIT_TIMEOUT)
+        except RuntimeError:
+            finish.close()
+            return dict(NOT_DELIVERED)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return dict(NOT_DELIVERED)
+
+    async def _enqueue_async(self, method: str, args: dict, event) -> tuple:
+        rid, req_msg = self._new_request(method, args, event)
+        self.transport.broadcast(req_msg, self.peers)
+        return rid
+
+    async def _finish_write_async(self, rid: tuple) -> dict:
+        return self._finish_write(rid, False)
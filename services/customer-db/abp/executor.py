@@ -31,440 +31,420 @@ class SQLExecutor:
             # Transactions
             "InsertTransaction": self.insert_transaction,
             "InsertPurchase": self.insert_purchase,
+            # Session liveness (see sessions.py)
+            "TouchSessions": self.touch_sessions,
+            "ExpireSessions": self.expire_sessions,
         }
+        # Called as listener(method_name, args, result) for every write that
+        # succeeded, once it is committed
+        self.listeners = []
 
-    def execute(self, method_name: str, args: dict) -> dict:
-        """Dispatch method_name to its handler, passing its required args"""
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _notify(self, method_name: str, args: dict, result: dict):
+        for listener in self.listeners:
+            try:
+                listener(method_name, args, result)
+            except Exception as e:
+                logger.error("Listener failed on %s: %s", method_name, e)
+
+    def execute(self, method_name: str, args: dict, global_seq: int = None) -> dict:
+        """
+        Dispatch method_name to its handler in its own transaction. If
+        global_seq is given it is recorded as the applied index in the same
+        transaction, whether or not the write succeeds.
+        """
         handler = self.handlerMap.get(method_name)
         if handler is None:
             logger.error("Unknown ABP method: %s", method_name)
-            return {"success": False, "error_message": f"Unknown method: {method_name}"}
-        return handler(args)
+            result = {"success": False, "error_message": f"Unknown method: {method_name}"}
+        else:
+            result = None
 
-    # Seller Operations
-    def create_seller(self, args: dict) -> dict:
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-            cursor.execute(
-                "SELECT seller_id FROM sellers WHERE username = %s",
-                (args["username"],)
-            )
-            if cursor.fetchone():
-                return {"success": False, "error_message": "Username already exists"}
-
-            cursor.execute(
-                "INSERT INTO sellers (username, passwd) VALUES (%s, %s) RETURNING seller_id",
-                (args["username"], args["password"])
-            )
-            seller_id = cursor.fetchone()["seller_id"]
+            if handler is not None:
+                try:
+                    result = handler(cursor, args)
+                except Exception as e:
+                    logger.error("%s error: %s", method_name, e)
+                    result = {"success": False, "error_message": str(e)}
+                if not result["success"]:
+                    conn.rollback()
+            if global_seq is not None:
+                self._record_applied(cursor, global_seq)
             conn.commit()
-            return {"success": True, "seller_id": seller_id}
+            if result["success"]:
+                self._notify(method_name, args, result)
+            return result
         except Exception as e:
             conn.rollback()
-            logger.error("CreateSeller error: %s", e)
+            logger.error("%s error: %s", method_name, e)
             return {"success": False, "error_message": str(e)}
         finally:
             self.db_pool.putconn(conn)
 
-    def seller_login(self, args: dict) -> dict:
+    def execute_batch(self, calls: list, first_seq: int = None) -> list:
         """
-        session_id is pre-generated in grpc_server.py and passed in args
-        so that all replicas insert the identical UUID.
+        Apply a run of delivered writes, in order, inside one transaction.
+        calls is a list of (method_name, args). Each write runs under its own
+        savepoint so a failing write is rolled back on its own and still gets
+        its own error result. If first_seq (the global seq of calls[0]) is
+        given, the applied index is advanced in the same transaction.
+        Returns one result dict per call.
         """
+        if len(calls) == 1:
+            return [self.execute(*calls[0], global_seq=first_seq)]
+
+        results = []
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-            cursor.execute(
-                "SELECT seller_id, username FROM sellers WHERE username = %s AND passwd = %s",
-                (args["username"], args["password"])
-            )
-            result = cursor.fetchone()
-            if not result:
-                return {"success": False, "error_message": "Invalid username or password"}
-
-            seller_id = result["seller_id"]
-            username = result["username"]
-            session_id = args["session_id"]
-
-            cursor.execute(
-                "INSERT INTO seller_sessions (session_id, seller_id) VALUES (%s, %s)",
-                (session_id, seller_id)
-            )
+            for method_name, args in calls:
+                handler = self.handlerMap.get(method_name)
+                if handler is None:
+                    logger.error("Unknown ABP method: %s", method_name)
+                    results.append({"success": False, "error_message": f"Unknown method: {method_name}"})
+                    continue
+
+                cursor.execute("SAVEPOINT abp_write")
+                try:
+                    result = handler(cursor, args)
+                except Exception as e:
+                    logger.error("%s error: %s", method_name, e)
+                    result = {"success": False, "error_message": str(e)}
+                if result["success"]:
+                    cursor.execute("RELEASE SAVEPOINT abp_write")
+                else:
+                    cursor.execute("ROLLBACK TO SAVEPOINT abp_write")
+                results.append(result)
+            if first_seq is not None:
+                self._record_applied(cursor, first_seq + len(calls) - 1)
             conn.commit()
-            return {"success": True, "session_id": session_id,
-                    "seller_id": seller_id, "username": username}
+            for (method_name, args), result in zip(calls, results):
+                if result["success"]:
+                    self._notify(method_name, args, result)
+            return results
         except Exception as e:
+            # The batch itself failed (e.g. COMMIT); nothing was applied, so
+            # fall back to applying each write in its own transaction
             conn.rollback()
-            logger.error("SellerLogin error: %s", e)
-            return {"success": False, "error_message": str(e)}
+            logger.error("Batch of %d writes failed (%s), applying one by one", len(calls), e)
         finally:
             self.db_pool.putconn(conn)
 
-    def seller_logout(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM seller_sessions WHERE session_id = %s",
-                (args["session_id"],)
-            )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("SellerLogout error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
+        return [self.execute(method_name, args,
+                             None if first_seq is None else first_seq + i)
+                for i, (method_name, args) in enumerate(calls)]
 
-    def update_seller_feedback(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor()
-            if args["thumbs_up"]:
-                cursor.execute(
-                    "UPDATE sellers SET thumbs_up = thumbs_up + 1 WHERE seller_id = %s",
-                    (args["seller_id"],)
-                )
-            else:
-                cursor.execute(
-                    "UPDATE sellers SET thumbs_down = thumbs_down + 1 WHERE seller_id = %s",
-                    (args["seller_id"],)
-                )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("UpdateSellerFeedback error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
+    @staticmethod
+    def _record_applied(cursor, global_seq: int):
+        cursor.execute("UPDATE abp_state SET applied_index = %s", (global_seq,))
 
-    def update_seller_session_timestamp(self, args: dict) -> dict:
-        """Update session timestamp to keep it alive"""
+    def applied_index(self) -> int:
+        """Highest global seq whose write has been applied, -1 if none"""
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE seller_sessions SET last_active_at = NOW() WHERE session_id = %s",
-                (args["session_id"],)
-            )
+            cursor.execute("SELECT applied_index FROM abp_state")
+            row = cursor.fetchone()
             conn.commit()
-            
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            print(f"Error in UpdateSellerSessionTimestamp: {e}")
-            return {"success": False, "error_message": str(e)}
+            return row[0] if row else -1
         finally:
             self.db_pool.putconn(conn)
 
-    # Buyer Operations
-
-    def create_buyer(self, args: dict) -> dict:
+    # Seller Operations
+    def create_seller(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "SELECT seller_id FROM sellers WHERE username = %s",
+            (args["username"],)
+        )
+        if cursor.fetchone():
+            return {"success": False, "error_message": "Username already exists"}
+
+        cursor.execute(
+            "INSERT INTO sellers (username, passwd) VALUES (%s, %s) RETURNING seller_id",
+            (args["username"], args["password"])
+        )
+        seller_id = cursor.fetchone()["seller_id"]
+        return {"success": True, "seller_id": seller_id}
+
+    def seller_login(self, cursor, args: dict) -> dict:
         """
-        saved_cart_id is pre-generated in grpc_server.py and passed in args.
+        session_id is pre-generated in grpc_server.py and passed in args
+        so that all replicas insert the identical UUID.
         """
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
+        cursor.execute(
+            "SELECT seller_id, username FROM sellers WHERE username = %s AND passwd = %s",
+            (args["username"], args["password"])
+        )
+        result = cursor.fetchone()
+        if not result:
+            return {"success": False, "error_message": "Invalid username or password"}
+
+        seller_id = result["seller_id"]
+        username = result["username"]
+        session_id = args["session_id"]
+
+        cursor.execute(
+            "INSERT INTO seller_sessions (session_id, seller_id, last_active_at) "
+            "VALUES (%s, %s, COALESCE(to_timestamp(%s), NOW()))",
+            (session_id, seller_id, args.get("logged_in_at"))
+        )
+        return {"success": True, "session_id": session_id,
+                "seller_id": seller_id, "username": username}
+
+    def seller_logout(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "DELETE FROM seller_sessions WHERE session_id = %s",
+            (args["session_id"],)
+        )
+        return {"success": True}
+
+    def update_seller_feedback(self, cursor, args: dict) -> dict:
+        if args["thumbs_up"]:
             cursor.execute(
-                "SELECT buyer_id FROM buyers WHERE username = %s",
-                (args["username"],)
+                "UPDATE sellers SET thumbs_up = thumbs_up + 1 WHERE seller_id = %s",
+                (args["seller_id"],)
             )
-            if cursor.fetchone():
-                return {"success": False, "error_message": "Username already exists"}
-
-            saved_cart_id = args["saved_cart_id"]  # pre-generated
-
+        else:
             cursor.execute(
-                "INSERT INTO buyers (username, passwd, saved_cart_id) "
-                "VALUES (%s, %s, %s) RETURNING buyer_id",
-                (args["username"], args["password"], saved_cart_id)
+                "UPDATE sellers SET thumbs_down = thumbs_down + 1 WHERE seller_id = %s",
+                (args["seller_id"],)
             )
-            buyer_id = cursor.fetchone()["buyer_id"]
+        return {"success": True}
 
-            cursor.execute(
-                "INSERT INTO saved_carts (saved_cart_id, buyer_id) VALUES (%s, %s)",
-                (saved_cart_id, buyer_id)
-            )
-            conn.commit()
-            return {"success": True, "buyer_id": buyer_id, "saved_cart_id": saved_cart_id}
-        except Exception as e:
-            conn.rollback()
-            logger.error("CreateBuyer error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
+    def update_seller_session_timestamp(self, cursor, args: dict) -> dict:
+        """Update session timestamp to keep it alive"""
+        cursor.execute(
+            "UPDATE seller_sessions SET last_active_at = NOW() WHERE session_id = %s",
+            (args["session_id"],)
+        )
+        return {"success": True}
 
-    def buyer_login(self, args: dict) -> dict:
+    # Buyer Operations
+
+    def create_buyer(self, cursor, args: dict) -> dict:
+        """
+        saved_cart_id is pre-generated in grpc_server.py and passed in args.
+        """
+        cursor.execute(
+            "SELECT buyer_id FROM buyers WHERE username = %s",
+            (args["username"],)
+        )
+        if cursor.fetchone():
+            return {"success": False, "error_message": "Username already exists"}
+
+        saved_cart_id = args["saved_cart_id"]  # pre-generated
+
+        cursor.execute(
+            "INSERT INTO buyers (username, passwd, saved_cart_id) "
+            "VALUES (%s, %s, %s) RETURNING buyer_id",
+            (args["username"], args["password"], saved_cart_id)
+        )
+        buyer_id = cursor.fetchone()["buyer_id"]
+
+        cursor.execute(
+            "INSERT INTO saved_carts (saved_cart_id, buyer_id) VALUES (%s, %s)",
+            (saved_cart_id, buyer_id)
+        )
+        return {"success": True, "buyer_id": buyer_id, "saved_cart_id": saved_cart_id}
+
+    def buyer_login(self, cursor, args: dict) -> dict:
         """
         session_id and active_cart_id are pre-generated in grpc_server.py.
         """
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-            cursor.execute(
-                "SELECT buyer_id, username FROM buyers WHERE username = %s AND passwd = %s",
-                (args["username"], args["password"])
-            )
-            result = cursor.fetchone()
-            if not result:
-                return {"success": False, "error_message": "Invalid username or password"}
-
-            buyer_id = result["buyer_id"]
-            username = result["username"]
+        cursor.execute(
+            "SELECT buyer_id, username FROM buyers WHERE username = %s AND passwd = %s",
+            (args["username"], args["password"])
+        )
+        result = cursor.fetchone()
+        if not result:
+            return {"success": False, "error_message": "Invalid username or password"}
+
+        buyer_id = result["buyer_id"]
+        username = result["username"]
+
+        # Load saved cart items to seed the new active cart
+        cursor.execute(
+            "SELECT saved_cart_items FROM saved_carts WHERE saved_cart_id = "
+            "(SELECT saved_cart_id FROM buyers WHERE buyer_id = %s)",
+            (buyer_id,)
+        )
+        saved_cart_result = cursor.fetchone()
+        saved_cart_items = saved_cart_result["saved_cart_items"] if saved_cart_result else {}
+
+        session_id = args["session_id"]       # pre-generated
+        active_cart_id = args["active_cart_id"]  # pre-generated
+
+        cursor.execute(
+            "INSERT INTO buyer_sessions (session_id, buyer_id, active_cart_id, last_active_at) "
+            "VALUES (%s, %s, %s, COALESCE(to_timestamp(%s), NOW()))",
+            (session_id, buyer_id, active_cart_id, args.get("logged_in_at"))
+        )
+        cursor.execute(
+            "INSERT INTO active_carts (active_cart_id, session_id, active_cart_items) "
+            "VALUES (%s, %s, %s)",
+            (active_cart_id, session_id, json.dumps(saved_cart_items))
+        )
+        return {"success": True, "session_id": session_id, "buyer_id": buyer_id,
+                "username": username, "saved_cart_items": saved_cart_items}
+
+    def buyer_logout(self, cursor, args: dict) -> dict:
+        # Cascades to active_carts via FK
+        cursor.execute(
+            "DELETE FROM buyer_sessions WHERE session_id = %s",
+            (args["session_id"],)
+        )
+        return {"success": True}
+
+    def update_buyer_session_timestamp(self, cursor, args: dict) -> dict:
+        """Update session timestamp to keep it alive"""
+        cursor.execute(
+            "UPDATE buyer_sessions SET last_active_at = NOW() WHERE session_id = %s",
+            (args["session_id"],)
+        )
+        return {"success": True}
+
+    # Session liveness
+    def touch_sessions(self, cursor, args: dict) -> dict:
+        """
+        Replicate coalesced activity. touches is [[session_id, epoch seconds], ...];
+        the timestamps come from the submitting replica so every replica stores the same value.
+        """
+        for session_id, touched_at in args["touches"]:
+            for table in ("seller_sessions", "buyer_sessions"):
+                cursor.execute(
+                    f"UPDATE {table} SET last_active_at = GREATEST(last_active_at, to_timestamp(%s)) "
+                    "WHERE session_id = %s",
+                    (touched_at, session_id)
+                )
+        return {"success": True}
 
-            # Load saved cart items to seed the new active cart
+    def expire_sessions(self, cursor, args: dict) -> dict:
+        """Delete sessions idle since before cutoff (epoch seconds, chosen by the submitter)"""
+        for table in ("seller_sessions", "buyer_sessions"):
             cursor.execute(
-                "SELECT saved_cart_items FROM saved_carts WHERE saved_cart_id = "
-                "(SELECT saved_cart_id FROM buyers WHERE buyer_id = %s)",
-                (buyer_id,)
+                f"DELETE FROM {table} WHERE last_active_at < to_timestamp(%s)",
+                (args["cutoff"],)
             )
-            saved_cart_result = cursor.fetchone()
-            saved_cart_items = saved_cart_result["saved_cart_items"] if saved_cart_result else {}
-
-            session_id = args["session_id"]       # pre-generated
-            active_cart_id = args["active_cart_id"]  # pre-generated
+        return {"success": True}
 
-            cursor.execute(
-                "INSERT INTO buyer_sessions (session_id, buyer_id, active_cart_id) "
-                "VALUES (%s, %s, %s)",
-                (session_id, buyer_id, active_cart_id)
-            )
-            cursor.execute(
-                "INSERT INTO active_carts (active_cart_id, session_id, active_cart_items) "
-                "VALUES (%s, %s, %s)",
-                (active_cart_id, session_id, json.dumps(saved_cart_items))
-            )
-            conn.commit()
-            return {"success": True, "session_id": session_id, "buyer_id": buyer_id,
-                    "username": username, "saved_cart_items": saved_cart_items}
-        except Exception as e:
-            conn.rollback()
-            logger.error("BuyerLogin error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
+    # Cart Operations
 
-    def buyer_logout(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor()
-            # Cascades to active_carts via FK
-            cursor.execute(
-                "DELETE FROM buyer_sessions WHERE session_id = %s",
-                (args["session_id"],)
+    def add_item_to_cart(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            """
+            UPDATE active_carts
+            SET active_cart_items = jsonb_set(
+                active_cart_items,
+                ARRAY[%s],
+                (COALESCE(active_cart_items->>%s, '0')::int + %s)::text::jsonb,
+                true
             )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("BuyerLogout error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
-
-    def update_buyer_session_timestamp(self, args: dict) -> dict:
-        """Update session timestamp to keep it alive"""
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor()
+            WHERE session_id = %s
+            """,
+            (str(args["item_id"]), str(args["item_id"]),
+             args["quantity"], args["session_id"])
+        )
+        return {"success": True}
+
+    def remove_item_from_cart(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "SELECT (active_cart_items->>%s)::int AS cart_quantity "
+            "FROM active_carts WHERE session_id = %s",
+            (str(args["item_id"]), args["session_id"])
+        )
+        result = cursor.fetchone()
+        cart_quantity = result["cart_quantity"] if result and result["cart_quantity"] else 0
+
+        if cart_quantity <= args["quantity"]:
             cursor.execute(
-                "UPDATE buyer_sessions SET last_active_at = NOW() WHERE session_id = %s",
-                (args["session_id"],)
+                "UPDATE active_carts SET active_cart_items = active_cart_items - %s "
+                "WHERE session_id = %s",
+                (str(args["item_id"]), args["session_id"])
             )
-            conn.commit()
-            
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            print(f"Error in UpdateBuyerSessionTimestamp: {e}")
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
-
-    # Cart Operations
-
-    def add_item_to_cart(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor()
+        else:
             cursor.execute(
                 """
                 UPDATE active_carts
                 SET active_cart_items = jsonb_set(
                     active_cart_items,
                     ARRAY[%s],
-                    (COALESCE(active_cart_items->>%s, '0')::int + %s)::text::jsonb,
-                    true
+                    ((active_cart_items->>%s)::int - %s)::text::jsonb
                 )
                 WHERE session_id = %s
                 """,
                 (str(args["item_id"]), str(args["item_id"]),
                  args["quantity"], args["session_id"])
             )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("AddItemToCart error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
-
-    def remove_item_from_cart(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-            cursor.execute(
-                "SELECT (active_cart_items->>%s)::int AS cart_quantity "
-                "FROM active_carts WHERE session_id = %s",
-                (str(args["item_id"]), args["session_id"])
-            )
-            result = cursor.fetchone()
-            cart_quantity = result["cart_quantity"] if result and result["cart_quantity"] else 0
-
-            if cart_quantity <= args["quantity"]:
-                cursor.execute(
-                    "UPDATE active_carts SET active_cart_items = active_cart_items - %s "
-                    "WHERE session_id = %s",
-                    (str(args["item_id"]), args["session_id"])
-                )
-            else:
-                cursor.execute(
-                    """
-                    UPDATE active_carts
-                    SET active_cart_items = jsonb_set(
-                        active_cart_items,
-                        ARRAY[%s],
-                        ((active_cart_items->>%s)::int - %s)::text::jsonb
-                    )
-                    WHERE session_id = %s
-                    """,
-                    (str(args["item_id"]), str(args["item_id"]),
-                     args["quantity"], args["session_id"])
-                )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("RemoveItemFromCart error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
-
-    def save_cart(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-            cursor.execute(
-                "SELECT active_cart_items FROM active_carts WHERE session_id = %s",
-                (args["session_id"],)
-            )
-            result = cursor.fetchone()
-            active_cart_items = result["active_cart_items"] if result else {}
-
-            cursor.execute(
-                "SELECT saved_cart_id FROM buyers WHERE buyer_id = %s",
-                (args["buyer_id"],)
-            )
-            saved_cart_id = cursor.fetchone()["saved_cart_id"]
-
-            cursor.execute(
-                "UPDATE saved_carts SET saved_cart_items = %s WHERE saved_cart_id = %s",
-                (json.dumps(active_cart_items), saved_cart_id)
-            )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("SaveCart error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
-
-    def clear_cart(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-            cursor.execute(
-                "SELECT saved_cart_id FROM buyers WHERE buyer_id = %s",
-                (args["buyer_id"],)
-            )
-            saved_cart_id = cursor.fetchone()["saved_cart_id"]
-
-            cursor.execute(
-                "SELECT active_cart_id FROM buyer_sessions WHERE session_id = %s",
-                (args["session_id"],)
-            )
-            active_cart_id = cursor.fetchone()["active_cart_id"]
-
-            cursor.execute(
-                "UPDATE saved_carts SET saved_cart_items = '{}'::jsonb WHERE saved_cart_id = %s",
-                (saved_cart_id,)
-            )
-            cursor.execute(
-                "UPDATE active_carts SET active_cart_items = '{}'::jsonb WHERE active_cart_id = %s",
-                (active_cart_id,)
-            )
-            conn.commit()
-            return {"success": True}
-        except Exception as e:
-            conn.rollback()
-            logger.error("ClearCart error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
+        return {"success": True}
+
+    def save_cart(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "SELECT active_cart_items FROM active_carts WHERE session_id = %s",
+            (args["session_id"],)
+        )
+        result = cursor.fetchone()
+        active_cart_items = result["active_cart_items"] if result else {}
+
+        cursor.execute(
+            "SELECT saved_cart_id FROM buyers WHERE buyer_id = %s",
+            (args["buyer_id"],)
+        )
+        saved_cart_id = cursor.fetchone()["saved_cart_id"]
+
+        cursor.execute(
+            "UPDATE saved_carts SET saved_cart_items = %s WHERE saved_cart_id = %s",
+            (json.dumps(active_cart_items), saved_cart_id)
+        )
+        return {"success": True}
+
+    def clear_cart(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "SELECT saved_cart_id FROM buyers WHERE buyer_id = %s",
+            (args["buyer_id"],)
+        )
+        saved_cart_id = cursor.fetchone()["saved_cart_id"]
+
+        cursor.execute(
+            "SELECT active_cart_id FROM buyer_sessions WHERE session_id = %s",
+            (args["session_id"],)
+        )
+        active_cart_id = cursor.fetchone()["active_cart_id"]
+
+        cursor.execute(
+            "UPDATE saved_carts SET saved_cart_items = '{}'::jsonb WHERE saved_cart_id = %s",
+            (saved_cart_id,)
+        )
+        cursor.execute(
+            "UPDATE active_carts SET active_cart_items = '{}'::jsonb WHERE active_cart_id = %s",
+            (active_cart_id,)
+        )
+        return {"success": True}
 
     # Transaction Operations 
 
-    def insert_transaction(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-            cursor.execute(
-                "INSERT INTO transactions "
-                "(buyer_id, cardholder_name, card_number, expiry_month, "
-                " expiry_year, security_code, amount) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING transaction_id",
-                (args["buyer_id"], args["cardholder_name"], args["card_number"],
-                 args["expiry_month"], args["expiry_year"],
-                 args["security_code"], args["amount"])
-            )
-            transaction_id = cursor.fetchone()["transaction_id"]
-            conn.commit()
-            return {"success": True, "transaction_id": transaction_id}
-        except Exception as e:
-            conn.rollback()
-            logger.error("InsertTransaction error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
-
-    def insert_purchase(self, args: dict) -> dict:
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-            cursor.execute(
-                "INSERT INTO purchases (buyer_id, transaction_id, item_ids) "
-                "VALUES (%s, %s, %s) RETURNING purchase_id",
-                (args["buyer_id"], args["transaction_id"], list(args["item_ids"]))
-            )
-            purchase_id = cursor.fetchone()["purchase_id"]
-            conn.commit()
-            return {"success": True, "purchase_id": purchase_id}
-        except Exception as e:
-            conn.rollback()
-            logger.error("InsertPurchase error: %s", e)
-            return {"success": False, "error_message": str(e)}
-        finally:
-            self.db_pool.putconn(conn)
+    def insert_transaction(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "INSERT INTO transactions "
+            "(buyer_id, cardholder_name, card_number, expiry_month, "
+            " expiry_year, security_code, amount) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING transaction_id",
+            (args["buyer_id"], args["cardholder_name"], args["card_number"],
+             args["expiry_month"], args["expiry_year"],
+             args["security_code"], args["amount"])
+        )
+        transaction_id = cursor.fetchone()["transaction_id"]
+        return {"success": True, "transaction_id": transaction_id}
+
+    def insert_purchase(self, cursor, args: dict) -> dict:
+        cursor.execute(
+            "INSERT INTO purchases (buyer_id, transaction_id, item_ids) "
+            "VALUES (%s, %s, %s) RETURNING purchase_id",
+            (args["buyer_id"], args["transaction_id"], list(args["item_ids"]))
+        )
+        purchase_id = cursor.fetchone()["purchase_id"]
+        return {"success": True, "purchase_id": purchase_id}
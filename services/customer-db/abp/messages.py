@@ -1,12 +1,31 @@
 """
 Message types:
   REQUEST    — broadcast by whichever node receives a gRPC write
-  SEQUENCE   — broadcast by the designated sequencer (global_seq k → node k mod n)
-  STATUS     — periodic heartbeat so majority tracking advances even when quiet
-  RETRANSMIT — NAK asking the original sender to re-send a missing message
+  SEQUENCE   — broadcast by the designated sequencer, assigning a block of consecutive
+               global seqs; the sequencer role rotates to the next node after every block
+  STATUS     — periodic heartbeat so majority tracking advances even when quiet; also
+               carries the sender's view of the sequencer turn for restarted nodes
+  RETRANSMIT — NAK asking a peer to re-send a missing message, or (type RANGE) every
+               SEQUENCE and REQUEST for global seqs lo..hi
+  CATCHUP    — asks a peer to stream global seqs lo..hi from its delivery log, one
+               window at a time; used instead of RANGE for long gaps (e.g. restarts)
+  BUNDLE     — several REQUEST/SEQUENCE messages packed into one datagram, sent
+               unicast in reply to a RANGE retransmit or a CATCHUP
+
+Wire formats:
+  JSON   — dict with string keys; always understood, used as the fallback
+  binary — struct-packed header (magic, version, type code) followed by a msgpack
+           array of the type's fields in a fixed order, so no key strings are sent.
+           Only available when msgpack is installed.
 """
 
 import json
+import struct
+
+try:
+    import msgpack
+except ImportError:  # binary codec unavailable, JSON only
+    msgpack = None
 
 
 def build_request(sender_id: int, local_seq: int, method: str, args: dict, received_up_to: int) -> dict:
@@ -27,31 +46,47 @@ def build_request(sender_id: int, local_seq: int, method: str, args: dict, recei
     }
 
 
-def build_sequence(global_seq: int, request_id: tuple, sequencer_id: int, received_up_to: int) -> dict:
-    """Function to build a SEQUENCE message"""
+def build_sequence(global_seq: int, request_ids: list, sequencer_id: int, received_up_to: int) -> dict:
+    """Function to build a (possibly batched) SEQUENCE message"""
 
-    # global_seq : the globally monotonic sequence number being assigned to the REQUEST with request_id
-    # request_id : (sender_id, local_seq) of the REQUEST msg being sequenced
+    # global_seq : first global sequence number of the block; request_ids[i] is assigned global_seq + i
+    # request_ids : (sender_id, local_seq) of each REQUEST msg being sequenced, in order
     # sequencer_id : node ID of the replica sending this (responsible for sequencing)
     # received_up_to : highest global seq this sequencer has fully received
 
     return {
         "type": "SEQUENCE",
         "global_seq": global_seq,
-        "request_id": list(request_id), 
+        "request_ids": [list(rid) for rid in request_ids],
         "sequencer_id": sequencer_id,
         "received_up_to": received_up_to,
     }
 
 
-def build_status(sender_id: int, received_up_to: int) -> dict:
+def sequence_end(msg: dict) -> int:
+    """Returns one past the last global seq covered by a SEQUENCE message"""
+    return msg["global_seq"] + len(msg["request_ids"])
+
+
+def request_id_at(seq_msg: dict, global_seq: int) -> tuple:
+    """Returns the request_id a SEQUENCE message assigned to global_seq"""
+    return tuple(seq_msg["request_ids"][global_seq - seq_msg["global_seq"]])
+
+
+def build_status(sender_id: int, received_up_to: int, next_seq: int = None,
+                 next_sequencer: int = None) -> dict:
     """ Fucntion to build a STATUS heartbeat message"""
 
     #Broadcast periodicall so that the majority conditioncan be checked even when no writes are currently happening.
+    # next_seq : next global seq the sender expects to be assigned
+    # next_sequencer : node whose turn the sender thinks it is to assign it, -1 while it
+    #                  does not know (after a restart)
     return {
         "type": "STATUS",
         "sender_id": sender_id,
         "received_up_to": received_up_to,
+        "next_seq": next_seq,
+        "next_sequencer": next_sequencer,
     }
 
 
@@ -82,14 +117,137 @@ def build_retransmit_sequence(requester_id: int, target_id: int, global_seq: int
     }
 
 
+def build_retransmit_range(requester_id: int, target_id: int, lo: int, hi: int) -> dict:
+    """Function to build a RETRANSMIT message asking for everything in global seqs lo..hi (inclusive)"""
+    return {
+        "type": "RETRANSMIT",
+        "requester_id": requester_id,
+        "target_id": target_id,
+        "retransmit_type": "RANGE",
+        "lo": lo,
+        "hi": hi,
+    }
+
+
+def build_catchup(requester_id: int, target_id: int, lo: int, hi: int) -> dict:
+    """Function to build a CATCHUP message asking to stream global seqs lo..hi (inclusive)"""
+    return {
+        "type": "CATCHUP",
+        "requester_id": requester_id,
+        "target_id": target_id,
+        "lo": lo,
+        "hi": hi,
+    }
+
+
+def build_bundle(sender_id: int, messages: list, window_end: int = None) -> dict:
+    """Function to build a BUNDLE carrying several REQUEST/SEQUENCE messages"""
+
+    # window_end : last global seq of the CATCHUP window this BUNDLE completes, else None
+    return {
+        "type": "BUNDLE",
+        "sender_id": sender_id,
+        "messages": messages,
+        "window_end": window_end,
+    }
+
+
+def pack_bundles(sender_id: int, messages: list, max_bytes: int) -> list:
+    """
+    Greedily pack messages into as few BUNDLEs as fit in max_bytes each.
+    Sizes are measured as JSON, which is never smaller than the binary format.
+    A message too large to share a datagram is returned on its own.
+    """
+    overhead = len(encode(build_bundle(sender_id, []))) + 16
+    out, current, size = [], [], overhead
+    for msg in messages:
+        msg_size = len(encode(msg)) + 1
+        if current and size + msg_size > max_bytes:
+            out.append(build_bundle(sender_id, current))
+            current, size = [], overhead
+        if overhead + msg_size > max_bytes:
+            out.append(msg)
+            continue
+        current.append(msg)
+        size += msg_size
+    if current:
+        out.append(build_bundle(sender_id, current))
+    return out
+
+
+WIRE_MAGIC = 0xAB
+WIRE_VERSION = 1
+BINARY_AVAILABLE = msgpack is not None
+
+# magic, version, type code
+_HEADER = struct.Struct("!BBB")
+
+_TYPE_CODES = {"REQUEST": 1, "SEQUENCE": 2, "STATUS": 3, "RETRANSMIT": 4, "BUNDLE": 5,
+               "CATCHUP": 6}
+_TYPE_NAMES = {code: name for name, code in _TYPE_CODES.items()}
+
+# Field order of the msgpack array for each message type. New fields must only
+# ever be appended; absent trailing fields are dropped on encode. Both formats
+# decode to a dict holding every field of the type, None where absent.
+_FIELDS = {
+    "REQUEST": ("sender_id", "local_seq", "payload", "received_up_to"),
+    "SEQUENCE": ("global_seq", "request_ids", "sequencer_id", "received_up_to"),
+    "STATUS": ("sender_id", "received_up_to", "next_seq", "next_sequencer"),
+    "RETRANSMIT": ("requester_id", "target_id", "retransmit_type", "request_id", "global_seq",
+                   "lo", "hi"),
+    # window_end is only set on the last BUNDLE replying to a CATCHUP
+    "BUNDLE": ("sender_id", "messages", "window_end"),
+    "CATCHUP": ("requester_id", "target_id", "lo", "hi"),
+}
+
+
 def encode(msg: dict) -> bytes:
     """Function to serialise a message dict to JSON for UDP transmission"""
     return json.dumps(msg, separators=(",", ":")).encode("utf-8")
 
 
+def encode_binary(msg: dict) -> bytes:
+    """Function to serialise a message dict to the versioned binary format"""
+    msg_type = msg["type"]
+    values = [msg.get(field) for field in _FIELDS[msg_type]]
+    while values and values[-1] is None:
+        values.pop()
+    header = _HEADER.pack(WIRE_MAGIC, WIRE_VERSION, _TYPE_CODES[msg_type])
+    return header + msgpack.packb(values, use_bin_type=True)
+
+
+def is_binary(data: bytes) -> bool:
+    """True if data is in the binary format (a JSON object always starts with '{')"""
+    return len(data) > 0 and data[0] == WIRE_MAGIC
+
+
 def decode(data: bytes) -> dict:
-    """Function to deserialise raw UDP bytes back to a message dict"""
-    return json.loads(data.decode("utf-8"))
+    """Function to deserialise raw UDP bytes (binary or JSON) back to a message dict"""
+    if not is_binary(data):
+        msg = json.loads(data.decode("utf-8"))
+        for field in _FIELDS.get(msg.get("type"), ()):
+            msg.setdefault(field, None)
+        return msg
+
+    if msgpack is None:
+        raise ValueError("binary datagram received but msgpack is not installed")
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated binary header")
+    _, version, type_code = _HEADER.unpack_from(data)
+    if version > WIRE_VERSION:
+        raise ValueError(f"unsupported wire version {version}")
+    msg_type = _TYPE_NAMES.get(type_code)
+    if msg_type is None:
+        raise ValueError(f"unknown message type code {type_code}")
+
+    values = msgpack.unpackb(data[_HEADER.size:], raw=False)
+    if not isinstance(values, list):
+        raise ValueError("binary payload is not an array")
+    msg = {"type": msg_type}
+    fields = _FIELDS[msg_type]
+    for i, field in enumerate(fields):
+        msg[field] = values[i] if i < len(values) else None
+    return msg
 
 
 def request_id_from_msg(msg: dict) -> tuple:
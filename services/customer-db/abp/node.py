@@ -1,45 +1,114 @@
 import logging
 import threading
 import time
-from abp.messages import (build_request, build_sequence, build_status, build_retransmit_request, 
-                          build_retransmit_sequence, request_id_from_msg)
-from abp.transport import UDPTransport
+from abp.messages import (build_request, build_sequence, build_status, build_retransmit_range,
+                          build_bundle, build_catchup, pack_bundles, request_id_from_msg,
+                          request_id_at, sequence_end)
+from abp.transport import UDPTransport, RECV_BUFSIZE
 from abp.executor import SQLExecutor
+from abp.pending import PendingRequests
+from abp.wal import DeliveryLog
 
 logger = logging.getLogger(__name__)
 
+# Default upper bound on how many pending requests one SEQUENCE message assigns
+DEFAULT_MAX_BATCH = 32
+
+# Upper bound on how many consecutive deliverable writes are applied in one transaction
+MAX_DELIVERY_BATCH = 128
+
+# STATUS heartbeat interval while there is progress or a gap, and the cap it
+# backs off to (doubling each quiet round) while the cluster is idle
+HEARTBEAT_MIN_INTERVAL = 0.02
+HEARTBEAT_MAX_INTERVAL = 0.5
+
+# Gap handling: a gap is NAKed once it has survived NAK_REORDER_DELAY (so plain
+# UDP reordering does not trigger one), then re-NAKed with exponential backoff
+# from NAK_MIN_INTERVAL up to RETRANSMIT_INTERVAL, which is also how often the
+# retransmit thread rescans when it has not been woken
+NAK_REORDER_DELAY = 0.005
+NAK_MIN_INTERVAL = 0.02
+RETRANSMIT_INTERVAL = 0.5
+# Max global seqs asked for by one range NAK; the rest follow once it is filled
+MAX_NAK_SPAN = 4096
+
+# Gaps longer than one CATCHUP_WINDOW are streamed from a peer's delivery log a
+# window at a time instead of NAKed; a window not answered within
+# CATCHUP_TIMEOUT is asked for again
+CATCHUP_WINDOW = 1024
+CATCHUP_TIMEOUT = 0.2
+# How long to wait before asking again once no peer's log holds the next window
+CATCHUP_RETRY_INTERVAL = 5.0
+
+# Global seqs kept in the delivery log below the GC watermark, for peers that
+# crash after receiving writes but before logging them
+LOG_RETAIN = 65536
+
+# How long submit_write waits for its write to be delivered
+SUBMIT_TIMEOUT = 30.0
+# Result of a write that was not delivered within SUBMIT_TIMEOUT
+NOT_DELIVERED = {"success": False, "error_message": "ABP timeout — write not delivered"}
+
 class ABPNode:
 
-    def __init__(self, node_id: int, peers: list, db_pool, udp_port: int):
+    def __init__(self, node_id: int, peers: list, db_pool, udp_port: int,
+                 max_batch: int = DEFAULT_MAX_BATCH, wire_format: str = "auto",
+                 log_path: str = None):
 
-        # node_id  : node index starting from 0
-        # peers    : list of (host, udp_port) of all replicas
-        # db_pool  : psycopg2 DB connection pool;
-        # udp_port : UDP port this node binds to
+        # node_id   : node index starting from 0
+        # peers     : list of (host, udp_port) of all replicas
+        # db_pool   : psycopg2 DB connection pool;
+        # udp_port  : UDP port this node binds to
+        # max_batch : max pending requests sequenced per SEQUENCE message (1 = one per turn)
+        # wire_format : "auto" to negotiate the binary codec with peers, "json" to disable it
+        # log_path  : file for the delivery log (see abp/wal.py); None keeps ABP state in memory only
 
         self.node_id = node_id
         self.n = len(peers)
         self.peers = peers
+        self.max_batch = max(1, max_batch)
 
         host = peers[node_id][0]
-        self.transport = UDPTransport(host, udp_port)
+        self.transport = UDPTransport(host, udp_port, wire_format)
         self.executor = SQLExecutor(db_pool)
+        self.log = DeliveryLog(log_path) if log_path else None
 
         self.lock = threading.Lock()
+        # Both conditions share self.lock. Handlers notify them only when they
+        # change something the waiting thread actually depends on.
+        self.sequencer_cv = threading.Condition(self.lock)
+        self.delivery_cv = threading.Condition(self.lock)
+        self.status_cv = threading.Condition(self.lock)
+        self.retransmit_cv = threading.Condition(self.lock)
 
         self.local_seq = 0
         self.gc_watermark = 0
 
         self.all_requests: dict = {}
        
-        # Subset of all_requests that have not been asssigned a global sequence number
-        self.pending_requests: dict = {}
+        # Subset of all_requests that have not been asssigned a global sequence number,
+        # queued per sender so the sequencer can pick the next one in O(log senders)
+        self.pending_requests = PendingRequests()
         
-        # Contains mappings from global_seq -> SEQUENCE msg
+        # Contains mappings from global_seq -> SEQUENCE msg that covers it.
+        # A batched SEQUENCE is shared by every global_seq in its block.
         self.sequences: dict = {}
+
+        # Highest global_seq s such that every SEQUENCE up to s and the REQUEST
+        # it references have been received. Only ever moves forward, advanced
+        # by _advance_frontier as SEQUENCE and REQUEST messages arrive.
+        self.received_frontier = -1
         
-        # next global seq the sequencer thread should try to assign
+        # next global seq the sequencer thread should try to assign, and the node
+        # whose turn it is to assign it (the node after the last block's sequencer),
+        # -1 while unknown
         self.next_seq_to_assign = 0
+        self.next_sequencer = 0
+        # False after a restart until every peer has confirmed the turn (see
+        # _learn_turn); until then we never take the turn ourselves
+        self.turn_confirmed = True
+        # Per peer: (next_seq, next_sequencer) from its latest STATUS since the restart
+        self.turn_reports: dict = {}
 
         self.next_to_deliver = 0
         self.delivered: set = set()
@@ -52,28 +121,102 @@ class ABPNode:
         # Initially -1 implying no messages received from that node yet
         self.peer_received_up_to: dict = {i: -1 for i in range(self.n)}
 
+        # Per peer: when we last sent it anything carrying received_up_to, and the
+        # highest received_up_to it has been told. Lets status_thread skip STATUS
+        # to peers that a REQUEST/SEQUENCE already brought up to date.
+        self.last_progress_sent: dict = {i: 0.0 for i in range(self.n)}
+        self.last_progress_value: dict = {i: -1 for i in range(self.n)}
+        # Per peer: when we last sent it a STATUS; repeats that carry no new
+        # progress go out at most once per heartbeat_interval
+        self.last_status_sent: dict = {i: 0.0 for i in range(self.n)}
+        self.heartbeat_interval = HEARTBEAT_MIN_INTERVAL
+        self.heartbeats_sent = 0
+        self.heartbeats_suppressed = 0
+
+        # First global seq of each NAKed gap -> (monotonic time it may be re-NAKed, current backoff)
+        self.nak_backoff: dict = {}
+        # Monotonic time before which the outstanding CATCHUP window is not re-requested
+        self.catchup_due = 0.0
+        # First global seq of the outstanding CATCHUP window, and the peers
+        # that answered a window with nothing (their logs no longer hold it)
+        self.catchup_lo = 0
+        self.catchup_skip: set = set()
+
         # Contains mappings from (sender_id, local_seq) -> threading.Event (set by delivery_thread)
         self.pending_events: dict = {}
         # Contains mappings from (sender_id, local_seq) → SQL result dict
         self.delivery_results: dict = {}
 
+        # Highest global_seq whose write has been applied to the database. Has
+        # its own lock, as gRPC read handlers wait on it (wait_delivered) under
+        # either runtime.
+        self.delivered_up_to = -1
+        self.delivered_cv = threading.Condition()
+
     def _gc(self):
         """Prune delivered state that all nodes have confirmed receiving.
         Called under self.lock after each delivery.
         Does NOT prune sequenced_rids (guards against late retransmitted REQUESTs causing duplicate SQL).
         """
-        new_watermark = min(self.peer_received_up_to.values()) + 1
+        # Our own entry in peer_received_up_to is what we have received; what
+        # we still have to deliver must be kept too
+        new_watermark = min(min(self.peer_received_up_to.values()), self.next_to_deliver - 1) + 1
         if new_watermark <= self.gc_watermark:
             return
         for g in range(self.gc_watermark, new_watermark):
             seq_msg = self.sequences.pop(g, None)
             if seq_msg:
-                rid = tuple(seq_msg["request_id"])
+                rid = request_id_at(seq_msg, g)
                 self.all_requests.pop(rid, None)
                 self.delivered.discard(rid)
         self.gc_watermark = new_watermark
+        if self.log is not None:
+            self.log.truncate(new_watermark - LOG_RETAIN)
+
+    def recover(self):
+        """
+        Restore delivery state from the delivery log before the protocol
+        starts. Writes logged past the database's applied index (a crash
+        between log append and commit) are re-applied from the log; global
+        seqs missed while down are then fetched from peers by catch-up.
+        No-op without a log.
+        """
+        if self.log is None:
+            return
+        applied = self.executor.applied_index()
+        if self.log.last_seq < applied:
+            # The log lost records the database already has (e.g. host crash);
+            # restart it past them rather than leave a hole
+            logger.warning("Delivery log ends at %d but %d is applied, resetting it",
+                           self.log.last_seq, applied)
+            self.log.reset(applied + 1)
+
+        last = self.log.last_seq
+        for lo in range(applied + 1, last + 1, MAX_DELIVERY_BATCH):
+            hi = min(lo + MAX_DELIVERY_BATCH, last + 1)
+            batch = [(None, self.log.request(g)) for g in range(lo, hi)]
+            self.executor.execute_batch(self._delivery_calls(batch), lo)
+
+        # The turn is not restored from the log: a SEQUENCE we sent just before
+        # the crash may have reached peers without being logged here, and taking
+        # the turn again would assign its global seqs twice. It is learnt from
+        # the next SEQUENCE, catch-up or the peers' STATUS (_learn_turn).
+        self.next_seq_to_assign = last + 1
+        self.next_sequencer = -1
+        self.turn_confirmed = False
+        self.received_frontier = last
+        self.next_to_deliver = last + 1
+        self.gc_watermark = last + 1
+        self.peer_received_up_to[self.node_id] = last
+        self.delivered_up_to = last
+        # REQUESTs sent before the restart may still be known to peers, so
+        # local_seqs of this incarnation start past them
+        self.local_seq = self.log.next_incarnation() << 32
+        logger.info("ABPNode %d recovered up to global seq %d (replayed %d)",
+                    self.node_id, last, last - applied)
 
     def start(self):
+        self.recover()
         threads = [
             threading.Thread(target=self.recv_thread,       daemon=True, name="abp-recv"),
             threading.Thread(target=self.sequencer_thread,  daemon=True, name="abp-sequencer"),
@@ -90,13 +233,22 @@ class ABPNode:
 
         while True:
             msg, addr = self.transport.recv()
-            t = msg.get("type")
-            if   t == "REQUEST":    self.handle_request(msg)
-            elif t == "SEQUENCE":   self.handle_sequence(msg)
-            elif t == "STATUS":     self.handle_status(msg)
-            elif t == "RETRANSMIT": self.handle_retransmit(msg, addr)
-            else:
-                logger.warning("Unknown message type: %s", t)
+            self.dispatch(msg, addr)
+
+    def dispatch(self, msg, addr):
+        t = msg.get("type")
+        if   t == "REQUEST":    self.handle_request(msg)
+        elif t == "SEQUENCE":   self.handle_sequence(msg)
+        elif t == "STATUS":     self.handle_status(msg)
+        elif t == "RETRANSMIT": self.handle_retransmit(msg, addr)
+        elif t == "CATCHUP":    self.handle_catchup(msg)
+        elif t == "BUNDLE":
+            for inner in msg["messages"]:
+                self.dispatch(inner, addr)
+            if msg.get("window_end") is not None:
+                self.handle_window_end(msg["sender_id"])
+        else:
+            logger.warning("Unknown message type: %s", t)
 
     def handle_request(self, msg):
         with self.lock:
@@ -105,163 +257,584 @@ class ABPNode:
             if rid not in self.all_requests:
                 self.all_requests[rid] = msg
                 if rid not in self.sequenced_rids:
-                    self.pending_requests[rid] = msg
+                    self.pending_requests.add(rid, msg)
+                    # A new sequencing candidate
+                    self.sequencer_cv.notify()
+                else:
+                    # The REQUEST for an already sequenced slot may close a gap
+                    self._advance_frontier()
 
     def update_peer_progress(self, node_id: int, received_up_to: int):
         """ Function that updates a peer's progress (highest global_seq it has received up to)"""
         if received_up_to > self.peer_received_up_to.get(node_id, -1):
             self.peer_received_up_to[node_id] = received_up_to
+            # Majority condition may now hold for next_to_deliver
+            self.delivery_cv.notify()
+            if received_up_to > self.received_frontier:
+                # The peer has something we are missing
+                self.retransmit_cv.notify()
 
     def handle_sequence(self, msg):
         with self.lock:
             self.update_peer_progress(msg["sequencer_id"], msg["received_up_to"])
-            g = msg["global_seq"]
-            if g not in self.sequences:
-                self.sequences[g] = msg
-                rid = tuple(msg["request_id"])
-                self.sequenced_rids.add(rid)
-                self.pending_requests.pop(rid, None)
-            # Advance next_seq_to_assign past this sequence so the sequencer
-            # thread can reach its own turn (k where k % n == node_id).
-            if g + 1 > self.next_seq_to_assign:
-                self.next_seq_to_assign = g + 1
+            start = msg["global_seq"]
+            for i, rid in enumerate(msg["request_ids"]):
+                g = start + i
+                if g not in self.sequences:
+                    self.sequences[g] = msg
+                    rid = tuple(rid)
+                    self.sequenced_rids.add(rid)
+                    self.pending_requests.pop(rid, None)
+            self._advance_frontier()
+            end = sequence_end(msg)
+            if end - 1 > self.received_frontier:
+                # Something before or inside this block is still missing
+                self.retransmit_cv.notify()
+            # Advance next_seq_to_assign past this block and hand the turn to
+            # the node after its sequencer
+            if end > self.next_seq_to_assign:
+                self.next_seq_to_assign = end
+                self._set_turn((msg["sequencer_id"] + 1) % self.n)
+
+    def _set_turn(self, sequencer_id: int):
+        """
+        Hand the turn to sequencer_id, unless that is us and the turn has not
+        been confirmed since a restart. Called inside the lock.
+        """
+        if sequencer_id == self.node_id and not self.turn_confirmed:
+            self.next_sequencer = -1
+            return
+        self.next_sequencer = sequencer_id
+        self.sequencer_cv.notify()
 
     def handle_status(self, msg):
+        reply = None
         with self.lock:
-            self.update_peer_progress(msg["sender_id"], msg["received_up_to"])
+            sender = msg["sender_id"]
+            self.update_peer_progress(sender, msg["received_up_to"])
+            next_seq = msg.get("next_seq")
+            if next_seq is not None:
+                if not self.turn_confirmed:
+                    self._learn_turn(sender, next_seq, msg["next_sequencer"])
+                elif msg["next_sequencer"] == -1:
+                    # The sender has restarted and is waiting to learn the turn
+                    reply = self._build_status()
+        if reply is not None:
+            host, port = self.peers[sender]
+            self.transport.send(reply, host, port)
+
+    def _learn_turn(self, sender: int, next_seq: int, next_sequencer: int):
+        """
+        Learn the sequencer turn after a restart from a peer's STATUS. A peer
+        that knows of a block at or past ours and whose turn is someone else's
+        is followed at once. The turn is only taken ourselves once every peer
+        has reported, and none knows of a block past ours: a SEQUENCE we sent
+        before the crash would show up in some peer's next_seq.
+        Called inside the lock.
+        """
+        self.turn_reports[sender] = (next_seq, next_sequencer)
+        k = self.next_seq_to_assign
+        if next_seq >= k and next_sequencer not in (-1, self.node_id):
+            self.next_seq_to_assign = next_seq
+            self.turn_confirmed = True
+            self._set_turn(next_sequencer)
+            logger.info("ABPNode %d learnt the turn from node %d: node %d at global seq %d",
+                        self.node_id, sender, next_sequencer, next_seq)
+            return
+        if len(self.turn_reports) < self.n - 1:
+            return
+        if any(seq > k for seq, _ in self.turn_reports.values()):
+            # A peer is ahead; catch-up will bring its SEQUENCEs
+            return
+        turn = next((s for seq, s in self.turn_reports.values() if seq == k and s != -1), None)
+        if turn is None:
+            turn = self._turn_after(k - 1)
+        if turn is None:
+            logger.warning("ABPNode %d cannot tell whose turn global seq %d is", self.node_id, k)
+            return
+        self.turn_confirmed = True
+        self._set_turn(turn)
+        logger.info("ABPNode %d confirmed the turn with all peers: node %d at global seq %d",
+                    self.node_id, turn, k)
+
+    def _turn_after(self, global_seq: int):
+        """
+        The node whose turn follows the block containing global_seq, from
+        memory or the delivery log; 0 before the first block, None if the
+        block is unknown. Called inside the lock.
+        """
+        if global_seq < 0:
+            return 0
+        seq_msg = self.sequences.get(global_seq)
+        if seq_msg is not None:
+            return (seq_msg["sequencer_id"] + 1) % self.n
+        if self.log is not None and global_seq in self.log:
+            return (self.log.entry(global_seq)[2] + 1) % self.n
+        return None
+
+    def _note_progress_sent(self, received_up_to: int):
+        """Record that a message carrying received_up_to is going to every peer. Called inside the lock."""
+        now = time.monotonic()
+        for i in range(self.n):
+            self.last_progress_sent[i] = now
+            if received_up_to > self.last_progress_value[i]:
+                self.last_progress_value[i] = received_up_to
+
+    def heartbeat_stats(self) -> dict:
+        """Counters for STATUS heartbeats sent and suppressed (per peer)"""
+        with self.lock:
+            return {
+                "heartbeats_sent": self.heartbeats_sent,
+                "heartbeats_suppressed": self.heartbeats_suppressed,
+                "heartbeat_interval": self.heartbeat_interval,
+            }
 
     def handle_retransmit(self, msg, addr):
+        """Reply to a NAK, unicast to the requester only"""
         with self.lock:
-            if msg["retransmit_type"] == "REQUEST":
-                rid = tuple(msg["request_id"])
-                cached = self.all_requests.get(rid)
+            if msg["retransmit_type"] == "RANGE":
+                replies = pack_bundles(self.node_id, self._range_messages(msg["lo"], msg["hi"]),
+                                       RECV_BUFSIZE)
+            elif msg["retransmit_type"] == "REQUEST":
+                cached = self.all_requests.get(tuple(msg["request_id"]))
+                replies = [cached] if cached else []
             else:
                 cached = self.sequences.get(msg["global_seq"])
-        if cached:
-            self.transport.broadcast(cached, self.peers)
+                replies = [cached] if cached else []
+        host, port = self.peers[msg["requester_id"]]
+        for reply in replies:
+            self.transport.send(reply, host, port)
+
+    def _range_messages(self, lo: int, hi: int) -> list:
+        """
+        Every SEQUENCE (once per block) and REQUEST we hold for global seqs
+        lo..hi, in order. Global seqs already pruned from memory are rebuilt
+        from the delivery log. Called inside the lock.
+        """
+        out = []
+        last_start = None
+        logged_blocks = {}
+        for g in range(lo, hi + 1):
+            seq_msg = self.sequences.get(g)
+            if seq_msg is None and self.log is not None and g in self.log:
+                start = self.log.entry(g)[0]
+                if start not in logged_blocks:
+                    logged_blocks[start] = self._logged_sequence(g)
+                seq_msg = logged_blocks[start]
+            if seq_msg is None:
+                continue
+            if seq_msg["global_seq"] != last_start:
+                out.append(seq_msg)
+                last_start = seq_msg["global_seq"]
+            req_msg = self.all_requests.get(request_id_at(seq_msg, g))
+            if req_msg is None and self.log is not None and g in self.log:
+                req_msg = self.log.request(g)
+            if req_msg is not None:
+                out.append(req_msg)
+        return out
+
+    def handle_catchup(self, msg):
+        """Stream one window of lo..hi to the requester, unicast"""
+        lo = msg["lo"]
+        hi = min(msg["hi"], lo + CATCHUP_WINDOW - 1)
+        with self.lock:
+            replies = pack_bundles(self.node_id, self._range_messages(lo, hi), RECV_BUFSIZE)
+        # The requester asks for the next window once it sees window_end
+        if replies and replies[-1]["type"] == "BUNDLE":
+            replies[-1]["window_end"] = hi
+        else:
+            replies.append(build_bundle(self.node_id, [], hi))
+        host, port = self.peers[msg["requester_id"]]
+        for reply in replies:
+            self.transport.send(reply, host, port)
+
+    def _logged_sequence(self, global_seq: int):
+        """
+        Rebuild the SEQUENCE message of the block global_seq was delivered in,
+        or None if the whole block is not in the log. Called inside the lock.
+        """
+        start, length, sequencer_id, _ = self.log.entry(global_seq)
+        if start not in self.log or start + length - 1 not in self.log:
+            return None
+        rids = [self.log.entry(g)[3] for g in range(start, start + length)]
+        # received_up_to of -1 never moves the sequencer's progress
+        return build_sequence(start, rids, sequencer_id, -1)
+
+    def handle_window_end(self, sender_id: int):
+        with self.lock:
+            if self.received_frontier < self.catchup_lo:
+                # Nothing from the window arrived: the sender's log has been
+                # truncated past it, so ask another peer
+                self.catchup_skip.add(sender_id)
+            else:
+                self.catchup_skip.clear()
+            self.catchup_due = 0.0
+            self.retransmit_cv.notify()
+
     def sequencer_thread(self):
         while True:
             with self.lock:
-                k = self.next_seq_to_assign
-
-                # Only act when it's our turn
-                if k % self.n != self.node_id:
-                    pass  
-
-                # Precondition 1: all prior SEQUENCE messages exist
-                elif not all(g in self.sequences for g in range(self.gc_watermark, k)):
-                    pass  # waiting for earlier sequences
+                seq_msg = self._try_assign_sequence()
+                while seq_msg is None:
+                    # Woken by handle_request / handle_sequence / submit_write
+                    self.sequencer_cv.wait()
+                    seq_msg = self._try_assign_sequence()
 
-                # Precondition 2: all prior requests referenced by sequences are in all_requests
-                elif any(tuple(self.sequences[g]["request_id"]) not in self.all_requests
-                        for g in range(self.gc_watermark, k)):
-                    pass  # waiting for earlier requests
+            # broadcast outside lock
+            self.transport.broadcast(seq_msg, self.peers)
 
-                else:
-                    # Pick a candidate from pending_requests:
-                    # must not have any earlier unsequenced request from the same sender
-                    candidate = None
-                    for (sid, lseq), req in sorted(self.pending_requests.items()):
-                        has_earlier = any(
-                            lseq2 < lseq and (sid, lseq2) in self.pending_requests
-                            for (sid2, lseq2) in self.pending_requests
-                            if sid2 == sid
-                        )
-                        if not has_earlier:
-                            candidate = ((sid, lseq), req)
-                            break
-
-                    if candidate:
-                        rid, req = candidate
-                        seq_msg = build_sequence(k, rid, self.node_id,
-                                                self.my_received_up_to())
-                        self.sequences[k] = seq_msg
-                        self.sequenced_rids.add(rid)
-                        del self.pending_requests[rid]
-                        self.next_seq_to_assign = k + 1
-
-                        # broadcast outside lock — release first
-                        self.lock.release()
-                        try:
-                            self.transport.broadcast(seq_msg, self.peers)
-                        finally:
-                            self.lock.acquire()
-
-            time.sleep(0.001)
+    def _try_assign_sequence(self):
+        """
+        Assign global_seqs starting at next_seq_to_assign to up to max_batch
+        pending requests if it is our turn and all preconditions hold.
+        Returns the SEQUENCE message to broadcast, or None if there is nothing
+        to do yet.
+        Called inside the lock.
+        """
+        k = self.next_seq_to_assign
+
+        # Only act when it's our turn
+        if self.next_sequencer != self.node_id:
+            return None
+
+        # Preconditions: all prior SEQUENCE messages exist and all requests
+        # they reference are in all_requests
+        if self.received_frontier < k - 1:
+            return None  # waiting for earlier sequences or requests
+
+        # Pick candidates from pending_requests: repeatedly the oldest request
+        # that has no earlier unsequenced request from the same sender
+        rids = []
+        while len(rids) < self.max_batch:
+            candidate = self.pending_requests.peek()
+            if not candidate:
+                break
+            rid, _ = candidate
+            self.pending_requests.pop(rid)
+            rids.append(rid)
+
+        if not rids:
+            return None
+
+        seq_msg = build_sequence(k, rids, self.node_id,
+                                 self.my_received_up_to())
+        self._note_progress_sent(seq_msg["received_up_to"])
+        for i, rid in enumerate(rids):
+            self.sequences[k + i] = seq_msg
+            self.sequenced_rids.add(rid)
+        self.next_seq_to_assign = k + len(rids)
+        self.next_sequencer = (self.node_id + 1) % self.n
+        self._advance_frontier()
+        return seq_msg
 
     def delivery_thread(self):
         while True:
-            req_msg = None
-            rid = None
+            with self.lock:
+                ready = self._next_deliverable()
+                while ready is None:
+                    # Woken when sequences, all_requests or peer_received_up_to advance
+                    self.delivery_cv.wait()
+                    ready = self._next_deliverable()
+                batch = self._take_delivery_batch(ready)
+
+                first_seq = self.next_to_deliver - len(batch)
+
+            # Execute SQL outside lock — can block on DB I/O. The whole run is
+            # applied in order in one transaction.
+            results = self.executor.execute_batch(self._delivery_calls(batch), first_seq)
 
             with self.lock:
-                s = self.next_to_deliver
-
-                if s in self.sequences:
-                    rid = tuple(self.sequences[s]["request_id"])
-
-                    if rid in self.all_requests:
-                        # Majority condition: ≥ ⌊n/2⌋+1 nodes have received_up_to ≥ s
-                        acks = sum(1 for v in self.peer_received_up_to.values() if v >= s)
-                        if acks >= (self.n // 2 + 1):
-                            req_msg = self.all_requests[rid]
-                            self.next_to_deliver += 1
-
-            if req_msg:
-                # Execute SQL outside lock — can block on DB I/O
-                result = self.executor.execute(
-                    req_msg["payload"]["method"],
-                    req_msg["payload"]["args"]
-                )
-
-                with self.lock:
-                    self.delivered.add(rid)
-                    # Update our own progress AFTER delivery
-                    self.peer_received_up_to[self.node_id] = self.next_to_deliver - 1
-
-                    if rid in self.pending_events:
-                        self.delivery_results[rid] = result
-                        self.pending_events[rid].set()
-                    self._gc()
-            else:
-                time.sleep(0.001)
+                self._finish_delivery(batch, results, first_seq)
+
+    def _take_delivery_batch(self, ready) -> list:
+        """
+        Take ready plus every consecutive global_seq after it that is already
+        deliverable, advancing next_to_deliver and appending each to the
+        delivery log before it is applied. Called inside the lock.
+        """
+        batch = []
+        while ready is not None and len(batch) < MAX_DELIVERY_BATCH:
+            batch.append(ready)
+            if self.log is not None:
+                g = self.next_to_deliver
+                self.log.append(g, self.sequences[g], ready[1])
+            self.next_to_deliver += 1
+            ready = self._next_deliverable()
+        return batch
+
+    @staticmethod
+    def _delivery_calls(batch: list) -> list:
+        return [(req_msg["payload"]["method"], req_msg["payload"]["args"])
+                for _, req_msg in batch]
+
+    def _finish_delivery(self, batch: list, results: list, first_seq: int):
+        """
+        Hand results, tagged with their global_seq, to waiting submit_write
+        callers and wake reads waiting for them. Called inside the lock.
+        """
+        for i, ((rid, _), result) in enumerate(zip(batch, results)):
+            self.delivered.add(rid)
+            if rid in self.pending_events:
+                result["global_seq"] = first_seq + i
+                self.delivery_results[rid] = result
+                self.pending_events[rid].set()
+        with self.delivered_cv:
+            self.delivered_up_to = self.next_to_deliver - 1
+            self.delivered_cv.notify_all()
+        self._gc()
+
+    def wait_delivered(self, global_seq: int, timeout: float) -> bool:
+        """
+        Block until the write at global_seq has been applied on this replica.
+        Returns False if it is not within timeout. Safe to call from any thread
+        except the one delivering.
+        """
+        if self.delivered_up_to >= global_seq:
+            return True
+        with self.delivered_cv:
+            return self.delivered_cv.wait_for(lambda: self.delivered_up_to >= global_seq, timeout)
+
+    def _next_deliverable(self):
+        """
+        Returns (rid, REQUEST msg) for next_to_deliver if it has both its
+        REQUEST and SEQUENCE and a majority have received it, else None.
+        Called inside the lock.
+        """
+        s = self.next_to_deliver
+        if s not in self.sequences:
+            return None
+        rid = request_id_at(self.sequences[s], s)
+        if rid not in self.all_requests:
+            return None
+        # Majority condition: ≥ ⌊n/2⌋+1 nodes have received_up_to ≥ s
+        acks = sum(1 for v in self.peer_received_up_to.values() if v >= s)
+        if acks < (self.n // 2 + 1):
+            return None
+        return rid, self.all_requests[rid]
 
     def status_thread(self):
+        """
+        Sends STATUS right away to peers that have not already learned our
+        current received_up_to from a REQUEST/SEQUENCE, and otherwise only to
+        peers that have not heard from us for heartbeat_interval (or, while
+        the turn is unconfirmed, not had a STATUS for that long).
+        The interval backs off while idle and snaps back to
+        HEARTBEAT_MIN_INTERVAL on progress or when a gap is detected.
+        """
+        last_rut = -1
+        wait = self.heartbeat_interval
         while True:
-            time.sleep(0.02)
             with self.lock:
-                rut = self.my_received_up_to()
-            status_msg = build_status(self.node_id, rut)
-            self.transport.broadcast(status_msg, self.peers)
+                # Wake early when our received_up_to advances
+                self.status_cv.wait_for(lambda: self.received_frontier > last_rut,
+                                        timeout=wait)
+                status, targets, wait = self._status_round(last_rut)
+                last_rut = status["received_up_to"]
+
+            if targets:
+                self.transport.broadcast(status, targets)
+            # Rate-limit rounds under load; progress made meanwhile is picked up
+            # by the wait_for predicate without sleeping again
+            time.sleep(HEARTBEAT_MIN_INTERVAL / 4)
+
+    def _status_round(self, last_rut: int) -> tuple:
+        """
+        Adjust heartbeat_interval and pick the peers that are due a STATUS.
+        Returns (STATUS message, [(host, port), ...], seconds until the next
+        peer is due). Called inside the lock.
+        """
+        rut = self.my_received_up_to()
+        progress = rut > last_rut or self._has_gap()
+        if progress:
+            self.heartbeat_interval = HEARTBEAT_MIN_INTERVAL
+
+        now = time.monotonic()
+        targets = []
+        wait = self.heartbeat_interval
+        for i in range(self.n):
+            if i == self.node_id:
+                continue
+            if self.last_progress_value[i] < rut:
+                # Behind: due now, as a lone writer's majority ack may wait on it
+                due = now
+            elif not self.turn_confirmed:
+                # We need its view of the turn: due once the last STATUS is an interval old
+                due = self.last_status_sent[i] + self.heartbeat_interval
+            else:
+                due = self.last_progress_sent[i] + self.heartbeat_interval
+            if due <= now:
+                targets.append(self.peers[i])
+                self.last_progress_sent[i] = now
+                self.last_progress_value[i] = rut
+                self.last_status_sent[i] = now
+            else:
+                self.heartbeats_suppressed += 1
+                wait = min(wait, due - now)
+        self.heartbeats_sent += len(targets)
+        if targets and not progress:
+            # A whole interval passed quietly; back off before the next heartbeat
+            self.heartbeat_interval = min(self.heartbeat_interval * 2,
+                                          HEARTBEAT_MAX_INTERVAL)
+        return self._build_status(), targets, wait
+
+    def _build_status(self):
+        """Our STATUS message. Called inside the lock."""
+        return build_status(self.node_id, self.my_received_up_to(),
+                            self.next_seq_to_assign, self.next_sequencer)
+
+    def _has_gap(self) -> bool:
+        """
+        True if we know of global seqs we have not fully received, either
+        SEQUENCE messages past our frontier or a peer that is ahead of us.
+        Called inside the lock.
+        """
+        f = self.received_frontier
+        return (self.next_seq_to_assign > f + 1
+                or any(v > f for v in self.peer_received_up_to.values()))
 
     def retransmit_thread(self):
+        wait = RETRANSMIT_INTERVAL
         while True:
-            time.sleep(0.5)
-            to_send = []
-
             with self.lock:
-                # Gap type 1: SEQUENCE exists but its REQUEST hasn't arrived
-                for g, seq_msg in self.sequences.items():
-                    rid = tuple(seq_msg["request_id"])
-                    if rid not in self.all_requests:
-                        original_sender = rid[0]
-                        to_send.append(
-                            build_retransmit_request(self.node_id, original_sender, rid)
-                        )
-
-                # Gap type 2: missing SEQUENCE — have seq s+1 but not s
-                known_seqs = set(self.sequences.keys())
-                for g in known_seqs:
-                    if g > self.gc_watermark and (g - 1) not in known_seqs:
-                        expected_sequencer = (g - 1) % self.n
-                        to_send.append(
-                            build_retransmit_sequence(self.node_id, expected_sequencer, g - 1)
-                        )
-
-            for msg in to_send:
-                target_id = msg["target_id"]
-                target_host, target_port = self.peers[target_id]
-                self.transport.send(msg, target_host, target_port)
+                # Woken as soon as a SEQUENCE or peer progress reveals a gap
+                self.retransmit_cv.wait(timeout=wait)
+            # Let reordered datagrams arrive before deciding something is lost
+            time.sleep(NAK_REORDER_DELAY)
+            with self.lock:
+                to_send, wait = self._collect_retransmits()
+            self._send_retransmits(to_send)
+
+    def _collect_retransmits(self) -> tuple:
+        """
+        Range NAKs for every gap past received_frontier that is due (first
+        sighting or backoff expired). Returns (NAKs, seconds until the next
+        one is due). Called inside the lock.
+        """
+        f = self.received_frontier
+        for lo in [lo for lo in self.nak_backoff if lo <= f]:
+            del self.nak_backoff[lo]
+
+        high = max(self.next_seq_to_assign - 1, max(self.peer_received_up_to.values()))
+        now = time.monotonic()
+        if high - f > CATCHUP_WINDOW:
+            return self._collect_catchup(f + 1, high, now)
+        high = min(high, f + MAX_NAK_SPAN)
+        wait = RETRANSMIT_INTERVAL
+        to_send = []
+        for lo, hi in self._missing_ranges(f + 1, high):
+            due, backoff = self.nak_backoff.get(lo, (now, NAK_MIN_INTERVAL / 2))
+            if due > now:
+                wait = min(wait, due - now)
+                continue
+            target = self._nak_target(lo, hi)
+            if target is None:
+                continue
+            to_send.append(build_retransmit_range(self.node_id, target, lo, hi))
+            backoff = min(backoff * 2, RETRANSMIT_INTERVAL)
+            self.nak_backoff[lo] = (now + backoff, backoff)
+            wait = min(wait, backoff)
+        return to_send, wait
+
+    def _collect_catchup(self, lo: int, hi: int, now: float) -> tuple:
+        """
+        A CATCHUP for lo..hi, unless a window is still outstanding. Same
+        return value as _collect_retransmits. Called inside the lock.
+        """
+        if self.catchup_due > now:
+            return [], self.catchup_due - now
+        target = self._catchup_target(lo, hi)
+        if target is None:
+            if not self.catchup_skip:
+                return [], RETRANSMIT_INTERVAL
+            logger.error("ABPNode %d: no peer's delivery log holds global seq %d any more; "
+                         "restore this replica from a copy of a peer's database", self.node_id, lo)
+            self.catchup_skip.clear()
+            self.catchup_due = now + CATCHUP_RETRY_INTERVAL
+            return [], CATCHUP_RETRY_INTERVAL
+        self.catchup_lo = lo
+        self.catchup_due = now + CATCHUP_TIMEOUT
+        return [build_catchup(self.node_id, target, lo, hi)], CATCHUP_TIMEOUT
+
+    def _catchup_target(self, lo: int, hi: int):
+        """
+        The peer furthest ahead that has received lo and has not answered a
+        window with nothing, else _nak_target's pick unless it has.
+        Called inside the lock.
+        """
+        candidates = [i for i in range(self.n)
+                      if i != self.node_id and i not in self.catchup_skip
+                      and self.peer_received_up_to[i] >= lo]
+        if candidates:
+            return max(candidates, key=lambda i: self.peer_received_up_to[i])
+        target = self._nak_target(lo, hi)
+        return None if target in self.catchup_skip else target
+
+    def _missing_ranges(self, lo: int, hi: int) -> list:
+        """
+        Maximal runs [a, b] within lo..hi of global seqs missing their
+        SEQUENCE or REQUEST. Called inside the lock.
+        """
+        ranges = []
+        start = None
+        for g in range(lo, hi + 1):
+            seq_msg = self.sequences.get(g)
+            missing = seq_msg is None or request_id_at(seq_msg, g) not in self.all_requests
+            if missing and start is None:
+                start = g
+            elif not missing and start is not None:
+                ranges.append((start, g - 1))
+                start = None
+        if start is not None:
+            ranges.append((start, hi))
+        return ranges
+
+    def _nak_target(self, lo: int, hi: int):
+        """
+        Pick the peer most likely to hold lo..hi: the peer furthest ahead if
+        it has received lo, else the sequencer of the block after the gap (it
+        had received everything before its block when it sequenced it), else
+        the original sender of a REQUEST whose SEQUENCE we already have.
+        Called inside the lock.
+        """
+        best = max((i for i in range(self.n) if i != self.node_id),
+                   key=lambda i: self.peer_received_up_to[i], default=None)
+        if best is not None and self.peer_received_up_to[best] >= lo:
+            return best
+        after = self.sequences.get(hi + 1)
+        if after is not None and after["sequencer_id"] != self.node_id:
+            return after["sequencer_id"]
+        seq_msg = self.sequences.get(lo)
+        if seq_msg is not None:
+            sender = request_id_at(seq_msg, lo)[0]
+            if sender != self.node_id:
+                return sender
+        return None
+
+    def _send_retransmits(self, to_send: list):
+        for msg in to_send:
+            target_id = msg["target_id"]
+            target_host, target_port = self.peers[target_id]
+            self.transport.send(msg, target_host, target_port)
+
+    def _advance_frontier(self):
+        """
+        Move received_frontier forward over every newly contiguous global_seq
+        and wake the sequencer and delivery threads if it moved.
+        Amortised O(1) per message. Called inside the lock.
+        """
+        f = self.received_frontier
+        while True:
+            seq_msg = self.sequences.get(f + 1)
+            if seq_msg is None or request_id_at(seq_msg, f + 1) not in self.all_requests:
+                break
+            f += 1
+        if f > self.received_frontier:
+            self.received_frontier = f
+            # Our own progress counts towards the majority condition directly
+            self.update_peer_progress(self.node_id, f)
+            self.sequencer_cv.notify()
+            self.delivery_cv.notify()
+            self.status_cv.notify()
 
     def my_received_up_to(self) -> int:
         """
@@ -270,48 +843,55 @@ class ABPNode:
         -1 if nothing received yet.
         Called inside the lock.
         """
-        s = self.gc_watermark - 1
-        while True:
-            candidate = s + 1
-            if candidate not in self.sequences:
-                break
-            rid = tuple(self.sequences[candidate]["request_id"])
-            if rid not in self.all_requests:
-                break
-            s = candidate
-        return s
+        return self.received_frontier
     
     def submit_write(self, method: str, args: dict) -> dict:
         """
         Called by gRPC handler. Blocks until the write is delivered by
         delivery_thread (or times out after 30s).
-        Returns the SQL result dict.
+        Returns the SQL result dict, with the write's global_seq if it was
+        delivered.
         """
+        event = threading.Event()
         with self.lock:
-            lseq = self.local_seq
-            self.local_seq += 1
-            rid = (self.node_id, lseq)
-            event = threading.Event()
-            self.pending_events[rid] = event
-            req_msg = build_request(
-                self.node_id, lseq, method, args,
-                self.my_received_up_to()
-            )
-            self.all_requests[rid] = req_msg
-            self.pending_requests[rid] = req_msg
+            rid, req_msg = self._new_request(method, args, event)
 
         self.transport.broadcast(req_msg, self.peers)
-        delivered = event.wait(timeout=30.0)
+        delivered = event.wait(timeout=SUBMIT_TIMEOUT)
 
         with self.lock:
-            result = self.delivery_results.pop(rid, None)
-            self.pending_events.pop(rid, None)
-            if not delivered:
-                self.pending_requests.pop(rid, None)
+            return self._finish_write(rid, delivered)
+
+    def _new_request(self, method: str, args: dict, event) -> tuple:
+        """
+        Allocate a local_seq for a write and queue its REQUEST; event is set
+        by delivery. Returns (rid, REQUEST msg). Called inside the lock.
+        """
+        lseq = self.local_seq
+        self.local_seq += 1
+        rid = (self.node_id, lseq)
+        self.pending_events[rid] = event
+        req_msg = build_request(
+            self.node_id, lseq, method, args,
+            self.my_received_up_to()
+        )
+        self._note_progress_sent(req_msg["received_up_to"])
+        self.all_requests[rid] = req_msg
+        self.pending_requests.add(rid, req_msg)
+        self.sequencer_cv.notify()
+        return rid, req_msg
+
+    def _finish_write(self, rid: tuple, delivered: bool) -> dict:
+        """Collect the result of a write, cleaning up if it timed out. Called inside the lock."""
+        result = self.delivery_results.pop(rid, None)
+        self.pending_events.pop(rid, None)
+        if not delivered:
+            self.pending_requests.pop(rid, None)
+            # Once sequenced the REQUEST is part of the total order (and
+            # counted in received_frontier), so keep it for delivery
+            if rid not in self.sequenced_rids:
                 self.all_requests.pop(rid, None)
 
         if not delivered or result is None:
-            return {"success": False, "error_message": "ABP timeout — write not delivered"}
+            return dict(NOT_DELIVERED)
         return result
-    
-
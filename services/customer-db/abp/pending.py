@@ -0,0 +1,87 @@
+"""
+Pending (not yet sequenced) REQUESTs, indexed for the sequencer.
+
+Each sender gets its own min-heap of local_seq so its oldest pending request
+is always at the front. A ready-heap holds the front request of every sender,
+keyed by arrival order, so picking the next request to sequence is
+O(log senders) instead of a sort + scan over every pending request.
+
+Removals (a request sequenced by another node, or a timed-out write) are lazy:
+stale heap entries are skipped the next time they reach the top.
+"""
+
+import heapq
+import itertools
+
+
+class PendingRequests:
+    def __init__(self):
+        # (sender_id, local_seq) -> REQUEST msg
+        self._msgs: dict = {}
+        # (sender_id, local_seq) -> arrival counter, used as the ready-heap key
+        self._arrival: dict = {}
+        # sender_id -> min-heap of pending local_seqs
+        self._per_sender: dict = {}
+        # min-heap of (arrival, sender_id, local_seq) for each sender's front request
+        self._ready: list = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._msgs)
+
+    def __contains__(self, rid) -> bool:
+        return rid in self._msgs
+
+    def get(self, rid):
+        return self._msgs.get(rid)
+
+    def add(self, rid: tuple, msg: dict) -> None:
+        """Add a REQUEST. No-op if it is already pending."""
+        if rid in self._msgs:
+            return
+        sid, lseq = rid
+        self._msgs[rid] = msg
+        self._arrival[rid] = next(self._counter)
+        queue = self._per_sender.setdefault(sid, [])
+        heapq.heappush(queue, lseq)
+        if queue[0] == lseq:
+            # New front for this sender (first request, or an earlier local_seq
+            # arrived out of order)
+            heapq.heappush(self._ready, (self._arrival[rid], sid, lseq))
+
+    def pop(self, rid: tuple, default=None):
+        """Remove rid and return its REQUEST msg (or default)"""
+        msg = self._msgs.pop(rid, None)
+        if msg is None:
+            return default
+        self._arrival.pop(rid, None)
+        sid, lseq = rid
+        queue = self._per_sender[sid]
+        if queue[0] == lseq:
+            self._advance_front(sid)
+        return msg
+
+    def peek(self):
+        """
+        Returns (rid, msg) of the oldest-arrived request that has no earlier
+        pending request from the same sender, or None if nothing is pending.
+        """
+        while self._ready:
+            _, sid, lseq = self._ready[0]
+            rid = (sid, lseq)
+            queue = self._per_sender.get(sid)
+            if rid in self._msgs and queue and queue[0] == lseq:
+                return rid, self._msgs[rid]
+            heapq.heappop(self._ready)  # stale entry
+        return None
+
+    def _advance_front(self, sid: int) -> None:
+        """Drop removed local_seqs from the front of sid's queue and publish the new front"""
+        queue = self._per_sender[sid]
+        while queue and (sid, queue[0]) not in self._msgs:
+            heapq.heappop(queue)
+        if not queue:
+            del self._per_sender[sid]
+            return
+        lseq = queue[0]
+        heapq.heappush(self._ready, (self._arrival[(sid, lseq)], sid, lseq))
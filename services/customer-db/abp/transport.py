@@ -1,10 +1,15 @@
 """
 UDP transport layer for the ABP protocol.
+
+Wire format negotiation: until a peer is known to understand the binary codec,
+messages to it are sent as JSON carrying a "wire" field that advertises our
+binary version. Any binary datagram, or JSON datagram with "wire", marks its
+sender as binary-capable; a plain JSON datagram marks it JSON-only again.
 """
 
 import socket
 import logging
-from abp.messages import encode, decode
+from abp.messages import encode, encode_binary, decode, is_binary, BINARY_AVAILABLE, WIRE_VERSION
 
 logger = logging.getLogger(__name__)
 
@@ -13,20 +18,42 @@ RECV_BUFSIZE = 65_507
 
 
 class UDPTransport:
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, wire_format: str = "auto"):
+        # wire_format : "auto" negotiates the binary codec with each peer, "json" never uses it
         self.host = host
         self.port = port
+        self.binary = wire_format != "json" and BINARY_AVAILABLE
+        # (ip, port) of peers that understand the binary codec
+        self.binary_peers: set = set()
+        # hostname -> ip, so peer addresses match the source address of received datagrams
+        self._resolved: dict = {}
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.bind(('0.0.0.0', port))
         logger.info("UDPTransport bound to %s:%d", host, port)
 
 
+    def _peer_addr(self, host: str, port: int) -> tuple:
+        ip = self._resolved.get(host)
+        if ip is None:
+            try:
+                ip = socket.gethostbyname(host)
+            except OSError:
+                return (host, port)
+            self._resolved[host] = ip
+        return (ip, port)
+
     def send(self, msg: dict, host: str, port: int) -> None:
-        """Serialise msg and send it to (host, port)"""
+        """Serialise msg in the format negotiated with (host, port) and send it"""
         try:
-            data = encode(msg)
-            self.sock.sendto(data, (host, port))
+            addr = self._peer_addr(host, port)
+            if not self.binary:
+                data = encode(msg)
+            elif addr in self.binary_peers:
+                data = encode_binary(msg)
+            else:
+                data = encode(dict(msg, wire=WIRE_VERSION))
+            self.sock.sendto(data, addr)
         except Exception as exc:
             logger.warning("send to %s:%d failed: %s", host, port, exc)
 
@@ -43,15 +70,29 @@ class UDPTransport:
         while True:
             try:
                 data, addr = self.sock.recvfrom(RECV_BUFSIZE)
-                msg = decode(data)
-                return msg, addr
-            except (ValueError, KeyError) as exc:
-                logger.warning("Malformed datagram from %s: %s", addr, exc)
-                # skip and wait for the next datagram
             except Exception as exc:
                 logger.error("recv error: %s", exc)
                 raise
+            msg = self.accept(data, addr)
+            if msg is not None:
+                return msg, addr
 
+    def accept(self, data: bytes, addr: tuple):
+        """
+        Decode a received datagram and record whether its sender speaks the
+        binary codec. Returns the message dict, or None if it is malformed.
+        """
+        try:
+            msg = decode(data)
+        except (ValueError, KeyError) as exc:
+            logger.warning("Malformed datagram from %s: %s", addr, exc)
+            return None
+        if self.binary:
+            if is_binary(data) or msg.pop("wire", 0) >= 1:
+                self.binary_peers.add(addr)
+            else:
+                self.binary_peers.discard(addr)
+        return msg
 
     def close(self) -> None:
         """Close the underlying socket. Called on node shutdown."""
@@ -0,0 +1,203 @@
+"""
+Append-only, memory-mapped log of delivered ABP writes.
+
+Every global seq is appended here, in order, when the delivery thread takes
+it, before its SQL is applied. The log is therefore always at least as far
+ahead as the applied index PostgreSQL records in the same transaction as the
+writes, and a restarted replica replays only the suffix past that index.
+Peers serve CATCHUP requests from it, so a replica that missed a long run
+of writes streams them in bulk instead of NAKing them out of memory.
+
+File layout:
+  header — magic, version, incarnation, first global seq, tail offset
+  record — global_seq, start / length / sequencer of its SEQUENCE block,
+           request_id, CRC32 and length of the payload, then the REQUEST
+           message as JSON
+
+The tail offset is written after the records it covers, so a torn append
+is ignored on reopen. Pages are flushed by the OS; a process crash loses
+nothing, and after a host crash reopen() stops at the first bad record.
+
+Records every peer no longer needs are dropped with truncate(), which moves
+the rest to the front of the file once the dropped prefix is at least as
+large as what is kept, so the file stays within a constant factor of the
+retained records. A crash part way through the move leaves a log whose first
+record does not match first_seq; it reopens empty and the node recovers as
+it does from any log behind the database (ABPNode.recover).
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import zlib
+
+from abp.messages import encode
+
+logger = logging.getLogger(__name__)
+
+LOG_MAGIC = b"ABPL"
+LOG_VERSION = 1
+
+# magic, version, incarnation, first global seq, tail offset
+_HEADER = struct.Struct("!4sHIqQ")
+# global_seq, block start, block length, sequencer_id, sender_id, local_seq, crc32, payload length
+_RECORD = struct.Struct("!qqIHHqII")
+
+# Files start this large and double whenever an append does not fit
+INITIAL_SIZE = 16 * 1024 * 1024
+
+# truncate() leaves smaller dropped prefixes in place
+COMPACT_MIN_RECORDS = 4096
+
+
+class DeliveryLog:
+    def __init__(self, path: str):
+        # path : file holding the log; created (with its directory) if missing
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < INITIAL_SIZE:
+            os.ftruncate(self._fd, INITIAL_SIZE)
+        self._map = mmap.mmap(self._fd, 0)
+
+        # Offset of each record, indexed by global_seq - first_seq
+        self._offsets: list = []
+        self.first_seq = 0
+        self.incarnation = 0
+        self._tail = _HEADER.size
+        self._open()
+
+    def _open(self):
+        magic, version, incarnation, first_seq, tail = _HEADER.unpack_from(self._map)
+        if magic != LOG_MAGIC:
+            self._write_header()
+            return
+        if version > LOG_VERSION:
+            raise ValueError(f"{self.path}: unsupported log version {version}")
+        self.incarnation = incarnation
+        self.first_seq = first_seq
+        offset = _HEADER.size
+        while offset < tail:
+            record = self._record_at(offset)
+            if record is None or record[0] != self.first_seq + len(self._offsets):
+                logger.warning("%s: discarding log past offset %d", self.path, offset)
+                break
+            self._offsets.append(offset)
+            offset += _RECORD.size + record[7]
+        self._tail = offset
+        self._write_header()
+
+    def _write_header(self):
+        _HEADER.pack_into(self._map, 0, LOG_MAGIC, LOG_VERSION, self.incarnation,
+                          self.first_seq, self._tail)
+
+    def _record_at(self, offset: int):
+        """Unpack the record header at offset, or None if it is torn or corrupt"""
+        if offset + _RECORD.size > len(self._map):
+            return None
+        record = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size
+        end = start + record[7]
+        if end > len(self._map) or zlib.crc32(self._map[start:end]) != record[6]:
+            return None
+        return record
+
+    @property
+    def last_seq(self) -> int:
+        """Highest global seq in the log, or first_seq - 1 if it is empty"""
+        return self.first_seq + len(self._offsets) - 1
+
+    def next_incarnation(self) -> int:
+        """Bump and persist the incarnation, which changes on every restart"""
+        self.incarnation += 1
+        self._write_header()
+        return self.incarnation
+
+    def reset(self, first_seq: int):
+        """Drop every record and restart the log at first_seq"""
+        self._offsets = []
+        self.first_seq = first_seq
+        self._tail = _HEADER.size
+        self._write_header()
+
+    def append(self, global_seq: int, seq_msg: dict, req_msg: dict):
+        """Append the write delivered at global_seq, which must be last_seq + 1"""
+        if global_seq != self.last_seq + 1:
+            raise ValueError(f"log append out of order: {global_seq} after {self.last_seq}")
+        payload = encode(req_msg)
+        sender_id, local_seq = seq_msg["request_ids"][global_seq - seq_msg["global_seq"]]
+        size = _RECORD.size + len(payload)
+        if self._tail + size > len(self._map):
+            self._grow(self._tail + size)
+        _RECORD.pack_into(self._map, self._tail, global_seq, seq_msg["global_seq"],
+                          len(seq_msg["request_ids"]), seq_msg["sequencer_id"],
+                          sender_id, local_seq, zlib.crc32(payload), len(payload))
+        self._map[self._tail + _RECORD.size:self._tail + size] = payload
+        self._offsets.append(self._tail)
+        self._tail += size
+        self._write_header()
+
+    def truncate(self, first_seq: int):
+        """
+        Drop the records before first_seq. The space is reclaimed lazily:
+        nothing happens until the dropped prefix is at least
+        COMPACT_MIN_RECORDS and no smaller than what is kept, so copying the
+        kept records costs O(1) per append.
+        """
+        drop = min(first_seq, self.last_seq + 1) - self.first_seq
+        if drop < max(COMPACT_MIN_RECORDS, len(self._offsets) - drop):
+            return
+        if drop < len(self._offsets):
+            shift = self._offsets[drop] - _HEADER.size
+        else:
+            shift = self._tail - _HEADER.size
+        self._map.move(_HEADER.size, _HEADER.size + shift, self._tail - _HEADER.size - shift)
+        self._offsets = [offset - shift for offset in self._offsets[drop:]]
+        self.first_seq += drop
+        self._tail -= shift
+        self._write_header()
+
+        size = len(self._map)
+        while size > INITIAL_SIZE and self._tail * 4 < size:
+            size //= 2
+        if size < len(self._map):
+            self._resize(size)
+
+    def _grow(self, needed: int):
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._resize(size)
+
+    def _resize(self, size: int):
+        self._map.close()
+        os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, 0)
+
+    def __contains__(self, global_seq: int) -> bool:
+        return self.first_seq <= global_seq <= self.last_seq
+
+    def entry(self, global_seq: int) -> tuple:
+        """
+        Returns (block_start, block_len, sequencer_id, request_id) of the
+        SEQUENCE block global_seq was delivered in
+        """
+        record = _RECORD.unpack_from(self._map, self._offsets[global_seq - self.first_seq])
+        return record[1], record[2], record[3], (record[4], record[5])
+
+    def request(self, global_seq: int) -> dict:
+        """Returns the REQUEST message delivered at global_seq"""
+        offset = self._offsets[global_seq - self.first_seq]
+        length = _RECORD.unpack_from(self._map, offset)[7]
+        start = offset + _RECORD.size
+        return json.loads(self._map[start:start + length])
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+        os.close(self._fd)
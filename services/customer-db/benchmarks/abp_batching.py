@@ -0,0 +1,47 @@
+"""
+Mixed-load benchmark for batched sequencing.
+
+For each max_batch value a fresh in-process cluster (no-op executor) is
+started and driven at several offered loads: a single writer, a moderate
+number of writers, and a burst of many writers spread over all nodes.
+Reports throughput and p50/p99 submit_write latency per load.
+
+Run from services/customer-db:
+  python benchmarks/abp_batching.py --batches 1,32 --writers 1,8,64
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp_latency import percentile, run_writes, start_cluster
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP batched sequencing benchmark")
+    parser.add_argument("--nodes", type=int, default=5, help="Number of ABP replicas")
+    parser.add_argument("--base-port", type=int, default=15200, help="First UDP port")
+    parser.add_argument("--batches", default="1,32", help="Comma-separated max_batch values")
+    parser.add_argument("--writers", default="1,8,64", help="Comma-separated writer counts")
+    parser.add_argument("--writes-per-writer", type=int, default=50, help="Writes issued per writer")
+    args = parser.parse_args()
+
+    batches = [int(b) for b in args.batches.split(",")]
+    writer_counts = [int(w) for w in args.writers.split(",")]
+
+    for run, max_batch in enumerate(batches):
+        # Each cluster gets its own ports; the previous one keeps running as daemon threads
+        nodes = start_cluster(args.nodes, args.base_port + run * args.nodes, max_batch=max_batch)
+        time.sleep(0.5)
+        for writers in writer_counts:
+            num_writes = writers * args.writes_per_writer
+            start = time.monotonic()
+            latencies = run_writes(nodes, num_writes, writers)
+            wall = time.monotonic() - start
+            print(f"max_batch={max_batch:<3} writers={writers:<3} "
+                  f"throughput={num_writes / wall:7.0f} writes/sec "
+                  f"p50={statistics.median(latencies):6.2f} ms "
+                  f"p99={percentile(latencies, 99):6.2f} ms")
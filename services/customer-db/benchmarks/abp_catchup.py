@@ -0,0 +1,88 @@
+"""
+Benchmark: recovery time of a restarted replica that missed --missed writes.
+
+Writes the same delivery log of --missed writes for every node but the last,
+which starts with an empty log (as a replica restarted from an old snapshot
+would), then starts the cluster and reports
+  1. how long the lagging node takes to catch up from its peers' logs, and
+     how many datagrams (and which message types) that took
+  2. how long a node whose database is behind its own log takes to replay
+     the log locally on restart
+
+Run from services/customer-db:
+  python benchmarks/abp_catchup.py --nodes 3 --missed 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp_latency import RUNTIMES, NoopExecutor
+from abp_loss_recovery import count_sends
+from abp.messages import build_request, build_sequence
+from abp.node import DEFAULT_MAX_BATCH
+from abp.wal import DeliveryLog
+
+
+def write_log(path: str, num_nodes: int, num_writes: int):
+    """A log of num_writes no-op writes, sequenced in rotating blocks of DEFAULT_MAX_BATCH"""
+    log = DeliveryLog(path)
+    for start in range(0, num_writes, DEFAULT_MAX_BATCH):
+        block = range(start, min(start + DEFAULT_MAX_BATCH, num_writes))
+        sequencer_id = (start // DEFAULT_MAX_BATCH) % num_nodes
+        seq_msg = build_sequence(start, [(sequencer_id, g) for g in block], sequencer_id, -1)
+        for g in block:
+            log.append(g, seq_msg, build_request(sequencer_id, g, "Noop", {"i": g}, -1))
+    log.close()
+
+
+def start_node(node_cls, node_id: int, peers: list, log_path: str, applied: int):
+    node = node_cls(node_id, peers, None, peers[node_id][1], log_path=log_path)
+    node.executor = NoopExecutor()
+    node.executor.applied = applied
+    return node
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP restarted-replica recovery benchmark")
+    parser.add_argument("--nodes", type=int, default=3, help="Number of ABP replicas")
+    parser.add_argument("--base-port", type=int, default=16500, help="First UDP port")
+    parser.add_argument("--missed", type=int, default=100_000, help="Writes the lagging node missed")
+    parser.add_argument("--runtime", choices=sorted(RUNTIMES), default="threads")
+    args = parser.parse_args()
+
+    node_cls = RUNTIMES[args.runtime]
+    tmp = tempfile.mkdtemp(prefix="abp-catchup-")
+    paths = [os.path.join(tmp, f"node{i}.log") for i in range(args.nodes + 1)]
+    for path in paths[:-2]:
+        write_log(path, args.nodes, args.missed)
+    peers = [("127.0.0.1", args.base_port + i) for i in range(args.nodes)]
+
+    nodes = [start_node(node_cls, i, peers, paths[i], args.missed - 1)
+             for i in range(args.nodes - 1)]
+    nodes.append(start_node(node_cls, args.nodes - 1, peers, paths[args.nodes - 1], -1))
+    counts = count_sends(nodes)
+    for node in nodes:
+        node.start()
+    lagging = nodes[-1]
+    start = time.monotonic()
+    while lagging.next_to_deliver < args.missed:
+        time.sleep(0.001)
+    elapsed = time.monotonic() - start
+    print(f"{args.runtime}: caught up on {args.missed} writes in {elapsed * 1000:.0f} ms "
+          f"({args.missed / elapsed:.0f} writes/sec), {sum(counts.values())} datagrams sent "
+          f"({dict(counts)})")
+
+    # A node whose database is empty but whose log is complete replays it locally
+    write_log(paths[-1], args.nodes, args.missed)
+    replaying = start_node(node_cls, 0, [("127.0.0.1", args.base_port + args.nodes)],
+                           paths[-1], -1)
+    start = time.monotonic()
+    replaying.recover()
+    elapsed = time.monotonic() - start
+    print(f"local replay of {args.missed} logged writes: {elapsed * 1000:.0f} ms")
+    shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,124 @@
+"""
+Benchmark for the ABP node runtime.
+
+Starts an in-process cluster of ABPNodes on localhost UDP ports with a no-op
+SQL executor, then reports
+  1. idle CPU usage per node (no writes in flight)
+  2. p50/p99 submit_write latency for sequential and concurrent writers
+
+Run from services/customer-db:
+  python benchmarks/abp_latency.py --nodes 5 --writes 2000 --writers 16
+  python benchmarks/abp_latency.py --runtime asyncio --writers 100
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp.aio import AsyncABPNode
+from abp.node import ABPNode
+
+RUNTIMES = {"threads": ABPNode, "asyncio": AsyncABPNode}
+
+
+class NoopExecutor:
+    """Stands in for SQLExecutor so only protocol cost is measured"""
+
+    def __init__(self):
+        self.applied = -1
+
+    def execute(self, method_name: str, args: dict, global_seq: int = None) -> dict:
+        return self.execute_batch([(method_name, args)], global_seq)[0]
+
+    def execute_batch(self, calls: list, first_seq: int = None) -> list:
+        if first_seq is not None:
+            self.applied = first_seq + len(calls) - 1
+        return [{"success": True} for _ in calls]
+
+    def applied_index(self) -> int:
+        return self.applied
+
+
+def start_cluster(num_nodes: int, base_port: int, node_cls=ABPNode, **node_kwargs) -> list:
+    peers = [("127.0.0.1", base_port + i) for i in range(num_nodes)]
+    nodes = []
+    for i in range(num_nodes):
+        node = node_cls(i, peers, None, base_port + i, **node_kwargs)
+        node.executor = NoopExecutor()
+        nodes.append(node)
+    for node in nodes:
+        node.start()
+    return nodes
+
+
+def measure_idle_cpu(num_nodes: int, seconds: float) -> float:
+    """Returns CPU-seconds per wall-second, per node"""
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    return cpu / wall / num_nodes
+
+
+def percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_writes(nodes: list, num_writes: int, num_writers: int) -> list:
+    latencies = []
+    lock = threading.Lock()
+
+    def one_write(i):
+        node = nodes[i % len(nodes)]
+        start = time.perf_counter()
+        result = node.submit_write("Noop", {"i": i})
+        elapsed = (time.perf_counter() - start) * 1000
+        if not result.get("success"):
+            print(f"write {i} failed: {result.get('error_message')}")
+        with lock:
+            latencies.append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=num_writers) as pool:
+        list(pool.map(one_write, range(num_writes)))
+    return latencies
+
+
+def report(label: str, latencies: list, wall: float):
+    print(f"{label}: n={len(latencies)} "
+          f"p50={statistics.median(latencies):.2f} ms "
+          f"p99={percentile(latencies, 99):.2f} ms "
+          f"throughput={len(latencies) / wall:.0f} writes/sec")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP idle CPU and submit_write latency benchmark")
+    parser.add_argument("--nodes", type=int, default=5, help="Number of ABP replicas")
+    parser.add_argument("--base-port", type=int, default=15100, help="First UDP port")
+    parser.add_argument("--idle-secs", type=float, default=5.0, help="Idle CPU sampling window")
+    parser.add_argument("--writes", type=int, default=2000, help="Writes per latency run")
+    parser.add_argument("--writers", type=int, default=16, help="Concurrent writers")
+    parser.add_argument("--runtime", choices=sorted(RUNTIMES), default="threads",
+                        help="ABPNode runtime to benchmark")
+    args = parser.parse_args()
+
+    nodes = start_cluster(args.nodes, args.base_port, RUNTIMES[args.runtime])
+    time.sleep(0.5)
+
+    idle = measure_idle_cpu(args.nodes, args.idle_secs)
+    print(f"Idle CPU: {idle * 100:.1f}% of one core per node")
+
+    start = time.monotonic()
+    latencies = run_writes(nodes, args.writes // 4, 1)
+    report("Sequential submit_write", latencies, time.monotonic() - start)
+
+    start = time.monotonic()
+    latencies = run_writes(nodes, args.writes, args.writers)
+    report(f"Concurrent submit_write ({args.writers} writers)", latencies, time.monotonic() - start)
@@ -0,0 +1,62 @@
+"""
+Benchmark: ABP recovery under packet loss.
+
+Starts an in-process cluster and makes the last node drop a random --loss
+fraction of incoming datagrams while --writes go through the others. Every
+node takes a turn as sequencer, so the run only completes as fast as the
+lossy node recovers what it missed. Reports write throughput and how many
+datagrams (and which message types) the cluster sent.
+
+Run from services/customer-db:
+  python benchmarks/abp_loss_recovery.py --nodes 3 --writes 2000 --loss 0.2
+"""
+import argparse
+import collections
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp_latency import RUNTIMES, report, run_writes, start_cluster
+
+
+def count_sends(nodes: list) -> collections.Counter:
+    counts = collections.Counter()
+    lock = threading.Lock()
+    for node in nodes:
+        send = node.transport.send
+
+        def counting_send(msg, host, port, send=send):
+            with lock:
+                counts[msg["type"]] += 1
+            send(msg, host, port)
+        node.transport.send = counting_send
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP packet-loss recovery benchmark")
+    parser.add_argument("--nodes", type=int, default=3, help="Number of ABP replicas")
+    parser.add_argument("--base-port", type=int, default=16300, help="First UDP port")
+    parser.add_argument("--writes", type=int, default=2000, help="Writes to submit")
+    parser.add_argument("--writers", type=int, default=16, help="Concurrent writers")
+    parser.add_argument("--loss", type=float, default=0.2,
+                        help="Fraction of incoming datagrams the lossy node drops")
+    parser.add_argument("--runtime", choices=sorted(RUNTIMES), default="threads")
+    args = parser.parse_args()
+
+    nodes = start_cluster(args.nodes, args.base_port, RUNTIMES[args.runtime])
+    lossy, healthy = nodes[-1], nodes[:-1]
+    dispatch = lossy.dispatch
+    lossy.dispatch = lambda msg, addr: None if random.random() < args.loss else dispatch(msg, addr)
+    time.sleep(0.5)
+
+    counts = count_sends(nodes)
+    start = time.monotonic()
+    latencies = run_writes(healthy, args.writes, args.writers)
+    report(f"{args.runtime}, {args.loss:.0%} loss on node {lossy.node_id}", latencies,
+           time.monotonic() - start)
+    print(f"{sum(counts.values())} datagrams sent ({dict(counts)})")
@@ -0,0 +1,78 @@
+"""
+Benchmark: threaded ABPNode vs AsyncABPNode, one replica per process.
+
+abp_latency.py runs every replica in one interpreter, so they share a GIL;
+here each replica gets its own process (as in deployment) with its share of
+the writer threads calling submit_write locally. --sql-ms adds a sleep per
+delivered batch to stand in for the PostgreSQL round trip.
+
+Run from services/customer-db:
+  python benchmarks/abp_runtime.py --nodes 5 --writers 100 --writes 5000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp_latency import RUNTIMES, NoopExecutor, percentile, run_writes
+
+
+class SleepExecutor(NoopExecutor):
+    def __init__(self, sql_ms: float):
+        super().__init__()
+        self.sql_s = sql_ms / 1000
+
+    def execute_batch(self, calls: list, first_seq: int = None) -> list:
+        time.sleep(self.sql_s)
+        return super().execute_batch(calls, first_seq)
+
+
+def replica(node_id, args, barrier, results):
+    peers = [("127.0.0.1", args.base_port + i) for i in range(args.nodes)]
+    node = RUNTIMES[args.runtime](node_id, peers, None, args.base_port + node_id)
+    node.executor = SleepExecutor(args.sql_ms)
+    node.start()
+    barrier.wait()
+    start = time.monotonic()
+    latencies = run_writes([node], args.writes // args.nodes, max(1, args.writers // args.nodes))
+    results.put((latencies, time.monotonic() - start))
+    # Keep serving peers until everyone has finished
+    barrier.wait()
+
+
+def run(args) -> None:
+    barrier = mp.Barrier(args.nodes)
+    results = mp.Queue()
+    procs = [mp.Process(target=replica, args=(i, args, barrier, results), daemon=True)
+             for i in range(args.nodes)]
+    for p in procs:
+        p.start()
+    latencies, wall = [], 0.0
+    for _ in procs:
+        lat, elapsed = results.get()
+        latencies.extend(lat)
+        wall = max(wall, elapsed)
+    for p in procs:
+        p.join()
+    print(f"{args.runtime:>8}: n={len(latencies)} "
+          f"p50={percentile(latencies, 50):.2f} ms p99={percentile(latencies, 99):.2f} ms "
+          f"throughput={len(latencies) / wall:.0f} writes/sec")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP threaded vs asyncio runtime benchmark")
+    parser.add_argument("--nodes", type=int, default=5, help="Number of ABP replicas (processes)")
+    parser.add_argument("--base-port", type=int, default=15600, help="First UDP port")
+    parser.add_argument("--writes", type=int, default=5000, help="Total writes")
+    parser.add_argument("--writers", type=int, default=100, help="Total concurrent writers")
+    parser.add_argument("--sql-ms", type=float, default=1.0, help="Simulated SQL time per batch")
+    parser.add_argument("--runtime", choices=sorted(RUNTIMES) + ["both"], default="both")
+    args = parser.parse_args()
+
+    for runtime in (sorted(RUNTIMES) if args.runtime == "both" else [args.runtime]):
+        args.runtime = runtime
+        run(args)
+        args.base_port += args.nodes
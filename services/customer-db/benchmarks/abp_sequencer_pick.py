@@ -0,0 +1,80 @@
+"""
+Microbenchmark for sequencer candidate selection.
+
+Feeds N pending REQUESTs from S senders (interleaved, as they would arrive
+over UDP) and times how long it takes to pick and remove every one of them,
+using PendingRequests and the previous sort + nested-scan selection.
+
+Run from services/customer-db:
+  python benchmarks/abp_sequencer_pick.py --requests 10000 --senders 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp.messages import build_request
+from abp.pending import PendingRequests
+
+
+def make_requests(num_requests: int, num_senders: int) -> list:
+    return [
+        ((i % num_senders, i // num_senders),
+         build_request(i % num_senders, i // num_senders, "Noop", {}, -1))
+        for i in range(num_requests)
+    ]
+
+
+def drain_pending(requests: list) -> float:
+    pending = PendingRequests()
+    for rid, msg in requests:
+        pending.add(rid, msg)
+    start = time.perf_counter()
+    picked = 0
+    while True:
+        candidate = pending.peek()
+        if not candidate:
+            break
+        pending.pop(candidate[0])
+        picked += 1
+    assert picked == len(requests)
+    return time.perf_counter() - start
+
+
+def drain_legacy(requests: list) -> float:
+    """Selection as sequencer_thread did it before PendingRequests"""
+    pending = dict(requests)
+    start = time.perf_counter()
+    while pending:
+        candidate = None
+        for (sid, lseq), req in sorted(pending.items()):
+            has_earlier = any(
+                lseq2 < lseq and (sid, lseq2) in pending
+                for (sid2, lseq2) in pending
+                if sid2 == sid
+            )
+            if not has_earlier:
+                candidate = (sid, lseq)
+                break
+        del pending[candidate]
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP sequencer candidate selection microbenchmark")
+    parser.add_argument("--requests", type=int, default=10000, help="Pending requests to feed")
+    parser.add_argument("--senders", type=int, default=5, help="Number of senders")
+    parser.add_argument("--legacy-requests", type=int, default=2000,
+                        help="Requests for the legacy selection (it is quadratic)")
+    args = parser.parse_args()
+
+    elapsed = drain_pending(make_requests(args.requests, args.senders))
+    print(f"PendingRequests: {args.requests} picks in {elapsed * 1000:.1f} ms "
+          f"({elapsed / args.requests * 1e6:.2f} us/pick)")
+
+    if args.legacy_requests:
+        elapsed = drain_legacy(make_requests(args.legacy_requests, args.senders))
+        print(f"Legacy sort+scan: {args.legacy_requests} picks in {elapsed * 1000:.1f} ms "
+              f"({elapsed / args.legacy_requests * 1e6:.2f} us/pick)")
@@ -0,0 +1,59 @@
+"""
+Benchmark for the ABP wire formats.
+
+For each message type, reports datagram size and encode/decode CPU time for
+the JSON format and the binary (struct header + msgpack) format.
+
+Run from services/customer-db:
+  python benchmarks/abp_wire_format.py --iterations 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from abp.messages import (BINARY_AVAILABLE, build_request, build_retransmit_request,
+                          build_retransmit_sequence, build_sequence, build_status,
+                          decode, encode, encode_binary)
+
+
+SAMPLES = {
+    "REQUEST": build_request(3, 120_345, "AddItemToCart",
+                             {"session_id": "6f1c2a9e-3b7d-4c1e-9a55-2f0d8e7b1c42",
+                              "item_id": 17, "quantity": 2}, 98_765),
+    "SEQUENCE (1)": build_sequence(98_770, [(3, 120_345)], 2, 98_765),
+    "SEQUENCE (32)": build_sequence(98_770, [(i % 5, 120_000 + i) for i in range(32)], 2, 98_765),
+    "STATUS": build_status(4, 98_765),
+    "RETRANSMIT REQUEST": build_retransmit_request(1, 3, (3, 120_345)),
+    "RETRANSMIT SEQUENCE": build_retransmit_sequence(1, 2, 98_770),
+}
+
+
+def time_per_op(fn, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ABP wire format benchmark")
+    parser.add_argument("--iterations", type=int, default=100_000, help="Encode/decode calls per measurement")
+    args = parser.parse_args()
+
+    codecs = [("json", encode)]
+    if BINARY_AVAILABLE:
+        codecs.append(("binary", encode_binary))
+    else:
+        print("msgpack not installed, only measuring JSON")
+
+    print(f"{'message':<22}{'format':<8}{'bytes':>7}{'encode us':>11}{'decode us':>11}")
+    for name, msg in SAMPLES.items():
+        for fmt, encoder in codecs:
+            data = encoder(msg)
+            assert decode(data) == decode(encode(msg))
+            enc = time_per_op(encoder, msg, args.iterations)
+            dec = time_per_op(decode, data, args.iterations)
+            print(f"{name:<22}{fmt:<8}{len(data):>7}{enc:>11.2f}{dec:>11.2f}")
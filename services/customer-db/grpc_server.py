@@ -4,8 +4,10 @@ Handles sellers, buyers, sessions, and cart operations
 """
 import json
 import os
+import queue
 import sys
 import threading
+import time
 import uuid
 from concurrent import futures
 
@@ -19,8 +21,17 @@ sys.path.insert(0, '/app/generated')
 
 import customer_db_pb2
 import customer_db_pb2_grpc
-from abp.node import ABPNode
+from abp.aio import AsyncABPNode
+from abp.node import ABPNode, DEFAULT_MAX_BATCH
+from sessions import SessionTable
 
+# How long a read waits for this replica to apply the write named by its min_seq
+MIN_SEQ_WAIT = 2.0
+
+
+def write_seq(result: dict) -> int:
+    """Read-your-writes token for a submit_write result; 0 if it was not delivered"""
+    return result.get("global_seq", -1) + 1
 
 
 class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
@@ -53,15 +64,40 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         peers_raw = os.getenv("ABP_PEERS", "localhost:5100")
         peers = [(h, int(p)) for h, p in (pair.split(":") for pair in peers_raw.split(","))]
         udp_port  = int(os.getenv("ABP_UDP_PORT", "5100"))
-
-        self.abp = ABPNode(node_id, peers, self.db_pool, udp_port)
+        max_batch = int(os.getenv("ABP_MAX_BATCH", str(DEFAULT_MAX_BATCH)))
+        wire_format = os.getenv("ABP_WIRE_FORMAT", "auto")
+        # "threads" (default) or "asyncio" (single event loop, see abp/aio.py)
+        runtime = os.getenv("ABP_RUNTIME", "threads")
+        node_cls = AsyncABPNode if runtime == "asyncio" else ABPNode
+        # Kept on the PostgreSQL volume so the log and the applied index it
+        # is checked against survive (or are wiped) together
+        log_path = os.getenv("ABP_LOG_PATH", "/var/lib/postgresql/data/abp/delivery.log")
+
+        self.abp = node_cls(node_id, peers, self.db_pool, udp_port,
+                            max_batch=max_batch, wire_format=wire_format,
+                            log_path=log_path)
+        # Session validation and keep-alives are served from this replica's memory
+        self.sessions = SessionTable(self.abp, self.db_pool)
         self.abp.start()
+        self.sessions.start()
         print(f"ABPNode {node_id} started, peers={peers}")
         
         # Register UUID type
         extras.register_uuid()
         print("Customer DB connection pool initialized")
 
+    def await_min_seq(self, request, context):
+        """
+        Hold a read until this replica has applied the write its min_seq names,
+        so a client reads its own writes on any replica. A replica still behind
+        after MIN_SEQ_WAIT fails the call with FAILED_PRECONDITION rather than
+        UNAVAILABLE: it is only lagging, so the client retries the read on
+        another replica without marking this one down.
+        """
+        if request.min_seq and not self.abp.wait_delivered(request.min_seq - 1, MIN_SEQ_WAIT):
+            context.abort(grpc.StatusCode.FAILED_PRECONDITION,
+                          f"replica has not applied seq {request.min_seq} yet")
+
     # Seller Operation
 
     def CreateSeller(self, request, context):
@@ -75,6 +111,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             success=result["success"],
             seller_id=result.get("seller_id", 0),
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def SellerLogin(self, request, context):
@@ -84,6 +121,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             "username": request.username,
             "password": request.password,
             "session_id": session_id,
+            "logged_in_at": time.time(),
         })
         return customer_db_pb2.SellerLoginResponse(
             success=result["success"],
@@ -91,6 +129,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             seller_id=result.get("seller_id", 0),
             username=result.get("username", ""),
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
     )
         
 
@@ -101,10 +140,12 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.LogoutResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def GetSellerRating(self, request, context):
         """Get seller rating (thumbs up/down)"""
+        self.await_min_seq(request, context)
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -139,52 +180,40 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             self.db_pool.putconn(conn)
 
     def ValidateSellerSession(self, request, context):
-        """Validate seller session and check timeout"""
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-            cursor.execute(
-                "SELECT seller_id FROM seller_sessions "
-                "WHERE session_id = %s AND last_active_at > NOW() - INTERVAL '5 minutes'",
-                (request.session_id,)
-            )
-            result = cursor.fetchone()
-            
-            if not result:
-                # Session expired or doesn't exist, clean up
-                cursor.execute(
-                    "DELETE FROM seller_sessions WHERE session_id = %s",
-                    (request.session_id,)
-                )
-                conn.commit()
-                return customer_db_pb2.ValidateSellerSessionResponse(
-                    valid=False,
-                    error_message="Session expired or invalid"
-                )
-            
+        """Validate seller session and check timeout against the local session table"""
+        self.await_min_seq(request, context)
+        seller_id = self.sessions.validate(request.session_id, "seller")
+        if seller_id is None:
             return customer_db_pb2.ValidateSellerSessionResponse(
-                valid=True,
-                seller_id=result["seller_id"]
+                valid=False,
+                error_message="Session expired or invalid"
             )
-        except Exception as e:
-            print(f"Error in ValidateSellerSession: {e}")
+        return customer_db_pb2.ValidateSellerSessionResponse(
+            valid=True,
+            seller_id=seller_id
+        )
+
+    def ValidateAndTouchSellerSession(self, request, context):
+        """ValidateSellerSession and UpdateSellerSessionTimestamp in one call"""
+        self.await_min_seq(request, context)
+        seller_id = self.sessions.validate_and_touch(request.session_id, "seller")
+        if seller_id is None:
             return customer_db_pb2.ValidateSellerSessionResponse(
                 valid=False,
-                error_message=str(e)
+                error_message="Session expired or invalid"
             )
-        finally:
-            self.db_pool.putconn(conn)
+        return customer_db_pb2.ValidateSellerSessionResponse(
+            valid=True,
+            seller_id=seller_id
+        )
 
     def UpdateSellerSessionTimestamp(self, request, context):
-        """Update session timestamp to keep it alive"""
-        result = self.abp.submit_write("UpdateSellerSessionTimestamp", {
-            "session_id": request.session_id,
-        })
-
+        """Keep the session alive; replicated later, coalesced with other touches"""
+        self.await_min_seq(request, context)
         return customer_db_pb2.UpdateSellerSessionTimestampResponse(
-            success=result["success"],
+            success=self.sessions.touch(request.session_id, "seller"),
         )
-        
+
     def UpdateSellerFeedback(self, request, context):
         result = self.abp.submit_write("UpdateSellerFeedback", {
             "seller_id": request.seller_id,
@@ -193,6 +222,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.UpdateSellerFeedbackResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     # Buyer Operations
@@ -209,6 +239,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             buyer_id=result.get("buyer_id", 0),
             saved_cart_id=result.get("saved_cart_id", ""),
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def BuyerLogin(self, request, context):
@@ -219,6 +250,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             "password":       request.password,
             "session_id":     session_id,
             "active_cart_id": active_cart_id,
+            "logged_in_at":   time.time(),
         })
         if not result["success"]:
             return customer_db_pb2.BuyerLoginResponse(
@@ -236,6 +268,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             buyer_id=result["buyer_id"],
             username=result["username"],
             saved_cart_items=cart_items,
+            seq=write_seq(result),
         )
 
     def BuyerLogout(self, request, context):
@@ -245,55 +278,59 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.LogoutResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def ValidateBuyerSession(self, request, context):
-        """Validate buyer session and check timeout"""
-        conn = self.db_pool.getconn()
-        try:
-            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-            cursor.execute(
-                "SELECT buyer_id FROM buyer_sessions "
-                "WHERE session_id = %s AND last_active_at > NOW() - INTERVAL '5 minutes'",
-                (request.session_id,)
-            )
-            result = cursor.fetchone()
-            
-            if not result:
-                # Session expired, clean up
-                cursor.execute(
-                    "DELETE FROM buyer_sessions WHERE session_id = %s",
-                    (request.session_id,)
-                )
-                conn.commit()
-                return customer_db_pb2.ValidateBuyerSessionResponse(
-                    valid=False,
-                    error_message="Session expired or invalid"
-                )
-            
+        """Validate buyer session and check timeout against the local session table"""
+        self.await_min_seq(request, context)
+        buyer_id = self.sessions.validate(request.session_id, "buyer")
+        if buyer_id is None:
             return customer_db_pb2.ValidateBuyerSessionResponse(
-                valid=True,
-                buyer_id=result["buyer_id"]
+                valid=False,
+                error_message="Session expired or invalid"
             )
-        except Exception as e:
-            print(f"Error in ValidateBuyerSession: {e}")
+        return customer_db_pb2.ValidateBuyerSessionResponse(
+            valid=True,
+            buyer_id=buyer_id
+        )
+
+    def ValidateAndTouchBuyerSession(self, request, context):
+        """ValidateBuyerSession and UpdateBuyerSessionTimestamp in one call"""
+        self.await_min_seq(request, context)
+        buyer_id = self.sessions.validate_and_touch(request.session_id, "buyer")
+        if buyer_id is None:
             return customer_db_pb2.ValidateBuyerSessionResponse(
                 valid=False,
-                error_message=str(e)
+                error_message="Session expired or invalid"
             )
-        finally:
-            self.db_pool.putconn(conn)
+        return customer_db_pb2.ValidateBuyerSessionResponse(
+            valid=True,
+            buyer_id=buyer_id
+        )
 
     def UpdateBuyerSessionTimestamp(self, request, context):
-        """Update buyer session timestamp"""
-        result = self.abp.submit_write("UpdateBuyerSessionTimestamp", {
-            "session_id": request.session_id,
-        })
-
+        """Keep the session alive; replicated later, coalesced with other touches"""
+        self.await_min_seq(request, context)
         return customer_db_pb2.UpdateBuyerSessionTimestampResponse(
-            success=result["success"],
+            success=self.sessions.touch(request.session_id, "buyer"),
         )
 
+    def WatchSessionInvalidations(self, request, context):
+        """Stream session_ids as they are logged out or expire, until the client goes away"""
+        q = self.sessions.subscribe()
+        try:
+            # Tells the subscriber it will not miss anything from here on
+            yield customer_db_pb2.SessionInvalidation(session_id="")
+            while context.is_active():
+                try:
+                    session_id = q.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                yield customer_db_pb2.SessionInvalidation(session_id=session_id)
+        finally:
+            self.sessions.unsubscribe(q)
+
     def InsertTransaction(self, request, context):
         result = self.abp.submit_write("InsertTransaction", {
             "buyer_id":        request.buyer_id,
@@ -308,6 +345,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             success=result["success"],
             transaction_id=result.get("transaction_id", 0),
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def InsertPurchase(self, request, context):
@@ -320,10 +358,12 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
             success=result["success"],
             purchase_id=result.get("purchase_id", 0),
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def GetBuyerPurchases(self, request, context):
         """Insert purchase"""
+        self.await_min_seq(request, context)
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -367,6 +407,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.AddItemToCartResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def RemoveItemFromCart(self, request, context):
@@ -378,10 +419,12 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.RemoveItemFromCartResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def GetActiveCart(self, request, context):
         """Get active cart items"""
+        self.await_min_seq(request, context)
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -411,6 +454,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
 
     def GetSavedCart(self, request, context):
         """Get saved cart items"""
+        self.await_min_seq(request, context)
         conn = self.db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -447,6 +491,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.SaveCartResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
     def ClearCart(self, request, context):
@@ -458,6 +503,7 @@ class CustomerDBServicer(customer_db_pb2_grpc.CustomerDBServiceServicer):
         return customer_db_pb2.ClearCartResponse(
             success=result["success"],
             error_message=result.get("error_message", ""),
+            seq=write_seq(result),
         )
 
 def serve():
@@ -112,3 +112,10 @@ VALUES
 --   ('Bob Johnson', 'password3', 0),
 --   ('Alice Williams', 'password4', 0),
 --   ('Charlie Brown', 'password5', 0);
+
+-- ABP state: highest global sequence number whose write has been applied here.
+-- Advanced in the same transaction as the writes it covers.
+CREATE TABLE abp_state (
+  applied_index BIGINT NOT NULL
+);
+INSERT INTO abp_state (applied_index) VALUES (-1);
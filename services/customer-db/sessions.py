@@ -0,0 +1,237 @@
+"""
+Replica-local session liveness for customer-db.
+
+Session validation used to be a SQL read and every keep-alive a replicated
+ABP write, so each buyer/seller API call paid a consensus round just to bump
+last_active_at. SessionTable keeps (user id, last activity) per session in
+memory instead:
+
+  - validate() is a dict lookup; a miss falls back to one SQL read
+  - validate_and_touch() does both in one lookup, for the combined RPC
+  - touch() only records the activity locally. Once a session's replicated
+    activity is more than TOUCH_REPLICATE_INTERVAL old, it is queued, and
+    the flusher thread replicates every queued session in one TouchSessions
+    write, with the timestamp in the args so all replicas store the same value
+  - logins, logouts and replicated touches reach every replica's table as
+    their ABP writes are applied (SQLExecutor listeners)
+  - an ExpireSessions write deletes sessions idle past the timeout about
+    every SWEEP_INTERVAL; validate() rejects them locally before that
+    happens. Any node may replicate it (the cutoff makes a repeat
+    harmless), and node k waits k/n of an interval longer than node 0
+    before doing so, so the lowest-numbered live node sweeps and the
+    others only step in when its sweeps stop arriving
+  - logged out and expired session ids are pushed to subscribers (the
+    buyer/seller servers' session caches) via WatchSessionInvalidations
+
+Replicas other than the one a client talks to therefore see its activity at
+most TOUCH_REPLICATE_INTERVAL late, which only matters for sessions within
+that long of timing out.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+from psycopg2 import extras
+
+logger = logging.getLogger(__name__)
+
+SESSION_TIMEOUT = 300.0
+# How stale a session's replicated activity may get before a touch is replicated
+TOUCH_REPLICATE_INTERVAL = 60.0
+# How often queued touches are flushed and expired sessions swept
+FLUSH_INTERVAL = 1.0
+SWEEP_INTERVAL = 60.0
+
+# session kind -> (table, user id column)
+_TABLES = {"seller": ("seller_sessions", "seller_id"), "buyer": ("buyer_sessions", "buyer_id")}
+
+
+class _Session:
+    __slots__ = ("kind", "user_id", "replicated_active", "local_active", "touch_queued")
+
+    def __init__(self, kind: str, user_id: int, replicated_active: float):
+        self.kind = kind
+        self.user_id = user_id
+        # Last activity every replica knows about, and the last seen here
+        self.replicated_active = replicated_active
+        self.local_active = replicated_active
+        self.touch_queued = False
+
+    def last_active(self) -> float:
+        return max(self.replicated_active, self.local_active)
+
+
+class SessionTable:
+    def __init__(self, abp, db_pool):
+        # abp     : ABPNode used to replicate touches and expiry
+        # db_pool : psycopg2 connection pool, read on a cache miss
+        self.abp = abp
+        self.db_pool = db_pool
+        self.lock = threading.Lock()
+        # session_id -> _Session
+        self.sessions: dict = {}
+        # session_ids whose touch has not been replicated yet
+        self.touch_queue: list = []
+        # One queue of invalidated session_ids per WatchSessionInvalidations stream
+        self.subscribers: list = []
+        # Cutoff of the latest ExpireSessions applied or submitted here
+        self.expired_before = time.time() - SESSION_TIMEOUT
+        # Bumped by every applied logout and expiry, so a _load that read its
+        # row before one of them can tell. Logouts applied while loads are in
+        # flight leave a tombstone (session_id -> generation); the latest
+        # expiry is kept as (generation, cutoff).
+        self.generation = 0
+        self.logged_out: dict = {}
+        self.expired_at = (0, 0.0)
+        self.loads_in_flight = 0
+        abp.executor.add_listener(self.on_applied)
+
+    def start(self):
+        threading.Thread(target=self.flush_thread, daemon=True, name="session-flush").start()
+
+    def validate(self, session_id: str, kind: str):
+        """Returns the session's user id, or None if it is unknown, expired or of another kind"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+        if session is None:
+            session = self._load(session_id, kind)
+            if session is None:
+                return None
+        if session.kind != kind or time.time() - session.last_active() > SESSION_TIMEOUT:
+            return None
+        return session.user_id
+
+    def touch(self, session_id: str, kind: str) -> bool:
+        """Record activity locally, queueing it for replication if the replicated value is stale"""
+        now = time.time()
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None or session.kind != kind or now - session.last_active() > SESSION_TIMEOUT:
+                return False
+            session.local_active = now
+            if now - session.replicated_active >= TOUCH_REPLICATE_INTERVAL and not session.touch_queued:
+                session.touch_queued = True
+                self.touch_queue.append(session_id)
+        return True
+
+    def validate_and_touch(self, session_id: str, kind: str):
+        """validate(), then touch() if the session is valid. Returns the user id or None."""
+        user_id = self.validate(session_id, kind)
+        if user_id is not None and not self.touch(session_id, kind):
+            # Expired or logged out between the two
+            return None
+        return user_id
+
+    def _load(self, session_id: str, kind: str):
+        """Read a session this replica has not seen since it started"""
+        table, user_col = _TABLES[kind]
+        with self.lock:
+            generation = self.generation
+            self.loads_in_flight += 1
+        row = None
+        conn = self.db_pool.getconn()
+        try:
+            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor.execute(
+                f"SELECT {user_col} AS user_id, EXTRACT(EPOCH FROM last_active_at) AS last_active "
+                f"FROM {table} WHERE session_id = %s",
+                (session_id,)
+            )
+            row = cursor.fetchone()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error("Loading session %s failed: %s", session_id, e)
+        finally:
+            self.db_pool.putconn(conn)
+        with self.lock:
+            self.loads_in_flight -= 1
+            logged_out = self.logged_out.get(session_id, 0) > generation
+            expired_gen, cutoff = self.expired_at
+            if not self.loads_in_flight:
+                self.logged_out.clear()
+            if row is None:
+                return None
+            session = _Session(kind, row["user_id"], float(row["last_active"]))
+            if logged_out or (expired_gen > generation and session.replicated_active < cutoff):
+                # Deleted after it was read
+                return None
+            # A login or touch applied meanwhile wins
+            return self.sessions.setdefault(session_id, session)
+
+    def subscribe(self) -> queue.Queue:
+        """Queue that receives every session_id invalidated from now on"""
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self.lock:
+            self.subscribers.remove(q)
+
+    def _publish(self, session_ids: list):
+        """Called inside the lock."""
+        for q in self.subscribers:
+            for session_id in session_ids:
+                q.put(session_id)
+
+    def on_applied(self, method: str, args: dict, result: dict):
+        """SQLExecutor listener: mirror applied session writes. Runs on the delivery path."""
+        with self.lock:
+            if method in ("SellerLogin", "BuyerLogin"):
+                kind = "seller" if method == "SellerLogin" else "buyer"
+                user_id = result["seller_id" if kind == "seller" else "buyer_id"]
+                self.sessions[args["session_id"]] = _Session(kind, user_id,
+                                                          args.get("logged_in_at", time.time()))
+            elif method in ("SellerLogout", "BuyerLogout"):
+                self.generation += 1
+                if self.loads_in_flight:
+                    self.logged_out[args["session_id"]] = self.generation
+                self.sessions.pop(args["session_id"], None)
+                self._publish([args["session_id"]])
+            elif method == "TouchSessions":
+                for session_id, touched_at in args["touches"]:
+                    session = self.sessions.get(session_id)
+                    if session is not None:
+                        session.replicated_active = max(session.replicated_active, touched_at)
+            elif method == "ExpireSessions":
+                cutoff = args["cutoff"]
+                self.expired_before = max(self.expired_before, cutoff)
+                self.generation += 1
+                self.expired_at = (self.generation, max(self.expired_at[1], cutoff))
+                expired = [s for s, session in self.sessions.items()
+                           if session.replicated_active < cutoff]
+                for session_id in expired:
+                    del self.sessions[session_id]
+                self._publish(expired)
+
+    def flush_thread(self):
+        # How old the last sweep must be before this node sweeps
+        sweep_after = SWEEP_INTERVAL * (1 + self.abp.node_id / self.abp.n)
+        while True:
+            # Touches queued meanwhile are coalesced into one write
+            time.sleep(FLUSH_INTERVAL)
+            cutoff = time.time() - SESSION_TIMEOUT
+            with self.lock:
+                touches = self._take_touches()
+                sweep = cutoff - self.expired_before >= sweep_after
+                if sweep:
+                    self.expired_before = cutoff
+            if touches:
+                self.abp.submit_write("TouchSessions", {"touches": touches})
+            if sweep:
+                self.abp.submit_write("ExpireSessions", {"cutoff": cutoff})
+
+    def _take_touches(self) -> list:
+        """[session_id, last activity] for every queued session. Called inside the lock."""
+        touches = []
+        for session_id in self.touch_queue:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.touch_queued = False
+                touches.append([session_id, session.local_active])
+        self.touch_queue = []
+        return touches
@@ -0,0 +1,127 @@
+"""
+Benchmark: ranked keyword search over a synthetic catalog.
+
+Builds a SearchIndex over --items synthetic products (names and keywords
+drawn from a Zipf-like vocabulary, spread over --categories categories),
+then reports
+  1. index build time and resident memory growth
+  2. p50/p99 latency of top-k ranked searches with exact, prefix and
+     misspelled query terms
+  3. the same for a linear scan that counts keyword overlaps, as
+     SearchItems' `keywords && %s` filter does, plus sorting by matches
+
+Run from services/product-db:
+  python benchmarks/search_index.py --items 1000000 --queries 2000
+"""
+import argparse
+import itertools
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search_index import SearchIndex, tokenize
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        # Keywords are VARCHAR(8)
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 8))))
+    return sorted(words)
+
+
+def make_catalog(num_items: int, num_categories: int, vocabulary: list, rng: random.Random):
+    # Low ranks are drawn far more often, like real product vocabularies
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for item_id in range(1, num_items + 1):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=6)
+        yield (item_id, rng.randrange(num_categories), " ".join(words[:2]), words[2:],
+               rng.randint(0, 50), rng.randint(0, 50))
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1:]
+
+
+def make_queries(num_queries: int, num_categories: int, vocabulary: list, rng: random.Random) -> list:
+    queries = []
+    for _ in range(num_queries):
+        words = rng.sample(vocabulary[:2000], 2)
+        kind = rng.choice(["exact", "prefix", "typo"])
+        if kind == "prefix":
+            words = [w[:max(3, len(w) - 2)] for w in words]
+        elif kind == "typo":
+            words = [misspell(w, rng) if len(w) >= 4 else w for w in words]
+        queries.append((rng.randrange(num_categories), words))
+    return queries
+
+
+def percentiles(latencies: list) -> str:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f"p50 {statistics.median(latencies) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms"
+
+
+def linear_scan(catalog: list, category: int, keywords: list, k: int) -> list:
+    """Keyword overlap count over every item in category, as a SQL scan would rank it"""
+    wanted = set(keywords)
+    scored = []
+    for item_id, item_category, name, item_keywords, _, _ in catalog:
+        if item_category == category:
+            matches = len(wanted.intersection(item_keywords)) + len(wanted.intersection(tokenize(name)))
+            if matches:
+                scored.append((matches, item_id))
+    scored.sort(reverse=True)
+    return scored[:k]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ranked keyword search benchmark")
+    parser.add_argument("--items", type=int, default=1_000_000, help="Catalog size")
+    parser.add_argument("--categories", type=int, default=10, help="Number of categories")
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="Distinct words")
+    parser.add_argument("--queries", type=int, default=2000, help="Searches to time")
+    parser.add_argument("--top-k", type=int, default=20, help="Results per search")
+    parser.add_argument("--scan-queries", type=int, default=20,
+                        help="Searches to time with the linear scan (0 to skip)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    catalog = list(make_catalog(args.items, args.categories, vocabulary, rng))
+
+    index = SearchIndex()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.monotonic()
+    for item in catalog:
+        index.add(*item)
+    elapsed = time.monotonic() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"indexed {args.items} items in {elapsed:.1f} s "
+          f"({args.items / elapsed:.0f} items/sec), +{(rss_after - rss_before) / 1024:.0f} MB peak RSS")
+
+    queries = make_queries(args.queries, args.categories, vocabulary, rng)
+    latencies, hits = [], 0
+    for category, keywords in queries:
+        start = time.perf_counter()
+        results = index.search(category, keywords, args.top_k)
+        latencies.append(time.perf_counter() - start)
+        hits += bool(results)
+    print(f"ranked top-{args.top_k}: {percentiles(latencies)} "
+          f"({hits}/{len(queries)} queries with results)")
+
+    if args.scan_queries:
+        latencies = []
+        for category, keywords in queries[:args.scan_queries]:
+            start = time.perf_counter()
+            linear_scan(catalog, category, keywords, args.top_k)
+            latencies.append(time.perf_counter() - start)
+        print(f"linear scan top-{args.top_k} (exact only): {percentiles(latencies)}")
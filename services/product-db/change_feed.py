@@ -0,0 +1,85 @@
+"""
+Change-data-capture feed of the product-db Raft state machine.
+
+RaftManager's replicated methods publish (raft_index, item_id, changed
+fields) for every row they change, once the change is committed to
+PostgreSQL. Raft indexes are the same on every replica and every replica
+applies every entry, so a client can watch whichever node it is connected
+to and resume on another one.
+
+The last RETAINED_CHANGES events are kept so a client that reconnects with
+the raft_index it last saw gets the events it missed. item_id 0 (ALL_ITEMS)
+is the sync marker: it follows any replayed events when a stream starts,
+and is published when a snapshot restore replaces the table. With reset
+set, the client cannot have seen every change since its index and must
+drop whatever it derived from earlier events.
+"""
+
+import collections
+import queue
+import threading
+
+ALL_ITEMS = 0
+RETAINED_CHANGES = 10000
+
+
+class Change:
+    __slots__ = ("raft_index", "item_id", "fields", "reset")
+
+    def __init__(self, raft_index: int, item_id: int, fields: tuple = (), reset: bool = False):
+        self.raft_index = raft_index
+        self.item_id = item_id
+        self.fields = fields
+        self.reset = reset
+
+
+class ChangeFeed:
+    def __init__(self, retained: int = RETAINED_CHANGES):
+        self.lock = threading.Lock()
+        # One queue of Changes per WatchProducts stream
+        self.subscribers: list = []
+        self.history = collections.deque(maxlen=retained)
+        # Changes up to this index can no longer be replayed
+        self.truncated_through = 0
+        self.last_index = 0
+
+    def subscribe(self, from_index: int = 0) -> queue.Queue:
+        """
+        Queue that receives the changes after from_index that are still
+        retained, a sync marker, then every change from now on. from_index 0
+        subscribes from now, with a reset marker.
+        """
+        q = queue.Queue()
+        with self.lock:
+            resumable = from_index > 0 and from_index >= self.truncated_through
+            if resumable:
+                for change in self.history:
+                    if change.raft_index > from_index:
+                        q.put(change)
+            q.put(Change(self.last_index, ALL_ITEMS, reset=not resumable))
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self.lock:
+            self.subscribers.remove(q)
+
+    def publish(self, raft_index: int, item_id: int, fields: tuple):
+        self._append(Change(raft_index, item_id, fields))
+
+    def reset(self, raft_index: int):
+        """The whole table was replaced at raft_index; earlier changes mean nothing now"""
+        with self.lock:
+            self.history.clear()
+            self.truncated_through = raft_index
+        self._append(Change(raft_index, ALL_ITEMS, reset=True))
+
+    def _append(self, change: Change):
+        with self.lock:
+            if len(self.history) == self.history.maxlen:
+                self.truncated_through = self.history[0].raft_index
+            if change.item_id != ALL_ITEMS:
+                self.history.append(change)
+            self.last_index = max(self.last_index, change.raft_index)
+            for q in self.subscribers:
+                q.put(change)
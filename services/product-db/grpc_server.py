@@ -3,7 +3,9 @@ gRPC server for Product Database
 Wraps PostgreSQL operations with gRPC service
 """
 import os
+import queue
 import sys
+import uuid
 from concurrent import futures
 
 import grpc
@@ -16,9 +18,66 @@ sys.path.insert(0, '/app/generated')
 import product_db_pb2
 import product_db_pb2_grpc
 from pysyncobj import SyncObj, SyncObjConf, replicated
+from change_feed import ChangeFeed
+from search_index import SearchIndex
 
 _db_pool = None
 
+# Rows a SearchItemsStream cursor fetches from PostgreSQL per round trip
+SEARCH_FETCH_SIZE = 500
+# Item fields a newly registered item reports as changed
+_ITEM_FIELDS = ("item_id", "seller_id", "item_name", "category", "keywords", "condition",
+                "sale_price", "quantity", "thumbs_up", "thumbs_down")
+# RankedSearchItems results when the request does not set top_k, and the cap
+DEFAULT_TOP_K = 20
+MAX_TOP_K = 1000
+# How long a read waits for this replica to apply its min_index (or, for a
+# linearizable read, the leader's commit index), and how often it checks
+READ_INDEX_WAIT = 2.0
+READ_INDEX_POLL = 0.005
+
+_ITEM_COLUMNS = (
+    "item_id, seller_id, item_name, category, keywords, condition, "
+    "sale_price::float, quantity, thumbs_up, thumbs_down"
+)
+
+
+def _search_query(request):
+    """
+    SQL and parameters for a SearchItemsRequest, ordered by item_id.
+    page_token is the last item_id of the previous page.
+    Raises ValueError on a malformed page_token.
+    """
+    after = int(request.page_token) if request.page_token else 0
+    query = f"SELECT {_ITEM_COLUMNS} FROM products WHERE category = %s AND item_id > %s"
+    params = [request.category, after]
+    if request.keywords:
+        # Search with keywords using array overlap operator
+        query += " AND keywords && %s::varchar[]"
+        params.append(list(request.keywords))
+    query += " ORDER BY item_id"
+    if request.limit > 0:
+        query += " LIMIT %s"
+        params.append(request.limit)
+    return query, params
+
+
+def _to_item(row):
+    """Convert a products row to an Item message"""
+    return product_db_pb2.Item(
+        item_id=row["item_id"],
+        seller_id=row["seller_id"],
+        item_name=row["item_name"],
+        category=row["category"],
+        keywords=row["keywords"] or [],
+        condition=row["condition"],
+        sale_price=row["sale_price"],
+        quantity=row["quantity"],
+        thumbs_up=row["thumbs_up"],
+        thumbs_down=row["thumbs_down"]
+    )
+
+
 class RaftManager(SyncObj):
     def __init__(self, self_addr, partners):
         # Create PostgreSQL connection pool — retry until PostgreSQL is fully up
@@ -56,6 +115,17 @@ class RaftManager(SyncObj):
         finally:
             _db_pool.putconn(conn)
 
+        # Keyword index, maintained by the replicated methods below
+        self.search_index = SearchIndex()
+        # Applied changes, streamed to WatchProducts clients
+        self.changes = ChangeFeed()
+        # Read barrier rounds started and finished, and the outcome of the
+        # last finished one (see confirm_read)
+        self.barrier_cv = threading.Condition()
+        self.barriers_started = 0
+        self.barriers_finished = 0
+        self.barrier_index = None
+
         # Create a config that cleans the log every 500 entries
         conf = SyncObjConf(
             entriesFinishedSize=500, 
@@ -64,6 +134,60 @@ class RaftManager(SyncObj):
         super(RaftManager, self).__init__(self_addr, partners, conf=conf)
         print("Initializing Product DB gRPC server...") 
     
+    def _applying_index(self):
+        """Raft index of the entry being applied; only valid inside a @replicated method"""
+        # PySyncObj advances raftLastApplied once the entry's method returns
+        return self.raftLastApplied + 1
+
+    def confirm_read(self, timeout: float = READ_INDEX_WAIT):
+        """
+        Raft index a linearizable read must wait for, or None if it could not
+        be confirmed within timeout. A no-op read_barrier entry is committed
+        through the log like a write, so a majority accepted the current
+        leader after the read arrived, and its index covers every write
+        completed before the read.
+        Reads that arrive while a barrier is in flight share the next one, so
+        at most one barrier is in flight per replica.
+        """
+        deadline = time.monotonic() + timeout
+        with self.barrier_cv:
+            # The first round started after this read arrived
+            wanted = self.barriers_started + 1
+            while self.barriers_finished < wanted:
+                if self.barriers_started == self.barriers_finished:
+                    self.barriers_started = wanted
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.barrier_cv.wait(remaining)
+            else:
+                return self.barrier_index
+
+        try:
+            index = self.read_barrier(sync=True, timeout=max(deadline - time.monotonic(), 0.01))
+        except Exception as e:
+            print(f"Read barrier failed: {e}")
+            index = None
+        with self.barrier_cv:
+            self.barriers_finished = wanted
+            self.barrier_index = index
+            self.barrier_cv.notify_all()
+        return index
+
+    def wait_applied(self, raft_index: int, timeout: float = READ_INDEX_WAIT) -> bool:
+        """
+        Block until this replica has applied raft_index. Returns False if it
+        has not within timeout. PySyncObj has no hook after an entry is
+        applied, so raftLastApplied is polled.
+        """
+        deadline = time.monotonic() + timeout
+        while self.raftLastApplied < raft_index:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(READ_INDEX_POLL)
+        return True
+
     def getSnapshot(self):
         """Export products table as JSON for Raft snapshot."""
         conn = _db_pool.getconn()
@@ -97,6 +221,7 @@ class RaftManager(SyncObj):
         try:
             cursor = conn.cursor()
             cursor.execute("TRUNCATE TABLE products RESTART IDENTITY")
+            self.search_index.reset()
             for row in data["rows"]:
                 cursor.execute(
                     "INSERT INTO products (item_id, seller_id, item_name, category, keywords, "
@@ -106,8 +231,11 @@ class RaftManager(SyncObj):
                     row["keywords"], row["condition"], row["sale_price"],
                     row["quantity"], row["thumbs_up"], row["thumbs_down"])
                 )
+                self.search_index.add(row["item_id"], row["category"], row["item_name"],
+                                      row["keywords"] or [], row["thumbs_up"], row["thumbs_down"])
             cursor.execute("SELECT setval('products_item_id_seq', %s, true)", (data["seq"],))
             conn.commit()
+            self.changes.reset(self.raftLastApplied)
             print(f"setSnapshot: restored {len(data['rows'])} rows")
         except Exception as e:
             conn.rollback()
@@ -115,6 +243,11 @@ class RaftManager(SyncObj):
         finally:
             _db_pool.putconn(conn)
 
+    @replicated
+    def read_barrier(self):
+        """No-op entry committed to confirm a linearizable read (see confirm_read)"""
+        return self._applying_index()
+
     @replicated
     def sync_update_item_price(self, item_id, seller_id, new_price):
         """
@@ -130,8 +263,10 @@ class RaftManager(SyncObj):
             )
             count = cursor.rowcount
             conn.commit()
+            if count > 0:
+                self.changes.publish(self._applying_index(), item_id, ("sale_price",))
             # We return the rowcount so the Leader knows if it actually found the item
-            return {"success": count > 0, "rows": count}
+            return {"success": count > 0, "rows": count, "raft_index": self._applying_index()}
         except Exception as e:
             conn.rollback()
             return {"success": False, "error": str(e)}
@@ -153,7 +288,9 @@ class RaftManager(SyncObj):
             # Sync the sequence so any future leader uses the correct next ID
             cursor.execute("SELECT setval('products_item_id_seq', %s, true)", (item_id,))
             conn.commit()
-            return {"success": True, "item_id": result["item_id"]}
+            self.search_index.add(item_id, category, item_name, list(keywords))
+            self.changes.publish(self._applying_index(), item_id, _ITEM_FIELDS)
+            return {"success": True, "item_id": result["item_id"], "raft_index": self._applying_index()}
         except Exception as e:
             conn.rollback()
             return {"success": False, "error": str(e)}
@@ -180,7 +317,53 @@ class RaftManager(SyncObj):
                 (new_quantity, item_id, seller_id)
             )
             conn.commit()
-            return {"success": True, "new_quantity": new_quantity}
+            self.changes.publish(self._applying_index(), item_id, ("quantity",))
+            return {"success": True, "new_quantity": new_quantity, "raft_index": self._applying_index()}
+        except Exception as e:
+            conn.rollback()
+            return {"success": False, "error": str(e)}
+        finally:
+            _db_pool.putconn(conn)
+
+    @replicated
+    def sync_update_item_quantities(self, changes):
+        """
+        Apply [(item_id, seller_id, quantity_change), ...] in one transaction.
+        Nothing is changed if any item is missing, belongs to another seller
+        or would go negative.
+        """
+        conn = _db_pool.getconn()
+        try:
+            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor.execute(
+                "SELECT item_id, seller_id, quantity FROM products WHERE item_id = ANY(%s)",
+                (list({item_id for item_id, _, _ in changes}),)
+            )
+            rows = {row["item_id"]: row for row in cursor.fetchall()}
+            quantities = {}
+            new_quantities = []
+            for item_id, seller_id, quantity_change in changes:
+                row = rows.get(item_id)
+                if not row or row["seller_id"] != seller_id:
+                    return {"success": False, "item_id": item_id,
+                            "error": "Item not found or does not belong to seller"}
+                # The same item may appear more than once
+                quantities[item_id] = quantities.get(item_id, row["quantity"]) - quantity_change
+                if quantities[item_id] < 0:
+                    return {"success": False, "item_id": item_id,
+                            "error": "Available units cannot be negative"}
+                new_quantities.append(quantities[item_id])
+            extras.execute_values(
+                cursor,
+                "UPDATE products SET quantity = v.quantity FROM (VALUES %s) AS v (item_id, quantity) "
+                "WHERE products.item_id = v.item_id",
+                list(quantities.items())
+            )
+            conn.commit()
+            raft_index = self._applying_index()
+            for item_id in quantities:
+                self.changes.publish(raft_index, item_id, ("quantity",))
+            return {"success": True, "new_quantities": new_quantities, "raft_index": raft_index}
         except Exception as e:
             conn.rollback()
             return {"success": False, "error": str(e)}
@@ -203,7 +386,10 @@ class RaftManager(SyncObj):
                     (item_id,)
                 )
             conn.commit()
-            return {"success": True}
+            self.search_index.record_feedback(item_id, thumbs_up)
+            self.changes.publish(self._applying_index(), item_id,
+                                 ("thumbs_up",) if thumbs_up else ("thumbs_down",))
+            return {"success": True, "raft_index": self._applying_index()}
         except Exception as e:
             conn.rollback()
             return {"success": False, "error": str(e)}
@@ -215,6 +401,24 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
     def __init__(self, raft_manager):
         self.raft = raft_manager
 
+    def await_read_index(self, request, context):
+        """
+        Hold a read until this replica has applied request.min_index. A
+        linearizable read first commits a read barrier through the log and
+        waits for its index. Otherwise the call fails with UNAVAILABLE,
+        which the client retries on another replica.
+        """
+        if request.linearizable:
+            barrier_index = self.raft.confirm_read()
+            if barrier_index is None:
+                context.abort(grpc.StatusCode.UNAVAILABLE, "Could not commit a read barrier")
+            read_index = max(request.min_index, barrier_index)
+        else:
+            read_index = request.min_index
+        if read_index and not self.raft.wait_applied(read_index):
+            context.abort(grpc.StatusCode.UNAVAILABLE,
+                          f"Replica has not applied index {read_index} yet")
+
     def RegisterItem(self, request, context):
         """Register a new item for sale"""
         if not self.raft.isReady():
@@ -241,7 +445,9 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
                 success=False,
                 error_message=res.get("error", "Registration failed") if res else "Timeout"
             )
-        return product_db_pb2.RegisterItemResponse(success=True, item_id=res["item_id"])
+        return product_db_pb2.RegisterItemResponse(
+            success=True, item_id=res["item_id"], raft_index=res["raft_index"]
+        )
 
     def UpdateItemPrice(self, request, context):
         """Update the price of an item"""
@@ -251,7 +457,9 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
         
         # This call handles the replication and blocks until consensus
         res = self.raft.sync_update_item_price(request.item_id, request.seller_id, request.new_price, sync=True, timeout=10)
-        return product_db_pb2.UpdateItemPriceResponse(success=res.get("success", False))
+        return product_db_pb2.UpdateItemPriceResponse(
+            success=res.get("success", False), raft_index=res.get("raft_index", 0)
+        )
 
     def UpdateItemQuantity(self, request, context):
         """Update the quantity of an item"""
@@ -271,7 +479,31 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
                 success=False, error_message=res.get("error", "Update failed")
             )
         return product_db_pb2.UpdateItemQuantityResponse(
-            success=True, new_quantity=res["new_quantity"]
+            success=True, new_quantity=res["new_quantity"], raft_index=res["raft_index"]
+        )
+
+    def UpdateItemQuantities(self, request, context):
+        """Update the quantities of several items atomically, in one Raft entry"""
+        if not self.raft.isReady():
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Cluster not ready")
+
+        changes = [(c.item_id, c.seller_id, c.quantity_change) for c in request.changes]
+        if not changes:
+            return product_db_pb2.UpdateItemQuantitiesResponse(success=True)
+
+        res = self.raft.sync_update_item_quantities(changes, sync=True, timeout=10)
+        if not res:
+            return product_db_pb2.UpdateItemQuantitiesResponse(
+                success=False, error_message="Timeout waiting for consensus"
+            )
+        if not res.get("success"):
+            return product_db_pb2.UpdateItemQuantitiesResponse(
+                success=False,
+                error_message=res.get("error", "Update failed"),
+                failed_item_id=res.get("item_id", 0)
+            )
+        return product_db_pb2.UpdateItemQuantitiesResponse(
+            success=True, new_quantities=res["new_quantities"], raft_index=res["raft_index"]
         )
 
     def GetItemsBySeller(self, request, context):
@@ -279,6 +511,7 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
         # Wait for Raft to be ready (election finished)
         if not self.raft.isReady():
             context.abort(grpc.StatusCode.UNAVAILABLE, "Cluster not ready")
+        self.await_read_index(request, context)
         
         conn = _db_pool.getconn()
         try:
@@ -320,50 +553,35 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
             _db_pool.putconn(conn)
 
     def SearchItems(self, request, context):
-        """Search items by category and optional keywords"""
+        """Search items by category and optional keywords, one page at a time"""
+        self.await_read_index(request, context)
+        try:
+            query, params = _search_query(request)
+        except ValueError:
+            return product_db_pb2.SearchItemsResponse(
+                success=False,
+                error_message="Invalid page token"
+            )
+
         conn = _db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-            
-            if request.keywords:
-                # Search with keywords using array overlap operator
-                cursor.execute(
-                    "SELECT item_id, seller_id, item_name, category, keywords, condition, "
-                    "sale_price::float, quantity, thumbs_up, thumbs_down "
-                    "FROM products WHERE category = %s AND keywords && %s::varchar[]",
-                    (request.category, list(request.keywords))
-                )
-            else:
-                # Search by category only
-                cursor.execute(
-                    "SELECT item_id, seller_id, item_name, category, keywords, condition, "
-                    "sale_price::float, quantity, thumbs_up, thumbs_down "
-                    "FROM products WHERE category = %s",
-                    (request.category,)
-                )
-            
-            items = cursor.fetchall()
-            
-            product_list = []
-            for item in items:
-                product_list.append(product_db_pb2.Item(
-                    item_id=item["item_id"],
-                    seller_id=item["seller_id"],
-                    item_name=item["item_name"],
-                    category=item["category"],
-                    keywords=item["keywords"] or [],
-                    condition=item["condition"],
-                    sale_price=item["sale_price"],
-                    quantity=item["quantity"],
-                    thumbs_up=item["thumbs_up"],
-                    thumbs_down=item["thumbs_down"]
-                ))
-            
+            cursor.execute(query, params)
+            product_list = [_to_item(item) for item in cursor.fetchall()]
+            conn.commit()
+
+            # A full page may have more after it
+            next_page_token = ""
+            if request.limit > 0 and len(product_list) == request.limit:
+                next_page_token = str(product_list[-1].item_id)
+
             return product_db_pb2.SearchItemsResponse(
                 success=True,
-                items=product_list
+                items=product_list,
+                next_page_token=next_page_token
             )
         except Exception as e:
+            conn.rollback()
             print(f"Error in SearchItems: {e}")
             return product_db_pb2.SearchItemsResponse(
                 success=False,
@@ -372,8 +590,73 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
         finally:
             _db_pool.putconn(conn)
 
+    def SearchItemsStream(self, request, context):
+        """
+        Stream the items matching a search. Rows are read through a named
+        (server-side) cursor SEARCH_FETCH_SIZE at a time, so neither this
+        server nor the client holds the whole result.
+        """
+        self.await_read_index(request, context)
+        try:
+            query, params = _search_query(request)
+        except ValueError:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid page token")
+
+        conn = _db_pool.getconn()
+        try:
+            cursor = conn.cursor(name=f"search_{uuid.uuid4().hex}",
+                                 cursor_factory=extras.RealDictCursor)
+            cursor.itersize = SEARCH_FETCH_SIZE
+            cursor.execute(query, params)
+            for row in cursor:
+                yield _to_item(row)
+            cursor.close()
+        finally:
+            # Also closes the cursor if the client cancelled mid-stream
+            conn.rollback()
+            _db_pool.putconn(conn)
+
+    def RankedSearchItems(self, request, context):
+        """Search items by keyword relevance and feedback using the in-process index"""
+        self.await_read_index(request, context)
+        top_k = min(request.top_k or DEFAULT_TOP_K, MAX_TOP_K)
+        ranked = self.raft.search_index.search(request.category, list(request.keywords), top_k)
+        if not ranked:
+            return product_db_pb2.RankedSearchItemsResponse(success=True)
+
+        conn = _db_pool.getconn()
+        try:
+            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM products WHERE item_id = ANY(%s)",
+                ([item_id for item_id, _ in ranked],)
+            )
+            rows = {row["item_id"]: row for row in cursor.fetchall()}
+            conn.commit()
+
+            product_list, scores = [], []
+            for item_id, score in ranked:
+                if item_id in rows:
+                    product_list.append(_to_item(rows[item_id]))
+                    scores.append(score)
+            return product_db_pb2.RankedSearchItemsResponse(
+                success=True,
+                items=product_list,
+                scores=scores
+            )
+        except Exception as e:
+            conn.rollback()
+            print(f"Error in RankedSearchItems: {e}")
+            return product_db_pb2.RankedSearchItemsResponse(
+                success=False,
+                error_message=str(e)
+            )
+        finally:
+            _db_pool.putconn(conn)
+
     def GetItem(self, request, context):
         """Get details of a single item"""
+        self.await_read_index(request, context)
         conn = _db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -417,6 +700,32 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
         finally:
             _db_pool.putconn(conn)
 
+    def GetItems(self, request, context):
+        """Get details of several items in one query"""
+        self.await_read_index(request, context)
+        conn = _db_pool.getconn()
+        try:
+            cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+            cursor.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM products WHERE item_id = ANY(%s)",
+                (list(request.item_ids),)
+            )
+            product_list = [_to_item(item) for item in cursor.fetchall()]
+            conn.commit()
+            return product_db_pb2.GetItemsResponse(
+                success=True,
+                items=product_list
+            )
+        except Exception as e:
+            conn.rollback()
+            print(f"Error in GetItems: {e}")
+            return product_db_pb2.GetItemsResponse(
+                success=False,
+                error_message=str(e)
+            )
+        finally:
+            _db_pool.putconn(conn)
+
     def UpdateItemFeedback(self, request, context):
         """Update thumbs up/down for an item"""
         if not self.raft.isReady():
@@ -431,10 +740,11 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
                 success=False,
                 error_message=res.get("error", "Feedback update failed") if res else "Timeout"
             )
-        return product_db_pb2.UpdateItemFeedbackResponse(success=True)
+        return product_db_pb2.UpdateItemFeedbackResponse(success=True, raft_index=res["raft_index"])
 
     def GetItemQuantity(self, request, context):
         """Get the available quantity of an item"""
+        self.await_read_index(request, context)
         conn = _db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -465,6 +775,7 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
 
     def GetItemSeller(self, request, context):
         """Get the seller_id for an item"""
+        self.await_read_index(request, context)
         conn = _db_pool.getconn()
         try:
             cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -493,6 +804,39 @@ class ProductDBServicer(product_db_pb2_grpc.ProductDBServiceServicer):
         finally:
             _db_pool.putconn(conn)
 
+    def GetClusterStatus(self, request, context):
+        """This replica's view of the Raft cluster"""
+        status = self.raft.getStatus()
+        leader = status.get('leader')
+        return product_db_pb2.GetClusterStatusResponse(
+            self_node=str(status['self']),
+            leader=str(leader) if leader else "",
+            is_leader=status.get('state') == 2,
+            ready=self.raft.isReady(),
+            has_quorum=status.get('has_quorum', False),
+            last_applied=status.get('last_applied', 0),
+            commit_index=status.get('commit_idx', 0),
+            raft_term=status.get('raft_term', 0)
+        )
+
+    def WatchProducts(self, request, context):
+        """Stream applied changes after request.from_index, until the client goes away"""
+        q = self.raft.changes.subscribe(request.from_index)
+        try:
+            while context.is_active():
+                try:
+                    change = q.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                yield product_db_pb2.ProductChange(
+                    item_id=change.item_id,
+                    raft_index=change.raft_index,
+                    changed_fields=change.fields,
+                    reset=change.reset
+                )
+        finally:
+            self.raft.changes.unsubscribe(q)
+
 
 def serve():
     """Start the gRPC server"""
@@ -14,7 +14,8 @@ CREATE TABLE products (
 );
 
 -- Indexes for better query performance
-CREATE INDEX idx_products_category ON products(category);
+-- (category, item_id) serves paginated searches, which are ordered by item_id
+CREATE INDEX idx_products_category ON products(category, item_id);
 CREATE INDEX idx_products_name ON products(item_name);
 CREATE INDEX idx_products_condition ON products(condition);
 -- Generalized Inverted Index (GIN) for keywords array for efficient searching
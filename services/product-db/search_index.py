@@ -0,0 +1,165 @@
+"""
+In-process inverted index for ranked keyword search over products.
+
+Every replica keeps its own index. It is updated from the same @replicated
+RaftManager methods that write PostgreSQL (and rebuilt from snapshots), so
+all replicas index the same items without extra queries.
+
+Terms are the lowercased keywords and item_name words of each item, with
+postings kept per category because every search filters on one. A query
+term matches an indexed term
+  - exactly                                  (weight 1.0)
+  - as a prefix of it, for terms of 3+ chars (weight 0.75)
+  - within one edit, for terms of 4+ chars   (weight 0.5)
+and an item's match score is the sum of its best weight per query term.
+Items are ranked by match score, then by a smoothed thumbs-up ratio worth
+at most FEEDBACK_WEIGHT, which is less than the gap between two match
+scores, so feedback only orders items with the same matches. Top-k pruning
+walks match scores from the highest down and ranks feedback only within the
+buckets needed to fill k results.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.75
+FUZZY_WEIGHT = 0.5
+FEEDBACK_WEIGHT = 0.2
+
+MIN_PREFIX_LEN = 3
+MIN_FUZZY_LEN = 4
+# Indexed terms a single prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN.findall(text.lower())
+
+
+def _deletes(term: str) -> list:
+    """term with each single character removed"""
+    return [term[:i] + term[i + 1:] for i in range(len(term))]
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one insertion, deletion or substitution"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+class SearchIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # category -> term -> [item_id, ...]
+        self.postings = defaultdict(lambda: defaultdict(list))
+        # item_id -> [thumbs_up, thumbs_down]
+        self.feedback: dict = {}
+        # Every indexed term, as a set for exact matches and sorted for prefix expansion
+        self.terms: set = set()
+        self.vocabulary: list = []
+        # term with one character deleted -> terms, for fuzzy matching
+        self.deletes = defaultdict(set)
+
+    def reset(self):
+        with self.lock:
+            self.postings.clear()
+            self.feedback.clear()
+            self.terms.clear()
+            self.vocabulary = []
+            self.deletes.clear()
+
+    def add(self, item_id: int, category: int, item_name: str, keywords: list,
+            thumbs_up: int = 0, thumbs_down: int = 0):
+        terms = set(tokenize(item_name))
+        for keyword in keywords:
+            terms.update(tokenize(keyword))
+        with self.lock:
+            if item_id in self.feedback:
+                return
+            self.feedback[item_id] = [thumbs_up, thumbs_down]
+            postings = self.postings[category]
+            for term in terms:
+                if term not in self.terms:
+                    self._add_term(term)
+                postings[term].append(item_id)
+
+    def _add_term(self, term: str):
+        """Called inside the lock."""
+        self.terms.add(term)
+        bisect.insort(self.vocabulary, term)
+        self.deletes[term].add(term)
+        for deleted in _deletes(term):
+            self.deletes[deleted].add(term)
+
+    def record_feedback(self, item_id: int, thumbs_up: bool):
+        with self.lock:
+            counts = self.feedback.get(item_id)
+            if counts is not None:
+                counts[0 if thumbs_up else 1] += 1
+
+    def _matches(self, query_term: str) -> dict:
+        """Indexed term -> weight for every term query_term matches. Called inside the lock."""
+        matches = {}
+        if len(query_term) >= MIN_FUZZY_LEN:
+            for candidate in [query_term] + _deletes(query_term):
+                for term in self.deletes.get(candidate, ()):
+                    if _within_one_edit(query_term, term):
+                        matches[term] = FUZZY_WEIGHT
+        if len(query_term) >= MIN_PREFIX_LEN:
+            start = bisect.bisect_left(self.vocabulary, query_term)
+            for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+                if not term.startswith(query_term):
+                    break
+                matches[term] = PREFIX_WEIGHT
+        if query_term in self.terms:
+            matches[query_term] = EXACT_WEIGHT
+        return matches
+
+    def _feedback_score(self, item_id: int) -> float:
+        up, down = self.feedback[item_id]
+        return (up + 1) / (up + down + 2)
+
+    def search(self, category: int, keywords: list, k: int) -> list:
+        """The k best (item_id, score) pairs in category for keywords, best first"""
+        query_terms = set()
+        for keyword in keywords:
+            query_terms.update(tokenize(keyword))
+        with self.lock:
+            postings = self.postings.get(category)
+            if not postings or not query_terms:
+                return []
+            scores = defaultdict(float)
+            for query_term in query_terms:
+                best = {}
+                for term, weight in self._matches(query_term).items():
+                    for item_id in postings.get(term, ()):
+                        if best.get(item_id, 0.0) < weight:
+                            best[item_id] = weight
+                for item_id, weight in best.items():
+                    scores[item_id] += weight
+
+            buckets = defaultdict(list)
+            for item_id, score in scores.items():
+                buckets[score].append(item_id)
+            results = []
+            for score in sorted(buckets, reverse=True):
+                top = heapq.nlargest(k - len(results), buckets[score], key=self._feedback_score)
+                results.extend((item_id, score + FEEDBACK_WEIGHT * self._feedback_score(item_id))
+                               for item_id in top)
+                if len(results) >= k:
+                    break
+            return results
@@ -0,0 +1,130 @@
+"""
+asyncio serving mode for the seller REST API (SERVER_MODE=asyncio)
+
+The same routes as app.py, as Quart coroutines served by Hypercorn on one
+event loop. Both modes run the handlers in routes.py; here their
+product-db and customer-db calls go through grpc.aio. app.py still sets up
+the synchronous clients, whose background threads (product-db status
+polling, the session invalidation stream) are shared with this mode.
+"""
+import asyncio
+import os
+import sys
+
+from hypercorn.asyncio import serve as hypercorn_serve
+from hypercorn.config import Config
+from quart import Quart, jsonify, request
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+
+import async_auth
+import flows
+import routes
+from customer_db_client import AsyncCustomerDBClient
+from product_db_client import AsyncProductDBClient
+
+# Pending connections the listening socket queues
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "4096"))
+
+# Initialize Quart app
+app = Quart(__name__)
+
+# Synchronous clients from app.py (set by serve)
+_product_db_client = None
+_customer_db_client = None
+
+# grpc.aio clients, created on the event loop
+product_db = None
+customer_db_stub = None
+# The clients routes handlers call, by name
+clients = {}
+
+
+@app.before_serving
+async def init_aio_clients():
+    """Wrap app.py's clients with grpc.aio transports on the serving loop"""
+    global product_db, customer_db_stub
+
+    product_db = AsyncProductDBClient(_product_db_client)
+    customer_db_stub = AsyncCustomerDBClient(_customer_db_client)
+    async_auth.set_customer_db_client(customer_db_stub)
+    clients.update(customer_db=customer_db_stub, product_db=product_db)
+
+
+def serve(product_db_client, customer_db_client, host, port):
+    """
+    Serve the API on an asyncio event loop until interrupted.
+
+    Args:
+        product_db_client: app.py's started ProductDBClient
+        customer_db_client: app.py's CustomerDBClient
+    """
+    global _product_db_client, _customer_db_client
+    _product_db_client = product_db_client
+    _customer_db_client = customer_db_client
+
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    config.backlog = SERVER_BACKLOG
+    asyncio.run(hypercorn_serve(app, config))
+
+
+async def _run(handler):
+    """Run a routes handler on the grpc.aio clients"""
+    body, status = await flows.run_async(handler, clients)
+    return jsonify(body), status
+
+
+@app.route('/api/sellers/accounts', methods=['POST'])
+async def create_account():
+    """Create a new seller account"""
+    return await _run(routes.create_account(await request.get_json()))
+
+
+@app.route('/api/sellers/sessions', methods=['POST'])
+async def login():
+    """Login and create a new session"""
+    return await _run(routes.login(await request.get_json()))
+
+
+@app.route('/api/sellers/sessions', methods=['DELETE'])
+@async_auth.require_auth(user_type='seller')
+async def logout(session_id, seller_id):
+    """Logout and delete the session"""
+    return await _run(routes.logout(session_id, seller_id))
+
+
+@app.route('/api/sellers/rating', methods=['GET'])
+@async_auth.require_auth(user_type='seller')
+async def get_seller_rating(session_id, seller_id):
+    """Get seller rating (thumbs up/down counts)"""
+    return await _run(routes.get_seller_rating(session_id, seller_id))
+
+
+@app.route('/api/sellers/items', methods=['POST'])
+@async_auth.require_auth(user_type='seller')
+async def register_item_for_sale(session_id, seller_id):
+    """Register a new item for sale"""
+    return await _run(routes.register_item_for_sale(session_id, seller_id, await request.get_json()))
+
+
+@app.route('/api/sellers/items/<int:item_id>/price', methods=['PATCH'])
+@async_auth.require_auth(user_type='seller')
+async def change_item_price(session_id, seller_id, item_id):
+    """Change the price of an item"""
+    return await _run(routes.change_item_price(session_id, seller_id, item_id, await request.get_json()))
+
+
+@app.route('/api/sellers/items/<int:item_id>/quantity', methods=['PATCH'])
+@async_auth.require_auth(user_type='seller')
+async def update_units_for_sale(session_id, seller_id, item_id):
+    """Update the quantity of units available for sale"""
+    return await _run(routes.update_units_for_sale(session_id, seller_id, item_id, await request.get_json()))
+
+
+@app.route('/api/sellers/items', methods=['GET'])
+@async_auth.require_auth(user_type='seller')
+async def display_items_for_sale(session_id, seller_id):
+    """Display all items for sale by the seller"""
+    return await _run(routes.display_items_for_sale(session_id, seller_id))
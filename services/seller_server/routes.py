@@ -0,0 +1,327 @@
+"""
+Seller API request handlers, shared by both serving modes.
+
+Each handler takes the parsed request (JSON body, session ids, URL
+parameters) and is run by flows.run in app.py or flows.run_async in
+async_app.py, which make its customer_db and product_db calls. It returns
+the JSON body and HTTP status of the response.
+"""
+import sys
+
+import grpc
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+import product_db_pb2
+import customer_db_pb2
+
+import auth
+from flows import Call
+
+
+def create_account(data):
+    """Create a new seller account"""
+    username = data.get("username")
+    password = data.get("password")
+
+    try:
+        request_msg = customer_db_pb2.CreateSellerRequest(
+            username=username,
+            password=password
+        )
+        response = yield Call("customer_db", "CreateSeller", request_msg)
+
+        if not response.success:
+            if "already exists" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Username already exists."
+                }, 409
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "seller_id": response.seller_id
+        }, 201
+
+    except grpc.RpcError as e:
+        print(f"gRPC error creating seller account: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to create account."
+        }, 500
+
+
+def login(data):
+    """Login and create a new session"""
+    username = data.get("username")
+    password = data.get("password")
+
+    try:
+        request_msg = customer_db_pb2.SellerLoginRequest(
+            username=username,
+            password=password
+        )
+        response = yield Call("customer_db", "SellerLogin", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": "Username/Password combination does not exist."
+            }, 401
+
+        return {
+            "status": "OK",
+            "session_id": response.session_id,
+            "seller_id": response.seller_id,
+            "message": f"I've seen enough. Welcome back {response.username}"
+        }, 201
+
+    except grpc.RpcError as e:
+        print(f"gRPC error logging into seller account: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to log in to seller account."
+        }, 500
+
+
+def logout(session_id, seller_id):
+    """Logout and delete the session"""
+    try:
+        request_msg = customer_db_pb2.LogoutRequest(session_id=session_id)
+        response = yield Call("customer_db", "SellerLogout", request_msg)
+        auth.invalidate_session(session_id)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": "Failed to log out."
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": "Successfully logged out."
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error logging out of seller session: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to log out of seller session."
+        }, 500
+
+
+def get_seller_rating(session_id, seller_id):
+    """Get seller rating (thumbs up/down counts)"""
+    try:
+        request_msg = customer_db_pb2.GetSellerRatingRequest(seller_id=seller_id)
+        response = yield Call("customer_db", "GetSellerRating", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": "Seller ID does not exist."
+            }, 404
+
+        return {
+            "status": "OK",
+            "thumbs_up": response.rating.thumbs_up,
+            "thumbs_down": response.rating.thumbs_down
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error getting seller rating: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to get seller rating."
+        }, 500
+
+
+def register_item_for_sale(session_id, seller_id, data):
+    """Register a new item for sale"""
+    item_name = data.get("item_name")
+    category = data.get("category")
+    keywords = data.get("keywords")
+    condition = data.get("condition")
+    sale_price = data.get("sale_price")
+    quantity = data.get("quantity")
+
+    try:
+        request_msg = product_db_pb2.RegisterItemRequest(
+            seller_id=seller_id,
+            item_name=item_name,
+            category=category,
+            keywords=keywords,  # list automatically converts to repeated
+            condition=condition,
+            sale_price=sale_price,
+            quantity=quantity
+        )
+        response = yield Call("product_db", "write", "RegisterItem", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": f"Item {item_name} registered for sale successfully with Item ID {response.item_id}"
+        }, 201
+
+    except grpc.RpcError as e:
+        print(f"gRPC error registering item for sale: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to register item for sale."
+        }, 500
+    except Exception as e:
+        print(f"Product DB cluster unavailable: {e}")
+        return {
+            "status": "Error",
+            "message": "Product database cluster is temporarily unavailable."
+        }, 503
+
+
+def change_item_price(session_id, seller_id, item_id, data):
+    """Change the price of an item"""
+    new_price = data.get("new_price")
+
+    try:
+        request_msg = product_db_pb2.UpdateItemPriceRequest(
+            item_id=item_id,
+            seller_id=seller_id,
+            new_price=new_price
+        )
+        response = yield Call("product_db", "write", "UpdateItemPrice", request_msg)
+
+        if not response.success:
+            if "does not exist" in response.error_message.lower() or "does not belong" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Item ID does not exist or does not belong to the seller."
+                }, 404
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": f"Item price for item {item_id} updated successfully to {new_price}"
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error changing item price: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to change item price."
+        }, 500
+    except Exception as e:
+        print(f"Product DB cluster unavailable: {e}")
+        return {
+            "status": "Error",
+            "message": "Product database cluster is temporarily unavailable."
+        }, 503
+
+
+def update_units_for_sale(session_id, seller_id, item_id, data):
+    """Update the quantity of units available for sale"""
+    quantity_change = data.get("quantity_change")
+
+    try:
+        request_msg = product_db_pb2.UpdateItemQuantityRequest(
+            item_id=item_id,
+            seller_id=seller_id,
+            quantity_change=quantity_change
+        )
+        response = yield Call("product_db", "write", "UpdateItemQuantity", request_msg)
+
+        if not response.success:
+            if "does not exist" in response.error_message.lower() or "does not belong" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Item ID does not exist or does not belong to the seller."
+                }, 404
+            if "negative" in response.error_message.lower():
+                return {
+                    "status": "Error",
+                    "message": "Available units cannot be negative."
+                }, 400
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        return {
+            "status": "OK",
+            "message": f"Item quantity for item {item_id} updated successfully to {response.new_quantity}"
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error updating item quantity: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to update item quantity."
+        }, 500
+    except Exception as e:
+        print(f"Product DB cluster unavailable: {e}")
+        return {
+            "status": "Error",
+            "message": "Product database cluster is temporarily unavailable."
+        }, 503
+
+
+def display_items_for_sale(session_id, seller_id):
+    """Display all items for sale by the seller"""
+    try:
+        request_msg = product_db_pb2.GetItemsBySellerRequest(seller_id=seller_id)
+        response = yield Call("product_db", "read", "GetItemsBySeller", request_msg)
+
+        if not response.success:
+            return {
+                "status": "Error",
+                "message": response.error_message
+            }, 500
+
+        # Convert protobuf Product messages to dict
+        items = []
+        for item in response.items:
+            items.append({
+                "item_id": item.item_id,
+                "item_name": item.item_name,
+                "category": item.category,
+                "keywords": list(item.keywords),
+                "condition": item.condition,
+                "sale_price": item.sale_price,
+                "quantity": item.quantity,
+                "thumbs_up": item.thumbs_up,
+                "thumbs_down": item.thumbs_down
+            })
+
+        if not items:
+            return {
+                "status": "OK",
+                "message": "No items for sale."
+            }, 200
+
+        return {
+            "status": "OK",
+            "items": items
+        }, 200
+
+    except grpc.RpcError as e:
+        print(f"gRPC error displaying items for sale: {e.code()} - {e.details()}")
+        return {
+            "status": "Error",
+            "message": "Failed to display items for sale."
+        }, 500
+    except Exception as e:
+        print(f"Product DB cluster unavailable: {e}")
+        return {
+            "status": "Error",
+            "message": "Product database cluster is temporarily unavailable."
+        }, 503
@@ -0,0 +1,80 @@
+"""
+Compare the threaded (Flask) and asyncio (Quart/grpc.aio) serving modes of
+the buyer and seller servers under the performance_tests.py workload.
+
+Start one set of servers with SERVER_MODE=threads and another with
+SERVER_MODE=asyncio (or restart the same servers between runs), then e.g.
+
+    python serving_mode_tests.py --threads 10.0.0.5 --asyncio 10.0.0.6 \
+        --num-sellers 100 --num-buyers 100 --concurrency 20 200
+
+Each client runs the same ~1000 operations as performance_tests.py; unlike
+run_scenario, the number of clients in flight at once is not capped at 20.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import performance_tests
+from performance_tests import compute_metrics, run_buyer_operations, run_seller_operations
+
+
+def run_mode(hosts: list, num_sellers: int, num_buyers: int, concurrency: int):
+    """
+    Run every seller and buyer client against hosts with at most concurrency
+    clients in flight.
+
+    Returns:
+        (seller_avg_ms, buyer_avg_ms, total_operations, wall-clock ops/sec)
+    """
+    performance_tests.SELLER_SERVERS = hosts
+    performance_tests.BUYER_SERVERS = hosts
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        seller_futures = [executor.submit(run_seller_operations, i) for i in range(1, num_sellers + 1)]
+        buyer_futures = [executor.submit(run_buyer_operations, i) for i in range(1, num_buyers + 1)]
+        seller_response_times = [t for future in seller_futures for t in future.result()]
+        buyer_response_times = [t for future in buyer_futures for t in future.result()]
+    elapsed = time.time() - start
+
+    seller_avg, _ = compute_metrics(seller_response_times)
+    buyer_avg, _ = compute_metrics(buyer_response_times)
+    total_operations = len(seller_response_times) + len(buyer_response_times)
+    return seller_avg, buyer_avg, total_operations, total_operations / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare threaded and asyncio serving modes")
+    parser.add_argument('--threads', required=True,
+                        help='Comma-separated buyer/seller server hosts running SERVER_MODE=threads')
+    parser.add_argument('--asyncio', required=True,
+                        help='Comma-separated buyer/seller server hosts running SERVER_MODE=asyncio')
+    parser.add_argument('--num-sellers', type=int, default=10, help='Number of sellers')
+    parser.add_argument('--num-buyers', type=int, default=10, help='Number of buyers')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[20],
+                        help='Clients in flight at once; one run per value')
+    parser.add_argument('--iterations', type=int, default=3, help='Runs averaged per mode and concurrency')
+
+    args = parser.parse_args()
+    modes = {
+        "threads": [h.strip() for h in args.threads.split(",") if h.strip()],
+        "asyncio": [h.strip() for h in args.asyncio.split(",") if h.strip()],
+    }
+
+    results = []
+    for concurrency in args.concurrency:
+        for mode, hosts in modes.items():
+            runs = []
+            for i in range(args.iterations):
+                seller_avg, buyer_avg, operations, throughput = run_mode(
+                    hosts, args.num_sellers, args.num_buyers, concurrency)
+                runs.append((seller_avg, buyer_avg, throughput))
+                print(f"{mode} x{concurrency} iteration {i+1}: {operations} ops, "
+                      f"Sellers {seller_avg:.2f} ms, Buyers {buyer_avg:.2f} ms, {throughput:.2f} ops/sec")
+            averages = [sum(run[k] for run in runs) / len(runs) for k in range(3)]
+            results.append((mode, concurrency, *averages))
+
+    print(f"\n{'mode':<8} {'clients':>8} {'seller ms':>10} {'buyer ms':>10} {'ops/sec':>10}")
+    for mode, concurrency, seller_avg, buyer_avg, throughput in results:
+        print(f"{mode:<8} {concurrency:>8} {seller_avg:>10.2f} {buyer_avg:>10.2f} {throughput:>10.2f}")
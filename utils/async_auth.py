@@ -0,0 +1,113 @@
+"""
+Authentication for the asyncio serving mode (async_app.py)
+
+Shares auth.py's session cache, invalidation stream and keep-alives; only
+the validation call on a cache miss is made over grpc.aio.
+"""
+from functools import wraps
+import sys
+
+import grpc
+from quart import jsonify, request
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+import customer_db_pb2
+
+import auth
+import customer_db_client
+
+# AsyncCustomerDBClient (injected by async_app.py)
+customer_db_stub = None
+
+
+def set_customer_db_client(client):
+    """
+    Set the grpc.aio customer database client. Called by async_app.py on
+    its event loop, after app.py has set up auth.py.
+
+    Args:
+        client: AsyncCustomerDBClient instance
+    """
+    global customer_db_stub
+    customer_db_stub = client
+
+
+def require_auth(user_type='seller'):
+    """
+    auth.require_auth for coroutine routes.
+
+    Args:
+        user_type: 'seller' or 'buyer' (default: 'seller')
+
+    Returns:
+        Decorator function that validates session and injects session_id and user_id
+    """
+    def decorator(f):
+        @wraps(f)
+        async def decorated_function(*args, **kwargs):
+            # Extract authorization header
+            auth_header = request.headers.get('Authorization')
+            if not auth_header or not auth_header.startswith('Bearer '):
+                return jsonify({
+                    "status": "Error",
+                    "message": "Missing or invalid authorization header"
+                }), 401
+
+            # Extract session ID from Bearer token
+            session_id = auth_header.replace('Bearer ', '').strip()
+
+            # customer-db calls made for this request carry the session's read-your-writes token
+            token = customer_db_client.current_session.set(session_id)
+            try:
+                return await _call_authenticated(f, session_id, user_type, args, kwargs)
+            finally:
+                customer_db_client.current_session.reset(token)
+
+        return decorated_function
+    return decorator
+
+
+async def _call_authenticated(f, session_id, user_type, args, kwargs):
+    """auth._call_authenticated for coroutine routes"""
+    cached, generation = auth.session_cache.get(session_id, user_type)
+    if cached is not None:
+        # Does not block: the keep-alive is sent without waiting for it
+        auth._touch_cached(cached, session_id, user_type)
+        if user_type == 'seller':
+            return await f(session_id=session_id, seller_id=cached[1], *args, **kwargs)
+        return await f(session_id=session_id, buyer_id=cached[1], *args, **kwargs)
+
+    try:
+        if user_type == 'seller':
+            validate_req = customer_db_pb2.ValidateSellerSessionRequest(
+                session_id=session_id
+            )
+            validate_resp = await customer_db_stub.ValidateAndTouchSellerSession(validate_req)
+            user_id = validate_resp.seller_id
+        else:  # buyer
+            validate_req = customer_db_pb2.ValidateBuyerSessionRequest(
+                session_id=session_id
+            )
+            validate_resp = await customer_db_stub.ValidateAndTouchBuyerSession(validate_req)
+            user_id = validate_resp.buyer_id
+
+        if not validate_resp.valid:
+            return jsonify({
+                "status": "Timeout",
+                "message": "Session expired. Please log in again."
+            }), 401
+
+        auth.session_cache.put(session_id, user_type, user_id, generation)
+
+    except grpc.RpcError as e:
+        print(f"gRPC error validating session: {e.code()} - {e.details()}")
+        return jsonify({
+            "status": "Error",
+            "message": "Authentication service unavailable"
+        }), 503
+
+    # Inject session_id and user id into route function
+    if user_type == 'seller':
+        return await f(session_id=session_id, seller_id=user_id, *args, **kwargs)
+    return await f(session_id=session_id, buyer_id=user_id, *args, **kwargs)
@@ -0,0 +1,236 @@
+"""
+Authentication utilities for the buyer and seller servers (gRPC-based)
+"""
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify
+import grpc
+import sys
+import threading
+import time
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+import customer_db_pb2
+import customer_db_pb2_grpc
+
+import customer_db_client
+
+# Global gRPC stub (injected by app.py)
+customer_db_stub = None
+
+# How long a validated session is trusted without asking customer-db again
+SESSION_CACHE_TTL = 30.0
+SESSION_CACHE_SIZE = 10000
+# Keep-alives for cached sessions are sent at most this often
+TOUCH_INTERVAL = 30.0
+
+
+class SessionCache:
+    """
+    Bounded LRU of session_id -> (user_type, user_id, expiry, last keep-alive).
+
+    Entries are dropped when customer-db pushes an invalidation (logout or
+    timeout) over WatchSessionInvalidations. Hits are only served while that
+    stream is connected; otherwise every call goes to customer-db as before.
+    An invalidation leaves a tombstone holding its generation, so a
+    validation that started before a logout cannot cache the session again.
+    """
+
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE, ttl: float = SESSION_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # session_id -> (entry or None, generation it was stored or invalidated at)
+        self.entries = OrderedDict()
+        self.generation = 0
+        # Validations that started before this generation may have missed an invalidation
+        self.valid_from = 0
+        self.connected = False
+
+    def get(self, session_id, user_type):
+        """
+        Returns (cached entry [user_type, user_id, expiry, touched_at] or
+        None, generation to pass to put() after a miss)
+        """
+        with self.lock:
+            stored = self.entries.get(session_id)
+            if not self.connected or stored is None or stored[0] is None:
+                return None, self.generation
+            entry = stored[0]
+            if entry[0] != user_type or entry[2] < time.monotonic():
+                del self.entries[session_id]
+                return None, self.generation
+            self.entries.move_to_end(session_id)
+            return entry, self.generation
+
+    def put(self, session_id, user_type, user_id, generation):
+        """Cache a session customer-db validated after get() returned generation"""
+        now = time.monotonic()
+        with self.lock:
+            if not self.connected or generation < self.valid_from:
+                return
+            stored = self.entries.get(session_id)
+            if stored is not None and stored[1] > generation:
+                # Invalidated while it was being validated
+                return
+            self.entries[session_id] = ([user_type, user_id, now + self.ttl, now], generation)
+            self.entries.move_to_end(session_id)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, session_id):
+        with self.lock:
+            self.generation += 1
+            self.entries[session_id] = (None, self.generation)
+            self.entries.move_to_end(session_id)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def set_connected(self, connected: bool):
+        with self.lock:
+            self.connected = connected
+            # Invalidations may have been missed while disconnected
+            self.entries.clear()
+            self.generation += 1
+            self.valid_from = self.generation
+
+
+session_cache = SessionCache()
+
+
+def set_customer_db_stub(stub):
+    """
+    Set the gRPC stub for customer database service and start listening
+    for session invalidations. Called by app.py during initialization.
+
+    Args:
+        stub: CustomerDBServiceStub instance
+    """
+    global customer_db_stub
+    customer_db_stub = stub
+    threading.Thread(target=_watch_invalidations, daemon=True, name="session-invalidations").start()
+
+
+def _watch_invalidations():
+    """Apply invalidations pushed by customer-db, resubscribing whenever the stream drops"""
+    while True:
+        try:
+            for invalidation in customer_db_stub.WatchSessionInvalidations(
+                    customer_db_pb2.WatchSessionInvalidationsRequest()):
+                if invalidation.session_id:
+                    session_cache.invalidate(invalidation.session_id)
+                else:
+                    session_cache.set_connected(True)
+        except grpc.RpcError as e:
+            print(f"Session invalidation stream lost: {e.code()} - {e.details()}")
+        session_cache.set_connected(False)
+        time.sleep(1)
+
+
+def invalidate_session(session_id):
+    """Drop a session from the cache right away, e.g. on logout"""
+    session_cache.invalidate(session_id)
+
+
+def _touch_cached(entry, session_id, user_type):
+    """Send a keep-alive for a cached session if the last one is TOUCH_INTERVAL old, without waiting for it"""
+    now = time.monotonic()
+    if now - entry[3] < TOUCH_INTERVAL:
+        return
+    entry[3] = now
+    if user_type == 'seller':
+        customer_db_stub.UpdateSellerSessionTimestamp.future(
+            customer_db_pb2.UpdateSellerSessionTimestampRequest(session_id=session_id))
+    else:
+        customer_db_stub.UpdateBuyerSessionTimestamp.future(
+            customer_db_pb2.UpdateBuyerSessionTimestampRequest(session_id=session_id))
+
+
+def require_auth(user_type='seller'):
+    """
+    Decorator factory to validate session for protected endpoints using gRPC.
+
+    Args:
+        user_type: 'seller' or 'buyer' (default: 'seller')
+
+    Returns:
+        Decorator function that validates session and injects session_id and user_id
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Extract authorization header
+            auth_header = request.headers.get('Authorization')
+            if not auth_header or not auth_header.startswith('Bearer '):
+                return jsonify({
+                    "status": "Error",
+                    "message": "Missing or invalid authorization header"
+                }), 401
+
+            # Extract session ID from Bearer token
+            session_id = auth_header.replace('Bearer ', '').strip()
+
+            # customer-db calls made for this request carry the session's read-your-writes token
+            token = customer_db_client.current_session.set(session_id)
+            try:
+                return _call_authenticated(f, session_id, user_type, args, kwargs)
+            finally:
+                customer_db_client.current_session.reset(token)
+
+        return decorated_function
+    return decorator
+
+
+def _call_authenticated(f, session_id, user_type, args, kwargs):
+    """Validate session_id (from the cache if possible) and call the route f with its user id"""
+    cached, generation = session_cache.get(session_id, user_type)
+    if cached is not None:
+        _touch_cached(cached, session_id, user_type)
+        if user_type == 'seller':
+            return f(session_id=session_id, seller_id=cached[1], *args, **kwargs)
+        return f(session_id=session_id, buyer_id=cached[1], *args, **kwargs)
+
+    try:
+        if user_type == 'seller':
+            # Validate and keep alive the seller session via gRPC
+            validate_req = customer_db_pb2.ValidateSellerSessionRequest(
+                session_id=session_id
+            )
+            validate_resp = customer_db_stub.ValidateAndTouchSellerSession(validate_req)
+
+            if not validate_resp.valid:
+                return jsonify({
+                    "status": "Timeout",
+                    "message": "Session expired. Please log in again."
+                }), 401
+
+            session_cache.put(session_id, user_type, validate_resp.seller_id, generation)
+
+            # Inject session_id and seller_id into route function
+            return f(session_id=session_id, seller_id=validate_resp.seller_id, *args, **kwargs)
+
+        else:  # buyer
+            # Validate and keep alive the buyer session via gRPC
+            validate_req = customer_db_pb2.ValidateBuyerSessionRequest(
+                session_id=session_id
+            )
+            validate_resp = customer_db_stub.ValidateAndTouchBuyerSession(validate_req)
+
+            if not validate_resp.valid:
+                return jsonify({
+                    "status": "Timeout",
+                    "message": "Session expired. Please log in again."
+                }), 401
+
+            session_cache.put(session_id, user_type, validate_resp.buyer_id, generation)
+
+            # Inject session_id and buyer_id into route function
+            return f(session_id=session_id, buyer_id=validate_resp.buyer_id, *args, **kwargs)
+
+    except grpc.RpcError as e:
+        print(f"gRPC error validating session: {e.code()} - {e.details()}")
+        return jsonify({
+            "status": "Error",
+            "message": "Authentication service unavailable"
+        }), 503
@@ -0,0 +1,295 @@
+"""
+Client for the customer-db ABP replicas.
+
+Every replica can serve reads from its own database and accepts writes
+(which it broadcasts through ABP), so the client keeps one channel per
+replica and sends each call to the replica with the fewest calls in flight
+from this process. A replica that returns UNAVAILABLE is skipped for
+DOWN_BACKOFF seconds and the call is retried on another one; reads are also
+retried after DEADLINE_EXCEEDED, writes are not, as they may still be
+applied.
+
+Replicas deliver writes at slightly different times, so a read sent to
+another replica right after a write could miss it. Every write response
+carries the write's seq, and the client stamps the highest seq seen for a
+session on each of that session's reads as min_seq. The replica holds the
+read until it has applied that write, and answers FAILED_PRECONDITION if it
+is still behind after a while; the read is then retried on another replica,
+which is not marked down. A call belongs to the session_id in its request,
+else to current_session, which auth.require_auth sets for the HTTP request.
+
+CustomerDBClient can be used in place of a CustomerDBServiceStub:
+client.GetActiveCart(request), client.UpdateBuyerSessionTimestamp.future(
+request) and streaming calls all work. AsyncCustomerDBClient makes the same
+calls over grpc.aio for the asyncio serving mode.
+"""
+import asyncio
+import contextvars
+import itertools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import grpc
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+
+import customer_db_pb2_grpc
+
+CALL_TIMEOUT = 10
+# Writes wait for ABP delivery, which customer-db gives up on after
+# SUBMIT_TIMEOUT (30 s); a shorter deadline would abandon writes that still
+# get applied
+WRITE_TIMEOUT = 35
+DOWN_BACKOFF = 1.0
+# Sessions whose read-your-writes token is kept
+SESSION_TOKENS = 100000
+
+# Session of the HTTP request being served (set by auth.require_auth), for
+# calls whose request carries no session_id
+current_session = contextvars.ContextVar("customer_db_session", default=None)
+
+# Served from the replica's local state, so any replica will do once it has
+# applied min_seq
+READ_METHODS = {
+    "ValidateSellerSession", "ValidateBuyerSession",
+    "ValidateAndTouchSellerSession", "ValidateAndTouchBuyerSession",
+    "UpdateSellerSessionTimestamp", "UpdateBuyerSessionTimestamp",
+    "GetActiveCart", "GetSavedCart", "GetSellerRating", "GetBuyerPurchases",
+}
+# Long-lived streams, not counted as calls in flight
+STREAM_METHODS = {"WatchSessionInvalidations"}
+
+# FAILED_PRECONDITION: the replica has not applied the read's min_seq yet
+_RETRYABLE_READ = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED,
+                   grpc.StatusCode.FAILED_PRECONDITION)
+_RETRYABLE_WRITE = (grpc.StatusCode.UNAVAILABLE,)
+
+
+def _default_timeout(method_name: str) -> float:
+    return CALL_TIMEOUT if method_name in READ_METHODS else WRITE_TIMEOUT
+
+
+class CustomerDBClient:
+    def __init__(self, hosts: list, port: str):
+        # hosts : customer-db gRPC hosts, with or without a port
+        # port  : gRPC port for hosts given without one
+        self.addrs = [host if ":" in host else f"{host}:{port}" for host in hosts]
+        self.channels = {addr: grpc.insecure_channel(addr) for addr in self.addrs}
+        self.stubs = {
+            addr: customer_db_pb2_grpc.CustomerDBServiceStub(channel)
+            for addr, channel in self.channels.items()
+        }
+        self.lock = threading.Lock()
+        # addr -> calls in flight
+        self.outstanding = {addr: 0 for addr in self.addrs}
+        # addr -> monotonic time until which it is skipped
+        self.down_until = {addr: 0.0 for addr in self.addrs}
+        self._round_robin = itertools.count()
+        # session_id -> seq of the latest write made in that session, least recent first
+        self.session_seqs = OrderedDict()
+
+    @staticmethod
+    def _session(request):
+        """Session a call is made for: its request's session_id, else the HTTP request's"""
+        return getattr(request, "session_id", "") or current_session.get()
+
+    def _note_seq(self, request, response):
+        """Keep a write's seq as the token of its session (a login's new session)"""
+        session_id = getattr(response, "session_id", "") or self._session(request)
+        if not session_id or not response.seq:
+            return
+        with self.lock:
+            if response.seq > self.session_seqs.get(session_id, 0):
+                self.session_seqs[session_id] = response.seq
+            self.session_seqs.move_to_end(session_id)
+            if len(self.session_seqs) > SESSION_TOKENS:
+                self.session_seqs.popitem(last=False)
+
+    def _stamp(self, method_name: str, request):
+        """Ask a read to wait for every write its session has seen"""
+        if method_name not in READ_METHODS:
+            return
+        session_id = self._session(request)
+        if not session_id:
+            return
+        with self.lock:
+            seq = self.session_seqs.get(session_id)
+        if seq:
+            request.min_seq = seq
+
+    def wait_ready(self, timeout: float) -> list:
+        """Wait up to timeout for any replica's channel to connect; returns the connected ones"""
+        futures = {addr: grpc.channel_ready_future(channel) for addr, channel in self.channels.items()}
+        deadline = time.monotonic() + timeout
+        ready = []
+        while not ready and time.monotonic() < deadline:
+            time.sleep(0.05)
+            ready = [addr for addr, future in futures.items() if future.done()]
+        for future in futures.values():
+            future.cancel()
+        return ready
+
+    def _pick(self, exclude: set):
+        """Least loaded replica that is up, round-robin among ties; None once all are excluded"""
+        now = time.monotonic()
+        with self.lock:
+            candidates = [addr for addr in self.addrs if addr not in exclude]
+            if not candidates:
+                return None
+            up = [addr for addr in candidates if self.down_until[addr] <= now]
+            # If every replica looks down, try one anyway rather than fail outright
+            candidates = up or candidates
+            start = next(self._round_robin) % len(candidates)
+            candidates = candidates[start:] + candidates[:start]
+            return min(candidates, key=self.outstanding.__getitem__)
+
+    def _acquire(self, addr: str):
+        with self.lock:
+            self.outstanding[addr] += 1
+
+    def _release(self, addr: str):
+        with self.lock:
+            self.outstanding[addr] -= 1
+
+    def _mark_down(self, addr: str):
+        with self.lock:
+            self.down_until[addr] = time.monotonic() + DOWN_BACKOFF
+
+    def _call(self, method_name: str, request, timeout):
+        retryable = _RETRYABLE_READ if method_name in READ_METHODS else _RETRYABLE_WRITE
+        self._stamp(method_name, request)
+        tried = set()
+        last_error = None
+        while True:
+            addr = self._pick(tried)
+            if addr is None:
+                # Every replica failed; last_error is a grpc.RpcError
+                raise last_error
+            tried.add(addr)
+            self._acquire(addr)
+            try:
+                response = getattr(self.stubs[addr], method_name)(request, timeout=timeout)
+            except grpc.RpcError as e:
+                if e.code() not in retryable:
+                    raise
+                if e.code() == grpc.StatusCode.UNAVAILABLE:
+                    self._mark_down(addr)
+                print(f"customer-db {addr} failed {method_name} ({e.code()}), trying another node")
+                last_error = e
+            else:
+                if method_name not in READ_METHODS:
+                    self._note_seq(request, response)
+                return response
+            finally:
+                self._release(addr)
+
+    def _future(self, method_name: str, request, timeout):
+        """Asynchronous call on one replica, without failover"""
+        self._stamp(method_name, request)
+        addr = self._pick(set())
+        self._acquire(addr)
+        future = getattr(self.stubs[addr], method_name).future(request, timeout=timeout)
+        future.add_done_callback(lambda _: self._release(addr))
+        return future
+
+    def _stream(self, method_name: str, request, timeout):
+        addr = self._pick(set())
+        return getattr(self.stubs[addr], method_name)(request, timeout=timeout)
+
+    def __getattr__(self, method_name: str):
+        if method_name.startswith("_"):
+            raise AttributeError(method_name)
+        return _Method(self, method_name)
+
+
+class _Method:
+    """Stands in for a stub's multi-callable"""
+
+    def __init__(self, client: CustomerDBClient, method_name: str):
+        self.client = client
+        self.method_name = method_name
+
+    def __call__(self, request, timeout=None):
+        if self.method_name in STREAM_METHODS:
+            return self.client._stream(self.method_name, request, timeout)
+        return self.client._call(self.method_name, request,
+                                 timeout or _default_timeout(self.method_name))
+
+    def future(self, request, timeout=None):
+        return self.client._future(self.method_name, request,
+                                   timeout or _default_timeout(self.method_name))
+
+
+class AsyncCustomerDBClient:
+    """
+    grpc.aio transport for a CustomerDBClient: `await client.GetActiveCart(
+    request)`. Replica choice, calls in flight, down marks and the
+    read-your-writes token are shared with the wrapped client, which keeps
+    serving the streaming calls. Must be created on the event loop it is
+    used from.
+    """
+
+    def __init__(self, client: CustomerDBClient):
+        self.client = client
+        self.stubs = {
+            addr: customer_db_pb2_grpc.CustomerDBServiceStub(grpc.aio.insecure_channel(addr))
+            for addr in client.addrs
+        }
+        # Fire-and-forget calls, referenced until done so they are not collected
+        self.background = set()
+
+    async def _call(self, method_name: str, request, timeout):
+        client = self.client
+        retryable = _RETRYABLE_READ if method_name in READ_METHODS else _RETRYABLE_WRITE
+        client._stamp(method_name, request)
+        tried = set()
+        last_error = None
+        while True:
+            addr = client._pick(tried)
+            if addr is None:
+                # Every replica failed; last_error is a grpc.RpcError
+                raise last_error
+            tried.add(addr)
+            client._acquire(addr)
+            try:
+                response = await getattr(self.stubs[addr], method_name)(request, timeout=timeout)
+            except grpc.RpcError as e:
+                if e.code() not in retryable:
+                    raise
+                if e.code() == grpc.StatusCode.UNAVAILABLE:
+                    client._mark_down(addr)
+                print(f"customer-db {addr} failed {method_name} ({e.code()}), trying another node")
+                last_error = e
+            else:
+                if method_name not in READ_METHODS:
+                    client._note_seq(request, response)
+                return response
+            finally:
+                client._release(addr)
+
+    def __getattr__(self, method_name: str):
+        if method_name.startswith("_"):
+            raise AttributeError(method_name)
+        return _AsyncMethod(self, method_name)
+
+
+class _AsyncMethod:
+    """Stands in for a grpc.aio stub's multi-callable"""
+
+    def __init__(self, client: AsyncCustomerDBClient, method_name: str):
+        self.client = client
+        self.method_name = method_name
+
+    def __call__(self, request, timeout=None):
+        return self.client._call(self.method_name, request,
+                                 timeout or _default_timeout(self.method_name))
+
+    def future(self, request, timeout=None) -> asyncio.Task:
+        """Start the call without waiting for it"""
+        task = asyncio.ensure_future(self(request, timeout))
+        self.client.background.add(task)
+        task.add_done_callback(self.client.background.discard)
+        return task
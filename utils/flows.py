@@ -0,0 +1,109 @@
+"""
+Request handlers written once for both serving modes.
+
+A handler is a generator that yields the calls it needs made and returns
+(JSON body, HTTP status). It never touches a client itself: it yields
+Call(client, method, *args), and Start(call) / Wait(handle) to overlap two
+calls. run() makes the calls with the blocking clients of the threaded
+(Flask) mode; run_async() awaits them on the grpc.aio clients of the
+asyncio (Quart) mode. A call that fails is raised inside the handler at its
+yield, so handlers catch errors exactly as if they had made the call.
+
+    def get_rating(seller_id):
+        try:
+            response = yield Call("customer_db", "GetSellerRating", request_msg)
+        except grpc.RpcError:
+            return {"status": "Error", ...}, 500
+        return {"status": "OK", ...}, 200
+
+clients maps the names used in Call to objects: in run() their methods
+return results, in run_async() they return awaitables.
+"""
+import asyncio
+import contextvars
+
+
+class Call:
+    """Call clients[client].method(*args)"""
+    __slots__ = ("client", "method", "args")
+
+    def __init__(self, client: str, method: str, *args):
+        self.client = client
+        self.method = method
+        self.args = args
+
+
+class Start:
+    """Start call without waiting for it; the handler receives a handle to Wait on"""
+    __slots__ = ("call",)
+
+    def __init__(self, call: Call):
+        self.call = call
+
+
+class Wait:
+    """Wait for a Start()ed call; its result or error is returned at the yield"""
+    __slots__ = ("handle",)
+
+    def __init__(self, handle):
+        self.handle = handle
+
+
+def run(handler, clients: dict, pool=None):
+    """
+    Run handler with blocking calls; pool (an Executor, needed by handlers
+    that Start calls) runs Start()ed calls in the caller's context, so they
+    keep its session. Returns the handler's (body, status).
+    """
+    result = error = None
+    while True:
+        try:
+            effect = handler.send(result) if error is None else handler.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        result = error = None
+        try:
+            if isinstance(effect, Start):
+                result = pool.submit(contextvars.copy_context().run, _call, clients, effect.call)
+            elif isinstance(effect, Wait):
+                result = effect.handle.result()
+            else:
+                result = _call(clients, effect)
+        except Exception as e:
+            error = e
+
+
+async def run_async(handler, clients: dict):
+    """
+    Run handler on the event loop, awaiting its calls; Start()ed calls run
+    as tasks. Returns the handler's (body, status).
+    """
+    return await _run_async(handler, clients, None)
+
+
+async def _run_async(handler, clients, error):
+    result = None
+    while True:
+        try:
+            effect = handler.send(result) if error is None else handler.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        result = error = None
+        try:
+            if isinstance(effect, Start):
+                result = asyncio.ensure_future(_call(clients, effect.call))
+            elif isinstance(effect, Wait):
+                result = await effect.handle
+            else:
+                result = await _call(clients, effect)
+        except asyncio.CancelledError as e:
+            # The handler sees the cancellation and may still wait for calls
+            # it started (to undo them); a second cancellation must not cut
+            # that short, so it runs on in a task of its own
+            return await asyncio.shield(_run_async(handler, clients, e))
+        except Exception as e:
+            error = e
+
+
+def _call(clients: dict, call: Call):
+    return getattr(clients[call.client], call.method)(*call.args)
@@ -0,0 +1,288 @@
+"""
+Leader-aware client for the product-db Raft cluster.
+
+Keeps one long-lived gRPC channel per replica and polls every replica's
+GetClusterStatus in the background to learn which one is the Raft leader.
+Writes go straight to the leader instead of a random node that would have
+to forward them, and reads are spread round-robin over the ready followers.
+A read that fails with UNAVAILABLE or DEADLINE_EXCEEDED is retried on
+another replica, and so is a write that fails with UNAVAILABLE (a write
+that timed out may still be applied, so it is not resent). Nothing probes
+channel readiness on the request path.
+
+Write responses carry the raft_index they were applied at, and reads are
+stamped with the highest one seen for their session as min_index, so a
+follower holds the read until it has applied that session's writes (a
+seller sees an item they just registered) without waiting for everyone
+else's. The session is customer_db_client.current_session, which
+auth.require_auth sets for the HTTP request. read(..., linearizable=True) goes to the
+leader instead, which serves it once a read barrier has committed.
+
+AsyncProductDBClient makes the same calls over grpc.aio for the asyncio
+serving mode.
+"""
+import itertools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import grpc
+
+# Add generated protobuf path
+sys.path.insert(0, '/app/generated')
+
+import product_db_pb2
+import product_db_pb2_grpc
+from customer_db_client import SESSION_TOKENS, current_session
+
+STATUS_INTERVAL = 1.0
+STATUS_TIMEOUT = 0.5
+CALL_TIMEOUT = 5
+# Replicas a call is attempted on before giving up
+MAX_ATTEMPTS = 3
+
+_RETRYABLE_READ = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+_RETRYABLE_WRITE = (grpc.StatusCode.UNAVAILABLE,)
+
+
+class ProductDBClient:
+    def __init__(self, hosts: list, port: str):
+        # hosts : product-db gRPC hosts, with or without a port
+        # port  : gRPC port for hosts given without one
+        self.addrs = [host if ":" in host else f"{host}:{port}" for host in hosts]
+        self.stubs = {
+            addr: product_db_pb2_grpc.ProductDBServiceStub(grpc.insecure_channel(addr))
+            for addr in self.addrs
+        }
+        self.lock = threading.Lock()
+        # gRPC address of the Raft leader, or None while unknown
+        self.leader = None
+        # gRPC addresses of replicas whose last status poll succeeded and were ready
+        self.ready = set()
+        self._round_robin = itertools.count()
+        # session_id -> raft_index of the latest write made in that session, least recent first
+        self.session_indexes = OrderedDict()
+        # Highest commit index any replica reported
+        self.commit_index = 0
+        # gRPC addresses of replicas that had not yet applied, at the last poll,
+        # what the cluster had committed by the poll before
+        self.lagging = set()
+
+    def start(self):
+        self.refresh()
+        threading.Thread(target=self.status_thread, daemon=True, name="product-db-status").start()
+
+    def status_thread(self):
+        while True:
+            time.sleep(STATUS_INTERVAL)
+            self.refresh()
+
+    def refresh(self):
+        """Poll every replica's status (concurrently) and update leader and ready set"""
+        futures = {
+            addr: stub.GetClusterStatus.future(product_db_pb2.GetClusterStatusRequest(),
+                                               timeout=STATUS_TIMEOUT)
+            for addr, stub in self.stubs.items()
+        }
+        statuses = {}
+        for addr, future in futures.items():
+            try:
+                statuses[addr] = future.result()
+            except grpc.RpcError:
+                pass
+
+        # Replicas report the leader by Raft address; map it back to gRPC
+        raft_to_addr = {status.self_node: addr for addr, status in statuses.items()}
+        leaders = [raft_to_addr.get(status.leader) for status in statuses.values() if status.leader]
+        leader = max(set(leaders), key=leaders.count) if leaders else None
+        commit_index = max((status.commit_index for status in statuses.values()), default=0)
+        with self.lock:
+            self.leader = leader
+            self.ready = {addr for addr, status in statuses.items() if status.ready}
+            self.lagging = {addr for addr, status in statuses.items()
+                            if status.last_applied < self.commit_index}
+            self.commit_index = max(self.commit_index, commit_index)
+
+    def _candidates(self, write: bool) -> list:
+        """Replicas to try, in order"""
+        with self.lock:
+            leader, ready = self.leader, self.ready
+        if write:
+            first = [leader] if leader else []
+            rest = [addr for addr in self.addrs if addr in ready and addr != leader]
+        else:
+            first = [addr for addr in self.addrs if addr in ready and addr != leader]
+            rest = [leader] if leader in ready else []
+            if first:
+                # Spread reads over the followers
+                start = next(self._round_robin) % len(first)
+                first = first[start:] + first[:start]
+        # Replicas that are down or unpolled come last
+        tried = set(first + rest)
+        return first + rest + [addr for addr in self.addrs if addr not in tried]
+
+    def _call(self, candidates: list, retryable: tuple, method_name: str, request, timeout):
+        last_error = None
+        # Raises the last error (a grpc.RpcError) if every attempt fails
+        for addr in candidates[:MAX_ATTEMPTS]:
+            try:
+                return getattr(self.stubs[addr], method_name)(request, timeout=timeout)
+            except grpc.RpcError as e:
+                if e.code() not in retryable:
+                    raise
+                print(f"product-db {addr} failed {method_name} ({e.code()}), trying another node")
+                last_error = e
+        raise last_error
+
+    def session_index(self) -> int:
+        """raft_index of the latest write made in the current session, 0 if none"""
+        session_id = current_session.get()
+        if not session_id:
+            return 0
+        with self.lock:
+            return self.session_indexes.get(session_id, 0)
+
+    def note_index(self, response):
+        """Keep a write's raft_index as the token of the current session"""
+        session_id = current_session.get()
+        if not session_id or not response.raft_index:
+            return
+        with self.lock:
+            if response.raft_index > self.session_indexes.get(session_id, 0):
+                self.session_indexes[session_id] = response.raft_index
+            self.session_indexes.move_to_end(session_id)
+            if len(self.session_indexes) > SESSION_TOKENS:
+                self.session_indexes.popitem(last=False)
+
+    def stamp(self, request):
+        """Ask a read request to wait for every write its session has seen"""
+        index = self.session_index()
+        if index:
+            request.min_index = max(request.min_index, index)
+        return request
+
+    def write(self, method_name: str, request, timeout=CALL_TIMEOUT):
+        """Call a write RPC on the leader, falling back to followers (which forward it)"""
+        response = self._call(self._candidates(True), _RETRYABLE_WRITE, method_name, request, timeout)
+        self.note_index(response)
+        return response
+
+    def read(self, method_name: str, request, timeout=CALL_TIMEOUT, linearizable=False):
+        """
+        Call a read RPC on a follower, falling back to the leader and other
+        replicas. With linearizable, call it on the leader instead.
+        """
+        self.stamp(request)
+        if linearizable:
+            request.linearizable = True
+        return self._call(self._candidates(linearizable), _RETRYABLE_READ, method_name, request, timeout)
+
+    def read_stream(self, method_name: str, request):
+        """
+        Open a server-streaming read on a follower, chosen like read(). If
+        the first message fails with a retryable error, the stream is
+        reopened on another replica. Returns (stream, first message or None
+        if the stream is empty).
+        """
+        self.stamp(request)
+        last_error = None
+        # Raises the last error (a grpc.RpcError) if every attempt fails
+        for addr in self._candidates(False)[:MAX_ATTEMPTS]:
+            stream = getattr(self.stubs[addr], method_name)(request)
+            try:
+                return stream, next(stream, None)
+            except grpc.RpcError as e:
+                if e.code() not in _RETRYABLE_READ:
+                    raise
+                print(f"product-db {addr} failed {method_name} ({e.code()}), trying another node")
+                last_error = e
+        raise last_error
+
+    def stream_addr(self, avoid=None) -> str:
+        """
+        Replica to open a stream on, chosen like read() but passing over
+        lagging replicas and avoid while another one is ready.
+        """
+        candidates = self._candidates(False)
+        with self.lock:
+            ready, lagging = self.ready, self.lagging
+        for addr in candidates:
+            if addr in ready and addr not in lagging and addr != avoid:
+                return addr
+        return candidates[0]
+
+    def read_stub(self, avoid=None):
+        """(address, stub) to open a stream on; see stream_addr"""
+        addr = self.stream_addr(avoid)
+        return addr, self.stubs[addr]
+
+
+class AsyncProductDBClient:
+    """
+    grpc.aio transport for a ProductDBClient: `await client.read(...)`.
+    Leader tracking and the per-session index tokens are shared with the wrapped
+    client, whose status thread keeps running. Must be created on the event
+    loop it is used from.
+    """
+
+    def __init__(self, client: ProductDBClient):
+        self.client = client
+        self.stubs = {
+            addr: product_db_pb2_grpc.ProductDBServiceStub(grpc.aio.insecure_channel(addr))
+            for addr in client.addrs
+        }
+
+    async def _call(self, candidates: list, retryable: tuple, method_name: str, request, timeout):
+        last_error = None
+        # Raises the last error (a grpc.RpcError) if every attempt fails
+        for addr in candidates[:MAX_ATTEMPTS]:
+            try:
+                return await getattr(self.stubs[addr], method_name)(request, timeout=timeout)
+            except grpc.RpcError as e:
+                if e.code() not in retryable:
+                    raise
+                print(f"product-db {addr} failed {method_name} ({e.code()}), trying another node")
+                last_error = e
+        raise last_error
+
+    def stamp(self, request):
+        return self.client.stamp(request)
+
+    async def write(self, method_name: str, request, timeout=CALL_TIMEOUT):
+        """See ProductDBClient.write"""
+        client = self.client
+        response = await self._call(client._candidates(True), _RETRYABLE_WRITE, method_name,
+                                    request, timeout)
+        client.note_index(response)
+        return response
+
+    async def read(self, method_name: str, request, timeout=CALL_TIMEOUT, linearizable=False):
+        """See ProductDBClient.read"""
+        self.client.stamp(request)
+        if linearizable:
+            request.linearizable = True
+        return await self._call(self.client._candidates(linearizable), _RETRYABLE_READ,
+                                method_name, request, timeout)
+
+    async def read_stream(self, method_name: str, request):
+        """See ProductDBClient.read_stream; the first message is None at EOF"""
+        self.client.stamp(request)
+        last_error = None
+        # Raises the last error (a grpc.RpcError) if every attempt fails
+        for addr in self.client._candidates(False)[:MAX_ATTEMPTS]:
+            stream = getattr(self.stubs[addr], method_name)(request)
+            try:
+                first = await stream.read()
+                return stream, None if first is grpc.aio.EOF else first
+            except grpc.RpcError as e:
+                if e.code() not in _RETRYABLE_READ:
+                    raise
+                print(f"product-db {addr} failed {method_name} ({e.code()}), trying another node")
+                last_error = e
+        raise last_error
+
+    def read_stub(self, avoid=None):
+        """(address, grpc.aio stub) to open a stream on; see ProductDBClient.stream_addr"""
+        addr = self.client.stream_addr(avoid)
+        return addr, self.stubs[addr]